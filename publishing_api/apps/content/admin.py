@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.utils import timezone
 
 from apps.content.models import (
     DesignTokenSet,
@@ -8,6 +9,7 @@ from apps.content.models import (
     NowPage,
     PageComposition,
     Project,
+    PublishJob,
     PublishLog,
     ShelfEntry,
     SiteSettings,
@@ -130,3 +132,35 @@ class PublishLogAdmin(admin.ModelAdmin):
         "error_message",
         "created_at",
     ]
+
+
+@admin.register(PublishJob)
+class PublishJobAdmin(admin.ModelAdmin):
+    list_display = [
+        "content_title", "content_type", "status", "attempts", "run_after", "commit_sha",
+    ]
+    list_filter = ["status", "content_type"]
+    search_fields = ["content_title", "file_path"]
+    readonly_fields = [
+        "content_type",
+        "content_slug",
+        "content_title",
+        "file_path",
+        "commit_message",
+        "attempts",
+        "started_at",
+        "finished_at",
+        "commit_sha",
+        "commit_url",
+        "error_message",
+        "publish_log",
+        "created_at",
+    ]
+    actions = ["retry_now"]
+
+    @admin.action(description="Retry selected jobs now")
+    def retry_now(self, request, queryset):
+        count = queryset.filter(status=PublishJob.Status.FAILED).update(
+            status=PublishJob.Status.QUEUED, run_after=timezone.now(), attempts=0,
+        )
+        self.message_user(request, f"Requeued {count} failed job(s).")
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0004_essay_connected_types_essay_connection_notes_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublishJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('content_type', models.CharField(choices=[('essay', 'Essay'), ('field_note', 'Field Note'), ('shelf', 'Shelf Entry'), ('project', 'Project'), ('toolkit', 'Toolkit Entry'), ('now', 'Now Page'), ('video', 'Video'), ('site_config', 'Site Config')], max_length=20)),
+                ('content_slug', models.CharField(max_length=300)),
+                ('content_title', models.CharField(max_length=300)),
+                ('file_path', models.CharField(max_length=500)),
+                ('content', models.TextField()),
+                ('commit_message', models.CharField(max_length=500)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('run_after', models.DateTimeField(help_text='Earliest time the worker may pick this job up.')),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('commit_sha', models.CharField(blank=True, default='', max_length=40)),
+                ('commit_url', models.URLField(blank=True, default='')),
+                ('error_message', models.TextField(blank=True, default='')),
+                ('publish_log', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='content.publishlog')),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='content_pub_status_ff578a_idx'), models.Index(fields=['file_path', 'status'], name='content_pub_file_pa_416fea_idx')],
+            },
+        ),
+    ]
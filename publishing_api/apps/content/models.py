@@ -952,3 +952,66 @@ class PublishLog(TimeStampedModel):
     def __str__(self):
         status = "OK" if self.success else "FAILED"
         return f"[{status}] {self.content_type}: {self.content_title}"
+
+
+# ---------------------------------------------------------------------------
+# Publish queue
+# ---------------------------------------------------------------------------
+
+
+class PublishJob(TimeStampedModel):
+    """
+    One queued file write, committed by the publish_worker command.
+
+    The Publish buttons enqueue a job and return immediately. The worker
+    commits every job that is due within its coalescing window as one
+    atomic commit, then records a PublishLog per job. Failed attempts are
+    rescheduled with backoff; because the queue lives in the database,
+    pending retries survive restarts.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    content_type = models.CharField(
+        max_length=20, choices=PublishLog.ContentType.choices,
+    )
+    content_slug = models.CharField(max_length=300)
+    content_title = models.CharField(max_length=300)
+    file_path = models.CharField(max_length=500)
+    content = models.TextField()
+    commit_message = models.CharField(max_length=500)
+
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.QUEUED,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(
+        help_text="Earliest time the worker may pick this job up.",
+    )
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    commit_sha = models.CharField(max_length=40, blank=True, default="")
+    commit_url = models.URLField(blank=True, default="")
+    error_message = models.TextField(blank=True, default="")
+    publish_log = models.ForeignKey(
+        PublishLog, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name="+",
+    )
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+            models.Index(fields=["file_path", "status"]),
+        ]
+
+    def __str__(self):
+        return f"[{self.status}] {self.content_type}: {self.content_title}"
+
+    @property
+    def done(self):
+        return self.status in (self.Status.SUCCEEDED, self.Status.FAILED)
@@ -122,5 +122,6 @@ urlpatterns = [
     path("settings/nav/", views.NavEditorView.as_view(), name="nav-editor"),
     path("settings/site/", views.SiteSettingsEditView.as_view(), name="site-settings"),
     path("settings/publish-log/", views.PublishLogListView.as_view(), name="publish-log"),
+    path("publish-jobs/<int:pk>/", views.PublishJobStatusView.as_view(), name="publish-job-status"),
     path("settings/publish-config/", views.PublishSiteConfigView.as_view(), name="publish-config"),
 ]
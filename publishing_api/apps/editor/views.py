@@ -51,6 +51,7 @@ from apps.content.models import (
     NowPage,
     PageComposition,
     Project,
+    PublishJob,
     PublishLog,
     ShelfEntry,
     SiteSettings,
@@ -75,17 +76,9 @@ from apps.editor.forms import (
     VideoSceneForm,
     VideoDeliverableForm,
 )
-from apps.publisher.github import publish_binary_file
-from apps.publisher.publish import (
-    delete_content,
-    publish_essay,
-    publish_field_note,
-    publish_now_page,
-    publish_project,
-    publish_shelf_entry,
-    publish_site_config,
-    publish_toolkit_entry,
-)
+from apps.publisher.backend import publish_binary_file
+from apps.publisher.publish import delete_content
+from apps.publisher.queue import enqueue_content, enqueue_site_config
 
 
 # ---------------------------------------------------------------------------
@@ -105,6 +98,27 @@ def _publish_response(request, log, redirect_url):
     return redirect(redirect_url)
 
 
+def _job_status(job):
+    """JSON-ready state of a PublishJob, shared by enqueue and polling."""
+    return {
+        "job_id": job.pk,
+        "status": job.status,
+        "done": job.done,
+        "success": job.status == PublishJob.Status.SUCCEEDED,
+        "commit_sha": job.commit_sha,
+        "commit_url": job.commit_url,
+        "error": job.error_message,
+        "status_url": reverse("editor:publish-job-status", kwargs={"pk": job.pk}),
+    }
+
+
+def _queued_response(request, job, redirect_url):
+    """Publish queued: HTMX JSON with a status URL to poll, or redirect."""
+    if request.headers.get("HX-Request"):
+        return JsonResponse({"queued": True, **_job_status(job)}, status=202)
+    return redirect(redirect_url)
+
+
 def _publish_error(request, redirect_url, exc):
     """Publish exception result: HTMX JSON or redirect."""
     if request.headers.get("HX-Request"):
@@ -251,17 +265,17 @@ class EssayEditView(LoginRequiredMixin, UpdateView):
 
 
 class EssayPublishView(LoginRequiredMixin, View):
-    """POST-only view that publishes an essay to GitHub."""
+    """POST-only view that queues an essay for publishing to GitHub."""
 
     def post(self, request, slug):
         essay = get_object_or_404(Essay, slug=slug)
         redirect_url = reverse("editor:essay-edit", kwargs={"slug": slug})
         try:
-            log = publish_essay(essay)
+            job = enqueue_content(essay)
         except Exception:
             logger.exception("Publish failed for essay '%s'", slug)
             return _publish_error(request, redirect_url, None)
-        return _publish_response(request, log, redirect_url)
+        return _queued_response(request, job, redirect_url)
 
 
 # ---------------------------------------------------------------------------
@@ -338,11 +352,11 @@ class FieldNotePublishView(LoginRequiredMixin, View):
         note = get_object_or_404(FieldNote, slug=slug)
         redirect_url = reverse("editor:field-note-edit", kwargs={"slug": slug})
         try:
-            log = publish_field_note(note)
+            job = enqueue_content(note)
         except Exception:
             logger.exception("Publish failed for field note '%s'", slug)
             return _publish_error(request, redirect_url, None)
-        return _publish_response(request, log, redirect_url)
+        return _queued_response(request, job, redirect_url)
 
 
 # ---------------------------------------------------------------------------
@@ -419,11 +433,11 @@ class ShelfPublishView(LoginRequiredMixin, View):
         entry = get_object_or_404(ShelfEntry, slug=slug)
         redirect_url = reverse("editor:shelf-edit", kwargs={"slug": slug})
         try:
-            log = publish_shelf_entry(entry)
+            job = enqueue_content(entry)
         except Exception:
             logger.exception("Publish failed for shelf entry '%s'", slug)
             return _publish_error(request, redirect_url, None)
-        return _publish_response(request, log, redirect_url)
+        return _queued_response(request, job, redirect_url)
 
 
 # ---------------------------------------------------------------------------
@@ -500,11 +514,11 @@ class ProjectPublishView(LoginRequiredMixin, View):
         project = get_object_or_404(Project, slug=slug)
         redirect_url = reverse("editor:project-edit", kwargs={"slug": slug})
         try:
-            log = publish_project(project)
+            job = enqueue_content(project)
         except Exception:
             logger.exception("Publish failed for project '%s'", slug)
             return _publish_error(request, redirect_url, None)
-        return _publish_response(request, log, redirect_url)
+        return _queued_response(request, job, redirect_url)
 
 
 # ---------------------------------------------------------------------------
@@ -581,11 +595,11 @@ class ToolkitPublishView(LoginRequiredMixin, View):
         entry = get_object_or_404(ToolkitEntry, slug=slug)
         redirect_url = reverse("editor:toolkit-edit", kwargs={"slug": slug})
         try:
-            log = publish_toolkit_entry(entry)
+            job = enqueue_content(entry)
         except Exception:
             logger.exception("Publish failed for toolkit entry '%s'", slug)
             return _publish_error(request, redirect_url, None)
-        return _publish_response(request, log, redirect_url)
+        return _queued_response(request, job, redirect_url)
 
 
 # ---------------------------------------------------------------------------
@@ -926,11 +940,11 @@ class NowPagePublishView(LoginRequiredMixin, View):
         now = get_object_or_404(NowPage, pk=1)
         redirect_url = reverse("editor:now-edit")
         try:
-            log = publish_now_page(now)
+            job = enqueue_content(now)
         except Exception:
             logger.exception("Publish failed for Now page")
             return _publish_error(request, redirect_url, None)
-        return _publish_response(request, log, redirect_url)
+        return _queued_response(request, job, redirect_url)
 
 
 # ---------------------------------------------------------------------------
@@ -1163,22 +1177,30 @@ class PublishLogListView(LoginRequiredMixin, ListView):
         return ctx
 
 
+class PublishJobStatusView(LoginRequiredMixin, View):
+    """GET-only: state of a queued publish, polled by the editor toast."""
+
+    def get(self, request, pk):
+        job = get_object_or_404(PublishJob, pk=pk)
+        return JsonResponse(_job_status(job))
+
+
 # ---------------------------------------------------------------------------
 # Publish site configuration (POST only)
 # ---------------------------------------------------------------------------
 
 
 class PublishSiteConfigView(LoginRequiredMixin, View):
-    """Publish site.json to GitHub (design tokens, nav, SEO, pages)."""
+    """Queue site.json for publishing (design tokens, nav, SEO, pages)."""
 
     def post(self, request):
         redirect_url = reverse("editor:site-settings")
         try:
-            log = publish_site_config()
+            job = enqueue_site_config()
         except Exception:
             logger.exception("Publish failed for site configuration")
             return _publish_error(request, redirect_url, None)
-        return _publish_response(request, log, redirect_url)
+        return _queued_response(request, job, redirect_url)
 
 
 # ---------------------------------------------------------------------------
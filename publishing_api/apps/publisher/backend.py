@@ -0,0 +1,48 @@
+"""
+Publish backend dispatcher.
+
+Callers import publish_file, publish_binary_file, delete_file and
+publish_files from here; the PUBLISH_BACKEND setting picks where they
+commit:
+
+  "github"     GitHub REST API (github.py), the default
+  "local_git"  A local repository via git plumbing (local_git.py)
+
+The backend is resolved on every call, so tests and management commands
+can switch it with override_settings.
+"""
+
+from importlib import import_module
+
+from django.conf import settings
+
+BACKENDS = {
+    "github": "apps.publisher.github",
+    "local_git": "apps.publisher.local_git",
+}
+
+
+def get_backend():
+    name = getattr(settings, "PUBLISH_BACKEND", "github") or "github"
+    try:
+        return import_module(BACKENDS[name])
+    except KeyError:
+        raise ValueError(
+            f"Unknown PUBLISH_BACKEND {name!r}; expected one of {sorted(BACKENDS)}"
+        ) from None
+
+
+def publish_file(file_path, content, commit_message):
+    return get_backend().publish_file(file_path, content, commit_message)
+
+
+def publish_binary_file(file_path, content_bytes, commit_message):
+    return get_backend().publish_binary_file(file_path, content_bytes, commit_message)
+
+
+def delete_file(file_path, commit_message):
+    return get_backend().delete_file(file_path, commit_message)
+
+
+def publish_files(file_ops, commit_message):
+    return get_backend().publish_files(file_ops, commit_message)
@@ -10,21 +10,51 @@ The Contents API handles one file per request. The Git Trees API bundles
 multiple file operations into a single commit, useful when content and
 site.json need to update together.
 
+All requests go through one GitHubClient: a pooled keep-alive session
+that retries transient failures with backoff, waits out rate limits
+(Retry-After, X-RateLimit-Remaining/Reset), and creates the blobs of a
+multi-file commit concurrently.
+
+The single-file functions look up existing blob SHAs in a cached copy of
+the branch's recursive tree (TreeCache) instead of asking the Contents
+API per file. The cache is refreshed with one conditional request, and
+a file whose content hashes to the blob already on the branch is not
+uploaded at all.
+
 Requires two environment variables:
   GITHUB_TOKEN       Personal access token with repo scope
   GITHUB_REPO        Owner/repo format, e.g. "travisgilbert/website"
 """
 
 import base64
+import hashlib
 import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
 API_BASE = "https://api.github.com"
 
+# Concurrent blob uploads per commit; also the connection pool size.
+BLOB_UPLOAD_WORKERS = 8
+
+# Retries after the first attempt for transient errors and rate limits.
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+# Longest we will sleep for a rate limit before giving up on a request.
+MAX_RATE_LIMIT_WAIT = 60.0
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
 
 def _headers():
     return {
@@ -34,6 +64,149 @@ def _headers():
     }
 
 
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+
+class GitHubClient:
+    """
+    Thread-safe GitHub REST client over one pooled requests.Session.
+
+    request() returns the final response, or raises a requests exception
+    once retries are exhausted, like a plain requests call followed by
+    raise_for_status(). `request_count` counts HTTP round-trips
+    (retries included), for measuring publish cost.
+    """
+
+    def __init__(self, workers=BLOB_UPLOAD_WORKERS, sleep=time.sleep):
+        self.workers = workers
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.rate_limit_remaining = None
+
+    def request(self, method, url, *, timeout=30, **kwargs):
+        kwargs.setdefault("headers", _headers())
+        attempt = 0
+        while True:
+            with self._lock:
+                self.request_count += 1
+            try:
+                resp = self.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= MAX_RETRIES:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(
+                    "GitHub %s %s: connection error, retrying in %.1fs",
+                    method, url, delay,
+                )
+            else:
+                self._track_rate_limit(resp)
+                delay = self._retry_delay(resp, attempt)
+                if delay is None:
+                    resp.raise_for_status()
+                    return resp
+                logger.warning(
+                    "GitHub %s %s: HTTP %s, retrying in %.1fs",
+                    method, url, resp.status_code, delay,
+                )
+            self._sleep(delay)
+            attempt += 1
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def create_blobs(self, contents):
+        """Create one blob per string, concurrently. Returns SHAs in order."""
+        def create(content):
+            resp = self.post(
+                _repo_url("git/blobs"),
+                json={"content": content, "encoding": "utf-8"},
+            )
+            return resp.json()["sha"]
+
+        if len(contents) <= 1:
+            return [create(content) for content in contents]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(create, contents))
+
+    # -- retry policy --------------------------------------------------------
+
+    def _track_rate_limit(self, resp):
+        remaining = resp.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit():
+            self.rate_limit_remaining = int(remaining)
+
+    def _backoff(self, attempt):
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    def _retry_delay(self, resp, attempt):
+        """Seconds to wait before retrying resp, or None to not retry."""
+        status = resp.status_code
+        rate_limited = status == 429 or (
+            status == 403
+            and (
+                resp.headers.get("X-RateLimit-Remaining") == "0"
+                or "Retry-After" in resp.headers
+            )
+        )
+        if not rate_limited and status not in RETRY_STATUSES:
+            return None
+        if attempt >= MAX_RETRIES:
+            return None
+
+        if rate_limited:
+            delay = None
+            retry_after = resp.headers.get("Retry-After", "")
+            reset = resp.headers.get("X-RateLimit-Reset", "")
+            if retry_after.isdigit():
+                delay = float(retry_after)
+            elif resp.headers.get("X-RateLimit-Remaining") == "0" and reset.isdigit():
+                delay = max(0.0, int(reset) - time.time()) + 1
+            if delay is None:
+                delay = self._backoff(attempt)
+            if delay > MAX_RATE_LIMIT_WAIT:
+                logger.error(
+                    "GitHub rate limit resets in %.0fs, not waiting", delay,
+                )
+                return None
+            return delay
+
+        return self._backoff(attempt)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide GitHubClient (one connection pool for all publishes)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = GitHubClient()
+        return _client
+
+
 def _repo_url(path=""):
     """Build a GitHub API URL for the configured repo."""
     base = f"{API_BASE}/repos/{settings.GITHUB_REPO}"
@@ -51,10 +224,17 @@ def _get_file_sha(file_path):
     """
     url = f"{_repo_url('contents')}/{file_path}"
     params = {"ref": settings.GITHUB_BRANCH}
-    resp = requests.get(url, headers=_headers(), params=params, timeout=10)
-    if resp.status_code == 200:
-        return resp.json().get("sha")
-    return None
+    try:
+        resp = get_client().get(url, params=params, timeout=10)
+    except requests.exceptions.HTTPError:
+        return None
+    return resp.json().get("sha")
+
+
+def git_blob_sha(content_bytes):
+    """The SHA git (and GitHub) assigns to a blob with this content."""
+    header = b"blob %d\0" % len(content_bytes)
+    return hashlib.sha1(header + content_bytes).hexdigest()
 
 
 def _result(success, commit_sha="", commit_url="", error=None):
@@ -79,48 +259,138 @@ def _extract_error(exc):
 
 
 # ---------------------------------------------------------------------------
-# Single-file operations (Contents API)
+# Branch tree cache
 # ---------------------------------------------------------------------------
 
 
-def publish_file(file_path, content, commit_message):
+class TreeCache:
     """
-    Create or update a file in the GitHub repository.
+    Path -> blob SHA for every file on the publish branch.
 
-    Args:
-        file_path: Path relative to repo root (e.g. "src/content/essays/my-essay.md")
-        content: The file content as a string
-        commit_message: Git commit message
+    refresh() fetches git/trees/<branch>?recursive=1 with the ETag of the
+    previous response in If-None-Match. While the branch hasn't moved
+    GitHub answers 304 Not Modified, with no body and without counting
+    against the rate limit, and the cached mapping is reused.
 
-    Returns:
-        dict with keys: success, commit_sha, commit_url, error
+    GitHub truncates very large recursive trees; paths missing from a
+    truncated listing fall back to a Contents API lookup.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key = None
+        self.etag = None
+        self.tree_sha = None
+        self.blobs = {}
+        self.truncated = False
+
+    def refresh(self, client):
+        key = (settings.GITHUB_REPO, settings.GITHUB_BRANCH)
+        with self._lock:
+            if key != self._key:
+                self._key, self.etag, self.blobs = key, None, {}
+            headers = _headers()
+            if self.etag:
+                headers["If-None-Match"] = self.etag
+            resp = client.get(
+                _repo_url(f"git/trees/{settings.GITHUB_BRANCH}"),
+                params={"recursive": "1"},
+                headers=headers,
+            )
+            if resp.status_code == 304:
+                return
+            data = resp.json()
+            self.etag = resp.headers.get("ETag")
+            self.tree_sha = data["sha"]
+            self.blobs = {
+                entry["path"]: entry["sha"]
+                for entry in data["tree"]
+                if entry["type"] == "blob"
+            }
+            self.truncated = bool(data.get("truncated"))
+
+    def clear(self):
+        with self._lock:
+            self._key, self.etag, self.tree_sha, self.blobs = None, None, None, {}
+
+
+_tree_cache = TreeCache()
+
+
+def _existing_sha(file_path):
+    """
+    Current blob SHA of file_path on the branch, or None if it's absent.
+
+    One conditional tree request (usually a 304) replaces the per-file
+    Contents API lookup; _get_file_sha remains the fallback when the
+    tree can't be fetched or was truncated.
+    """
+    try:
+        _tree_cache.refresh(get_client())
+    except requests.exceptions.RequestException as e:
+        logger.warning("Tree refresh failed, looking up %s directly: %s", file_path, e)
+        _tree_cache.clear()
+        return _get_file_sha(file_path)
+    sha = _tree_cache.blobs.get(file_path)
+    if sha is None and _tree_cache.truncated:
+        return _get_file_sha(file_path)
+    return sha
+
+
+# ---------------------------------------------------------------------------
+# Single-file operations (Contents API)
+# ---------------------------------------------------------------------------
+
+
+def _put_file(file_path, content_bytes, commit_message):
     """
+    Contents API PUT of content_bytes, unless the branch already has it.
+
+    An unchanged file makes no request beyond the tree refresh and
+    returns success with an empty commit_sha.
+    """
+    existing_sha = _existing_sha(file_path)
+    if existing_sha == git_blob_sha(content_bytes):
+        logger.info("GitHub publish skipped for %s: unchanged", file_path)
+        return _result(True)
+
     url = f"{_repo_url('contents')}/{file_path}"
 
     # GitHub Contents API requires base64-encoded content
-    encoded = base64.b64encode(content.encode("utf-8")).decode("ascii")
-
     payload = {
         "message": commit_message,
-        "content": encoded,
+        "content": base64.b64encode(content_bytes).decode("ascii"),
         "branch": settings.GITHUB_BRANCH,
     }
 
     # If the file already exists, include its SHA for the update
-    existing_sha = _get_file_sha(file_path)
     if existing_sha:
         payload["sha"] = existing_sha
 
+    resp = get_client().put(url, json=payload)
+    commit_info = resp.json().get("commit", {})
+    return _result(
+        True,
+        commit_sha=commit_info.get("sha", ""),
+        commit_url=commit_info.get("html_url", ""),
+    )
+
+
+def publish_file(file_path, content, commit_message):
+    """
+    Create or update a file in the GitHub repository.
+
+    Args:
+        file_path: Path relative to repo root (e.g. "src/content/essays/my-essay.md")
+        content: The file content as a string
+        commit_message: Git commit message
+
+    Returns:
+        dict with keys: success, commit_sha, commit_url, error
+        (commit_sha is empty when the file was already up to date)
+    """
     try:
-        resp = requests.put(url, headers=_headers(), json=payload, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
-        commit_info = data.get("commit", {})
-        return _result(
-            True,
-            commit_sha=commit_info.get("sha", ""),
-            commit_url=commit_info.get("html_url", ""),
-        )
+        return _put_file(file_path, content.encode("utf-8"), commit_message)
     except requests.exceptions.RequestException as e:
         error_detail = _extract_error(e)
         logger.error("GitHub publish failed for %s: %s", file_path, error_detail)
@@ -141,31 +411,10 @@ def publish_binary_file(file_path, content_bytes, commit_message):
 
     Returns:
         dict with keys: success, commit_sha, commit_url, error
+        (commit_sha is empty when the file was already up to date)
     """
-    url = f"{_repo_url('contents')}/{file_path}"
-
-    encoded = base64.b64encode(content_bytes).decode("ascii")
-
-    payload = {
-        "message": commit_message,
-        "content": encoded,
-        "branch": settings.GITHUB_BRANCH,
-    }
-
-    existing_sha = _get_file_sha(file_path)
-    if existing_sha:
-        payload["sha"] = existing_sha
-
     try:
-        resp = requests.put(url, headers=_headers(), json=payload, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
-        commit_info = data.get("commit", {})
-        return _result(
-            True,
-            commit_sha=commit_info.get("sha", ""),
-            commit_url=commit_info.get("html_url", ""),
-        )
+        return _put_file(file_path, content_bytes, commit_message)
     except requests.exceptions.RequestException as e:
         error_detail = _extract_error(e)
         logger.error("GitHub binary publish failed for %s: %s", file_path, error_detail)
@@ -183,7 +432,10 @@ def delete_file(file_path, commit_message):
     Returns:
         dict with keys: success, commit_sha, commit_url, error
     """
-    existing_sha = _get_file_sha(file_path)
+    try:
+        existing_sha = _existing_sha(file_path)
+    except requests.exceptions.RequestException as e:
+        return _result(False, error=_extract_error(e))
     if not existing_sha:
         return _result(False, error=f"File not found: {file_path}")
 
@@ -195,8 +447,7 @@ def delete_file(file_path, commit_message):
     }
 
     try:
-        resp = requests.delete(url, headers=_headers(), json=payload, timeout=30)
-        resp.raise_for_status()
+        resp = get_client().delete(url, json=payload)
         data = resp.json()
         commit_info = data.get("commit", {})
         return _result(
@@ -220,7 +471,9 @@ def publish_files(file_ops, commit_message):
     Create or update multiple files in a single atomic commit.
 
     Uses the Git Trees API to bundle file operations into one commit.
-    This ensures content and site.json stay in sync.
+    This ensures content and site.json stay in sync. Costs five sequential
+    round-trips plus one blob upload per file; the uploads run in
+    parallel on the shared client.
 
     Args:
         file_ops: list of dicts, each with:
@@ -231,52 +484,33 @@ def publish_files(file_ops, commit_message):
     Returns:
         dict with keys: success, commit_sha, commit_url, error
     """
-    headers = _headers()
+    client = get_client()
     branch = settings.GITHUB_BRANCH
 
     try:
         # 1. Get the current commit SHA for the branch
         ref_url = _repo_url(f"git/ref/heads/{branch}")
-        ref_resp = requests.get(ref_url, headers=headers, timeout=10)
-        ref_resp.raise_for_status()
+        ref_resp = client.get(ref_url, timeout=10)
         base_commit_sha = ref_resp.json()["object"]["sha"]
 
         # 2. Get the tree SHA of that commit
         commit_url = _repo_url(f"git/commits/{base_commit_sha}")
-        commit_resp = requests.get(commit_url, headers=headers, timeout=10)
-        commit_resp.raise_for_status()
+        commit_resp = client.get(commit_url, timeout=10)
         base_tree_sha = commit_resp.json()["tree"]["sha"]
 
-        # 3. Build the tree entries for the new commit
-        tree_entries = []
-        for op in file_ops:
-            if op.get("content") is None:
-                # Delete: set mode to mark file as deleted
-                tree_entries.append({
-                    "path": op["path"],
-                    "mode": "100644",
-                    "type": "blob",
-                    "sha": None,
-                })
-            else:
-                # Create blob for each file
-                blob_url = _repo_url("git/blobs")
-                blob_payload = {
-                    "content": op["content"],
-                    "encoding": "utf-8",
-                }
-                blob_resp = requests.post(
-                    blob_url, headers=headers, json=blob_payload, timeout=30
-                )
-                blob_resp.raise_for_status()
-                blob_sha = blob_resp.json()["sha"]
-
-                tree_entries.append({
-                    "path": op["path"],
-                    "mode": "100644",
-                    "type": "blob",
-                    "sha": blob_sha,
-                })
+        # 3. Create blobs (concurrently) and build the tree entries.
+        # Deletes are entries with a null SHA.
+        uploads = [op["content"] for op in file_ops if op.get("content") is not None]
+        blob_shas = iter(client.create_blobs(uploads))
+        tree_entries = [
+            {
+                "path": op["path"],
+                "mode": "100644",
+                "type": "blob",
+                "sha": None if op.get("content") is None else next(blob_shas),
+            }
+            for op in file_ops
+        ]
 
         # 4. Create the new tree
         tree_url = _repo_url("git/trees")
@@ -284,10 +518,7 @@ def publish_files(file_ops, commit_message):
             "base_tree": base_tree_sha,
             "tree": tree_entries,
         }
-        tree_resp = requests.post(
-            tree_url, headers=headers, json=tree_payload, timeout=30
-        )
-        tree_resp.raise_for_status()
+        tree_resp = client.post(tree_url, json=tree_payload)
         new_tree_sha = tree_resp.json()["sha"]
 
         # 5. Create the commit
@@ -297,19 +528,12 @@ def publish_files(file_ops, commit_message):
             "tree": new_tree_sha,
             "parents": [base_commit_sha],
         }
-        new_commit_resp = requests.post(
-            new_commit_url, headers=headers, json=new_commit_payload, timeout=30
-        )
-        new_commit_resp.raise_for_status()
+        new_commit_resp = client.post(new_commit_url, json=new_commit_payload)
         new_commit = new_commit_resp.json()
 
         # 6. Update the branch ref to point to the new commit
         update_ref_url = _repo_url(f"git/refs/heads/{branch}")
-        update_payload = {"sha": new_commit["sha"]}
-        update_resp = requests.patch(
-            update_ref_url, headers=headers, json=update_payload, timeout=10
-        )
-        update_resp.raise_for_status()
+        client.patch(update_ref_url, json={"sha": new_commit["sha"]}, timeout=10)
 
         return _result(
             True,
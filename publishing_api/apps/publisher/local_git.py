@@ -0,0 +1,227 @@
+"""
+Local git publish backend.
+
+Commits straight into a local repository (a bare repo or a dedicated
+clone) with git plumbing, then optionally pushes. No network round-trip
+per file: a multi-file commit is a handful of git processes and takes
+milliseconds, which makes offline runs and tests practical.
+
+Same interface and result dicts as github.py:
+  publish_file(), publish_binary_file(), delete_file(), publish_files()
+
+How a commit is built (the repository's own index and working tree are
+never touched, so this is safe on a bare repo and alongside a checkout):
+  1. Read the branch tip into a temporary index (GIT_INDEX_FILE).
+  2. Write every new file as a blob in one `hash-object -w --stdin-paths`.
+  3. Apply all additions and deletions with one `update-index --index-info`.
+  4. write-tree, commit-tree, then update-ref with the old tip as the
+     expected value, so a concurrent publish can't be overwritten.
+
+Settings:
+  PUBLISH_GIT_REPO     Path to the repository (required)
+  PUBLISH_GIT_BRANCH   Branch to commit to (default: GITHUB_BRANCH)
+  PUBLISH_GIT_REMOTE   Remote to push to after each commit ("" = no push)
+  PUBLISH_GIT_AUTHOR_NAME / PUBLISH_GIT_AUTHOR_EMAIL
+"""
+
+import logging
+import os
+import subprocess
+import tempfile
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+ZERO_SHA = "0" * 40
+
+# Attempts at update-ref when another publish moves the branch first.
+REF_UPDATE_ATTEMPTS = 3
+
+
+class GitError(Exception):
+    pass
+
+
+def _result(success, commit_sha="", commit_url="", error=None):
+    """Standard result dict returned by all publish/delete functions."""
+    return {
+        "success": success,
+        "commit_sha": commit_sha,
+        "commit_url": commit_url,
+        "error": error,
+    }
+
+
+def _repo():
+    return settings.PUBLISH_GIT_REPO
+
+
+def _branch():
+    return getattr(settings, "PUBLISH_GIT_BRANCH", "") or settings.GITHUB_BRANCH
+
+
+def _env(index_file=None):
+    env = dict(os.environ)
+    env.update({
+        "GIT_AUTHOR_NAME": settings.PUBLISH_GIT_AUTHOR_NAME,
+        "GIT_AUTHOR_EMAIL": settings.PUBLISH_GIT_AUTHOR_EMAIL,
+        "GIT_COMMITTER_NAME": settings.PUBLISH_GIT_AUTHOR_NAME,
+        "GIT_COMMITTER_EMAIL": settings.PUBLISH_GIT_AUTHOR_EMAIL,
+    })
+    if index_file:
+        env["GIT_INDEX_FILE"] = index_file
+    return env
+
+
+def _git(*args, input=None, index_file=None):
+    """Run git in the publish repo and return stripped stdout."""
+    proc = subprocess.run(
+        ["git", "-C", _repo(), *args],
+        input=input,
+        capture_output=True,
+        env=_env(index_file),
+    )
+    if proc.returncode != 0:
+        raise GitError(
+            f"git {args[0]} failed: {proc.stderr.decode('utf-8', 'replace').strip()}"
+        )
+    return proc.stdout.decode("utf-8").strip()
+
+
+def _branch_tip():
+    """Commit SHA of the publish branch, or None if it doesn't exist yet."""
+    try:
+        return _git("rev-parse", "--verify", "--quiet", f"refs/heads/{_branch()}^{{commit}}")
+    except GitError:
+        return None
+
+
+def _path_exists(commit, file_path):
+    if commit is None:
+        return False
+    try:
+        _git("cat-file", "-e", f"{commit}:{file_path}")
+    except GitError:
+        return False
+    return True
+
+
+def _write_blobs(ops, workdir):
+    """
+    Write the content of file ops as blobs in one git process.
+
+    In-memory content (str or bytes) goes through a temp file; ops that
+    already point at a local 'file' are hashed from it directly.
+    """
+    if not ops:
+        return []
+    paths = []
+    for i, op in enumerate(ops):
+        if "file" in op:
+            paths.append(op["file"])
+            continue
+        path = os.path.join(workdir, f"blob-{i}")
+        content = op["content"]
+        with open(path, "wb") as fh:
+            fh.write(content.encode("utf-8") if isinstance(content, str) else content)
+        paths.append(path)
+    out = _git("hash-object", "-w", "--stdin-paths", input="\n".join(paths).encode())
+    return out.splitlines()
+
+
+def _is_delete(op):
+    return op.get("content") is None and "file" not in op
+
+
+def _commit(file_ops, commit_message):
+    """Build and record one commit for file_ops; returns its SHA."""
+    with tempfile.TemporaryDirectory(prefix="publish-") as workdir:
+        index_file = os.path.join(workdir, "index")
+        blob_shas = iter(_write_blobs([op for op in file_ops if not _is_delete(op)], workdir))
+        index_info = "".join(
+            f"0 {ZERO_SHA}\t{op['path']}\n" if _is_delete(op)
+            else f"100644 {next(blob_shas)}\t{op['path']}\n"
+            for op in file_ops
+        ).encode("utf-8")
+
+        for _attempt in range(REF_UPDATE_ATTEMPTS):
+            parent = _branch_tip()
+            if parent:
+                _git("read-tree", parent, index_file=index_file)
+            elif os.path.exists(index_file):
+                os.remove(index_file)
+            _git("update-index", "--index-info", input=index_info, index_file=index_file)
+            tree = _git("write-tree", index_file=index_file)
+
+            if parent and tree == _git("rev-parse", f"{parent}^{{tree}}"):
+                return parent  # nothing changed; don't make an empty commit
+
+            parents = ["-p", parent] if parent else []
+            commit = _git(
+                "commit-tree", tree, *parents,
+                input=commit_message.encode("utf-8"),
+            )
+            try:
+                _git("update-ref", f"refs/heads/{_branch()}", commit, parent or ZERO_SHA)
+            except GitError:
+                logger.warning("Publish branch moved during commit, retrying")
+                continue
+            return commit
+
+    raise GitError("branch kept moving; gave up updating the ref")
+
+
+def _push():
+    remote = getattr(settings, "PUBLISH_GIT_REMOTE", "")
+    if remote:
+        _git("push", "--quiet", remote, f"refs/heads/{_branch()}:refs/heads/{_branch()}")
+
+
+def _commit_url(commit_sha):
+    template = getattr(settings, "PUBLISH_GIT_COMMIT_URL", "")
+    return template.format(sha=commit_sha) if template else ""
+
+
+# ---------------------------------------------------------------------------
+# Public interface (mirrors github.py)
+# ---------------------------------------------------------------------------
+
+
+def publish_files(file_ops, commit_message):
+    """
+    Create, update or delete multiple files in a single commit.
+
+    Args:
+        file_ops: list of dicts with 'path' and 'content' (str, bytes,
+            or None to delete), or 'path' and 'file' (a local file to
+            commit as-is)
+        commit_message: Git commit message
+
+    Returns:
+        dict with keys: success, commit_sha, commit_url, error
+    """
+    try:
+        commit_sha = _commit(file_ops, commit_message)
+        _push()
+    except (GitError, OSError) as e:
+        logger.error("Local git publish failed: %s", e)
+        return _result(False, error=str(e))
+    return _result(True, commit_sha=commit_sha, commit_url=_commit_url(commit_sha))
+
+
+def publish_file(file_path, content, commit_message):
+    """Create or update a single text file."""
+    return publish_files([{"path": file_path, "content": content}], commit_message)
+
+
+def publish_binary_file(file_path, content_bytes, commit_message):
+    """Create or update a single binary file."""
+    return publish_files([{"path": file_path, "content": content_bytes}], commit_message)
+
+
+def delete_file(file_path, commit_message):
+    """Delete a single file; fails if it isn't on the branch."""
+    if not _path_exists(_branch_tip(), file_path):
+        return _result(False, error=f"File not found: {file_path}")
+    return publish_files([{"path": file_path, "content": None}], commit_message)
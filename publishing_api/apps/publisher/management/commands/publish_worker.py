@@ -0,0 +1,69 @@
+"""
+Management command: commit queued PublishJobs in coalesced batches.
+
+Runs as its own process next to the web server. Every job queued within
+the coalescing window goes into one atomic commit; failures are retried
+with backoff. See apps/publisher/queue.py.
+
+Usage:
+    python manage.py publish_worker
+    python manage.py publish_worker --window 10
+    python manage.py publish_worker --once        # Drain due jobs and exit
+"""
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.publisher.queue import process_queue
+
+
+class Command(BaseCommand):
+    help = "Commit queued publish jobs, coalescing those queued close together."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--window",
+            type=float,
+            default=None,
+            help="Seconds to collect jobs before committing (default: PUBLISH_QUEUE_WINDOW).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds between queue checks (default: 1).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Commit every due job without waiting for the window, then exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            total = 0
+            while count := process_queue(window=timedelta(0)):
+                total += count
+            self.stdout.write(f"Processed {total} job(s).")
+            return
+
+        seconds = options["window"]
+        if seconds is None:
+            seconds = settings.PUBLISH_QUEUE_WINDOW
+        window = timedelta(seconds=seconds)
+        self.stdout.write(
+            f"Publish worker started (window {seconds:g}s, "
+            f"poll {options['poll_interval']:g}s)."
+        )
+        try:
+            while True:
+                count = process_queue(window=window)
+                if count:
+                    self.stdout.write(f"Processed {count} job(s).")
+                else:
+                    time.sleep(options["poll_interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("Publish worker stopped.")
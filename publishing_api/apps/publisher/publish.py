@@ -6,8 +6,14 @@ commits it to GitHub, and logs the result. These are what the Publish button cal
 
 Content types publish individual .md files.
 Site configuration publishes a single src/config/site.json.
+
+The editor's Publish buttons don't call these directly: they enqueue a
+PublishJob (apps.publisher.queue) built from content_file(), and the
+publish_worker command commits queued jobs in batches.
 """
 
+from django.utils import timezone
+
 from apps.content.models import (
     Essay,
     FieldNote,
@@ -17,7 +23,7 @@ from apps.content.models import (
     ShelfEntry,
     ToolkitEntry,
 )
-from apps.publisher.github import delete_file, publish_file, publish_files
+from apps.publisher.backend import delete_file, publish_file, publish_files
 from apps.publisher.serializers import (
     serialize_essay,
     serialize_field_note,
@@ -56,89 +62,121 @@ def _log_result(content_type, slug, title, result):
 
 
 # ---------------------------------------------------------------------------
-# Content publish functions
+# Content files
 # ---------------------------------------------------------------------------
 
 
-def publish_essay(essay: Essay):
-    """Serialize and commit an essay to GitHub."""
-    markdown = serialize_essay(essay)
-    file_path = f"{CONTENT_PATHS['essay']}/{essay.slug}.md"
-    commit_msg = f"feat(content): publish essay '{essay.title}'"
+# Maps model class names to content type keys and serializers
+_PUBLISH_REGISTRY = {
+    "Essay": ("essay", serialize_essay),
+    "FieldNote": ("field_note", serialize_field_note),
+    "ShelfEntry": ("shelf", serialize_shelf_entry),
+    "Project": ("project", serialize_project),
+    "ToolkitEntry": ("toolkit", serialize_toolkit_entry),
+}
 
-    result = publish_file(file_path, markdown, commit_msg)
-    log = _log_result("essay", essay.slug, essay.title, result)
+# Content types whose draft flag clears once published
+_DRAFT_MODELS = {
+    "essay": Essay,
+    "field_note": FieldNote,
+    "project": Project,
+}
 
-    if result["success"]:
-        essay.draft = False
-        essay.save(update_fields=["draft", "updated_at"])
 
+def content_file(instance):
+    """
+    Describe the file a content instance publishes to.
+
+    Returns a dict with content_type, slug, title, path, content and
+    commit_message. Used for both direct and queued publishing.
+    """
+    if isinstance(instance, NowPage):
+        return {
+            "content_type": "now",
+            "slug": "now",
+            "title": "Now Page",
+            "path": f"{CONTENT_PATHS['now']}/now.md",
+            "content": serialize_now_page(instance),
+            "commit_message": "feat(content): update Now page",
+        }
+
+    class_name = instance.__class__.__name__
+    if class_name not in _PUBLISH_REGISTRY:
+        raise ValueError(f"Cannot publish content type: {class_name}")
+    content_type, serialize_fn = _PUBLISH_REGISTRY[class_name]
+    label = PublishLog.ContentType(content_type).label.lower()
+    return {
+        "content_type": content_type,
+        "slug": instance.slug,
+        "title": instance.title,
+        "path": f"{CONTENT_PATHS[content_type]}/{instance.slug}.md",
+        "content": serialize_fn(instance),
+        "commit_message": f"feat(content): publish {label} '{instance.title}'",
+    }
+
+
+def site_config_file():
+    """Describe src/config/site.json, in the same shape as content_file()."""
+    return {
+        "content_type": "site_config",
+        "slug": "site-config",
+        "title": "Site Configuration",
+        "path": SITE_CONFIG_PATH,
+        "content": serialize_site_config(),
+        "commit_message": "feat(config): update site configuration",
+    }
+
+
+def mark_published(content_type, slugs):
+    """Clear the draft flag on published essays, field notes and projects."""
+    model = _DRAFT_MODELS.get(content_type)
+    if model is not None:
+        model.objects.filter(slug__in=slugs).update(
+            draft=False, updated_at=timezone.now(),
+        )
+
+
+def _publish_spec(spec):
+    result = publish_file(spec["path"], spec["content"], spec["commit_message"])
+    log = _log_result(spec["content_type"], spec["slug"], spec["title"], result)
+    if result["success"]:
+        mark_published(spec["content_type"], [spec["slug"]])
     return log
 
 
-def publish_field_note(note: FieldNote):
-    """Serialize and commit a field note to GitHub."""
-    markdown = serialize_field_note(note)
-    file_path = f"{CONTENT_PATHS['field_note']}/{note.slug}.md"
-    commit_msg = f"feat(content): publish field note '{note.title}'"
+# ---------------------------------------------------------------------------
+# Content publish functions
+# ---------------------------------------------------------------------------
 
-    result = publish_file(file_path, markdown, commit_msg)
-    log = _log_result("field_note", note.slug, note.title, result)
 
-    if result["success"]:
-        note.draft = False
-        note.save(update_fields=["draft", "updated_at"])
+def publish_essay(essay: Essay):
+    """Serialize and commit an essay to GitHub."""
+    return _publish_spec(content_file(essay))
 
-    return log
+
+def publish_field_note(note: FieldNote):
+    """Serialize and commit a field note to GitHub."""
+    return _publish_spec(content_file(note))
 
 
 def publish_shelf_entry(entry: ShelfEntry):
     """Serialize and commit a shelf entry to GitHub."""
-    markdown = serialize_shelf_entry(entry)
-    file_path = f"{CONTENT_PATHS['shelf']}/{entry.slug}.md"
-    commit_msg = f"feat(content): publish shelf entry '{entry.title}'"
-
-    result = publish_file(file_path, markdown, commit_msg)
-    log = _log_result("shelf", entry.slug, entry.title, result)
-    return log
+    return _publish_spec(content_file(entry))
 
 
 def publish_project(project: Project):
     """Serialize and commit a project to GitHub."""
-    markdown = serialize_project(project)
-    file_path = f"{CONTENT_PATHS['project']}/{project.slug}.md"
-    commit_msg = f"feat(content): publish project '{project.title}'"
-
-    result = publish_file(file_path, markdown, commit_msg)
-    log = _log_result("project", project.slug, project.title, result)
-
-    if result["success"]:
-        project.draft = False
-        project.save(update_fields=["draft", "updated_at"])
-
-    return log
+    return _publish_spec(content_file(project))
 
 
 def publish_toolkit_entry(entry: ToolkitEntry):
     """Serialize and commit a toolkit entry to GitHub."""
-    markdown = serialize_toolkit_entry(entry)
-    file_path = f"{CONTENT_PATHS['toolkit']}/{entry.slug}.md"
-    commit_msg = f"feat(content): publish toolkit entry '{entry.title}'"
-
-    result = publish_file(file_path, markdown, commit_msg)
-    log = _log_result("toolkit", entry.slug, entry.title, result)
-    return log
+    return _publish_spec(content_file(entry))
 
 
 def publish_now_page(now: NowPage):
     """Serialize and commit the Now page to GitHub."""
-    markdown = serialize_now_page(now)
-    file_path = f"{CONTENT_PATHS['now']}/now.md"
-    commit_msg = "feat(content): update Now page"
-
-    result = publish_file(file_path, markdown, commit_msg)
-    log = _log_result("now", "now", "Now Page", result)
-    return log
+    return _publish_spec(content_file(now))
 
 
 # ---------------------------------------------------------------------------
@@ -153,12 +191,7 @@ def publish_site_config():
     Aggregates DesignTokenSet, NavItem, PageComposition, and SiteSettings
     into src/config/site.json.
     """
-    config_json = serialize_site_config()
-    commit_msg = "feat(config): update site configuration"
-
-    result = publish_file(SITE_CONFIG_PATH, config_json, commit_msg)
-    log = _log_result("site_config", "site-config", "Site Configuration", result)
-    return log
+    return _publish_spec(site_config_file())
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,260 @@
+"""
+Background publish queue.
+
+The editor's Publish buttons call enqueue_content() / enqueue_site_config()
+and return at once instead of waiting on GitHub. The publish_worker
+management command drains the queue:
+
+  1. Requeue jobs left RUNNING by a worker that died (STALE_AFTER), or
+     fail them once they have used MAX_ATTEMPTS (a job that kills the
+     worker would otherwise be retried forever).
+  2. Once the oldest due job has waited PUBLISH_QUEUE_WINDOW seconds,
+     claim every due job and commit them all with one publish_files()
+     call. A later job for the same path wins.
+  3. Record a PublishLog per job. On failure, reschedule with backoff
+     until MAX_ATTEMPTS, then mark the job failed.
+
+Re-publishing a file that is still queued updates the queued job rather
+than adding another, so two quick edits produce one commit. Queue state
+lives in the database, so pending retries survive restarts.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.content.models import PublishJob, PublishLog
+from apps.publisher.backend import publish_files
+from apps.publisher.publish import content_file, mark_published, site_config_file
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+
+# Retry n waits RETRY_BACKOFF * 2 ** (n - 1) seconds, capped.
+RETRY_BACKOFF = 30
+RETRY_BACKOFF_MAX = 15 * 60
+
+# A RUNNING job older than this belongs to a worker that died.
+STALE_AFTER = timedelta(minutes=10)
+
+# Jobs per commit; the rest go in the next batch.
+MAX_BATCH_SIZE = 200
+
+
+def _window():
+    return timedelta(seconds=getattr(settings, "PUBLISH_QUEUE_WINDOW", 3))
+
+
+# ---------------------------------------------------------------------------
+# Enqueue
+# ---------------------------------------------------------------------------
+
+
+def enqueue(spec):
+    """
+    Queue a file write described by a content_file()-style dict.
+
+    Returns the PublishJob, which is an existing queued job for the same
+    path when there is one (its content is replaced).
+    """
+    fields = {
+        "content_type": spec["content_type"],
+        "content_slug": spec["slug"],
+        "content_title": spec["title"],
+        "content": spec["content"],
+        "commit_message": spec["commit_message"],
+    }
+    with transaction.atomic():
+        job = (
+            PublishJob.objects
+            .select_for_update()
+            .filter(file_path=spec["path"], status=PublishJob.Status.QUEUED)
+            .first()
+        )
+        if job is None:
+            return PublishJob.objects.create(
+                file_path=spec["path"], run_after=timezone.now(), **fields,
+            )
+        for name, value in fields.items():
+            setattr(job, name, value)
+        job.save(update_fields=[*fields, "updated_at"])
+        return job
+
+
+def enqueue_content(instance):
+    """Queue a content instance (Essay, FieldNote, ..., NowPage)."""
+    return enqueue(content_file(instance))
+
+
+def enqueue_site_config():
+    """Queue src/config/site.json."""
+    return enqueue(site_config_file())
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+
+def requeue_stale(now=None):
+    """
+    Return jobs stuck RUNNING by a dead worker to the queue, or fail
+    (and log) those with no attempts left. Returns the number requeued.
+    """
+    now = now or timezone.now()
+    stale = PublishJob.objects.filter(
+        status=PublishJob.Status.RUNNING,
+        started_at__lt=now - STALE_AFTER,
+    )
+    with transaction.atomic():
+        exhausted = list(
+            stale.filter(attempts__gte=MAX_ATTEMPTS).select_for_update(skip_locked=True)
+        )
+        for job in exhausted:
+            job.status = PublishJob.Status.FAILED
+            job.finished_at = now
+            job.error_message = f"Worker stopped during attempt {job.attempts}; giving up."
+        logs = PublishLog.objects.bulk_create([
+            PublishLog(
+                content_type=job.content_type,
+                content_slug=job.content_slug,
+                content_title=job.content_title,
+                success=False,
+                error_message=job.error_message,
+            )
+            for job in exhausted
+        ])
+        for job, log in zip(exhausted, logs):
+            job.publish_log = log
+        PublishJob.objects.bulk_update(
+            exhausted, ["status", "finished_at", "error_message", "publish_log"],
+        )
+    if exhausted:
+        logger.warning("Failed %d publish jobs that stopped their worker", len(exhausted))
+    return stale.update(status=PublishJob.Status.QUEUED, run_after=now)
+
+
+def claim_batch(window=None, now=None):
+    """
+    Claim the next batch of due jobs, or return [] if none is ready.
+
+    A batch is ready once its oldest due job has waited `window`, so
+    everything enqueued in that time is committed together.
+    """
+    window = _window() if window is None else window
+    now = now or timezone.now()
+    with transaction.atomic():
+        due = (
+            PublishJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=PublishJob.Status.QUEUED, run_after__lte=now)
+            .order_by("run_after", "pk")
+        )
+        jobs = list(due[:MAX_BATCH_SIZE])
+        if not jobs or jobs[0].run_after > now - window:
+            return []
+        PublishJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            status=PublishJob.Status.RUNNING,
+            started_at=now,
+            attempts=F("attempts") + 1,
+        )
+    for job in jobs:
+        job.status = PublishJob.Status.RUNNING
+        job.started_at = now
+        job.attempts += 1
+    return jobs
+
+
+def _batch_message(jobs):
+    if len(jobs) == 1:
+        return jobs[0].commit_message
+    lines = "\n".join(f"- {job.commit_message}" for job in jobs)
+    return f"feat(content): publish {len(jobs)} files\n\n{lines}"
+
+
+def _retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * 2 ** (attempts - 1)))
+
+
+def run_batch(jobs):
+    """
+    Commit claimed jobs in one publish_files() call and record the outcome.
+
+    Returns the publish_files() result dict.
+    """
+    # Later jobs for the same path win; enqueue() normally prevents
+    # duplicates, but a retried job can meet a newer one.
+    latest = {}
+    for job in sorted(jobs, key=lambda job: (job.updated_at, job.pk)):
+        latest[job.file_path] = job
+    file_ops = [{"path": path, "content": job.content} for path, job in latest.items()]
+
+    try:
+        result = publish_files(file_ops, _batch_message(list(latest.values())))
+    except Exception as e:
+        logger.exception("Publish batch of %d jobs raised", len(jobs))
+        result = {"success": False, "commit_sha": "", "commit_url": "", "error": str(e)}
+
+    now = timezone.now()
+    for job in jobs:
+        job.commit_sha = result["commit_sha"]
+        job.commit_url = result["commit_url"]
+        job.error_message = result["error"] or ""
+        if result["success"]:
+            job.status = PublishJob.Status.SUCCEEDED
+            job.finished_at = now
+        elif job.attempts < MAX_ATTEMPTS:
+            job.status = PublishJob.Status.QUEUED
+            job.run_after = now + _retry_delay(job.attempts)
+        else:
+            job.status = PublishJob.Status.FAILED
+            job.finished_at = now
+
+    done = [job for job in jobs if job.done]
+    with transaction.atomic():
+        logs = PublishLog.objects.bulk_create([
+            PublishLog(
+                content_type=job.content_type,
+                content_slug=job.content_slug,
+                content_title=job.content_title,
+                commit_sha=job.commit_sha,
+                commit_url=job.commit_url,
+                success=job.status == PublishJob.Status.SUCCEEDED,
+                error_message=job.error_message,
+            )
+            for job in done
+        ])
+        for job, log in zip(done, logs):
+            job.publish_log = log
+        PublishJob.objects.bulk_update(jobs, [
+            "status", "run_after", "finished_at", "commit_sha", "commit_url",
+            "error_message", "publish_log",
+        ])
+        if result["success"]:
+            slugs_by_type = {}
+            for job in jobs:
+                slugs_by_type.setdefault(job.content_type, []).append(job.content_slug)
+            for content_type, slugs in slugs_by_type.items():
+                mark_published(content_type, slugs)
+
+    if result["success"]:
+        logger.info("Published %d queued jobs in %s", len(jobs), result["commit_sha"])
+    else:
+        logger.warning("Publish batch of %d jobs failed: %s", len(jobs), result["error"])
+    return result
+
+
+def process_queue(window=None, now=None):
+    """
+    Run one worker iteration. Returns the number of jobs processed.
+    """
+    requeue_stale(now)
+    jobs = claim_batch(window, now)
+    if jobs:
+        run_batch(jobs)
+    return len(jobs)
@@ -1,3 +1,644 @@
-from django.test import TestCase
+import base64
+import hashlib
+import itertools
+import json
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.content.models import Essay, PublishJob, PublishLog
+from apps.publisher import backend, github, local_git, queue
+
+
+# ---------------------------------------------------------------------------
+# Fake GitHub API
+# ---------------------------------------------------------------------------
+
+
+def _blob_sha(content):
+    data = content.encode("utf-8")
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class FakeGitHub:
+    """
+    In-process stand-in for the parts of the GitHub REST API we use.
+
+    Implements the Git Data API (refs, commits, trees, blobs) and the
+    Contents API over a real in-memory repository, so a publish can be
+    checked by reading files back. Tree reads honour If-None-Match. Records every request and the
+    most requests ever in flight at once, and can add latency or queue
+    failure responses to exercise retries.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests = []
+        self.connections = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.failures = []  # queued (status, headers) responses
+        self.blobs = {}
+        self.trees = {}  # sha -> {path: blob_sha}
+        self.commits = {}  # sha -> {"tree": sha, "parents": [...], "message": ...}
+        self._ids = itertools.count(1)
+
+        empty_tree = self._store_tree({})
+        root = self._store_commit(empty_tree, [], "initial")
+        self.refs = {"main": root}
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Keep-alive responses are written in two parts; without
+            # TCP_NODELAY the second waits on a delayed ACK (~40 ms).
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _dispatch(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                status, payload, headers = fake.handle(
+                    method, self.path, body, self.client_address, self.headers,
+                )
+                data = b"" if status == 304 else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_PUT(self):
+                self._dispatch("PUT")
+
+            def do_PATCH(self):
+                self._dispatch("PATCH")
+
+            def do_DELETE(self):
+                self._dispatch("DELETE")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    # -- repository ----------------------------------------------------------
+
+    def _sha(self):
+        return hashlib.sha1(str(next(self._ids)).encode()).hexdigest()
+
+    def _store_tree(self, files):
+        sha = self._sha()
+        self.trees[sha] = dict(files)
+        return sha
+
+    def _store_commit(self, tree, parents, message):
+        sha = self._sha()
+        self.commits[sha] = {"tree": tree, "parents": parents, "message": message}
+        return sha
+
+    def files(self, branch="main"):
+        """Current {path: content} on a branch."""
+        tree = self.trees[self.commits[self.refs[branch]]["tree"]]
+        return {path: self.blobs[sha] for path, sha in tree.items()}
+
+    def head_message(self, branch="main"):
+        return self.commits[self.refs[branch]]["message"]
+
+    def _commit_file(self, branch, path, content, message):
+        files = dict(self.trees[self.commits[self.refs[branch]]["tree"]])
+        if content is None:
+            files.pop(path, None)
+        else:
+            blob = _blob_sha(content)
+            self.blobs[blob] = content
+            files[path] = blob
+        commit = self._store_commit(self._store_tree(files), [self.refs[branch]], message)
+        self.refs[branch] = commit
+        return commit
+
+    # -- request handling ----------------------------------------------------
+
+    def handle(self, method, path, body, client_address, headers=None):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            return self._handle(method, path, body, client_address, headers)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def _handle(self, method, path, body, client_address, headers):
+        with self.lock:
+            self.requests.append((method, path))
+            self.connections.add(client_address)
+            if self.failures:
+                status, headers = self.failures.pop(0)
+                return status, {"message": "injected failure"}, headers
+            return self._route(method, path.split("?")[0], body, headers or {})
+
+    def _route(self, method, path, body, headers):
+        prefix, _, rest = path.partition("/repos/owner/repo/")
+        if prefix or not rest:
+            return 404, {"message": "Not Found"}, {}
+
+        if method == "GET" and rest.startswith("git/ref/heads/"):
+            branch = rest[len("git/ref/heads/"):]
+            return 200, {"object": {"sha": self.refs[branch]}}, {}
+        if method == "GET" and rest.startswith("git/commits/"):
+            commit = self.commits[rest[len("git/commits/"):]]
+            return 200, {"tree": {"sha": commit["tree"]}}, {}
+        if method == "GET" and rest.startswith("git/trees/"):
+            ref = rest[len("git/trees/"):]
+            tree = self.commits[self.refs[ref]]["tree"] if ref in self.refs else ref
+            etag = f'"{tree}"'
+            if headers.get("If-None-Match") == etag:
+                return 304, None, {"ETag": etag}
+            entries = [
+                {"path": path, "type": "blob", "sha": sha}
+                for path, sha in sorted(self.trees[tree].items())
+            ]
+            return 200, {"sha": tree, "tree": entries, "truncated": False}, {"ETag": etag}
+        if method == "POST" and rest == "git/blobs":
+            sha = _blob_sha(body["content"])
+            self.blobs[sha] = body["content"]
+            return 201, {"sha": sha}, {}
+        if method == "POST" and rest == "git/trees":
+            files = dict(self.trees[body["base_tree"]])
+            for entry in body["tree"]:
+                if entry["sha"] is None:
+                    files.pop(entry["path"], None)
+                else:
+                    files[entry["path"]] = entry["sha"]
+            return 201, {"sha": self._store_tree(files)}, {}
+        if method == "POST" and rest == "git/commits":
+            sha = self._store_commit(body["tree"], body["parents"], body["message"])
+            return 201, {"sha": sha, "html_url": f"https://github.test/commit/{sha}"}, {}
+        if method == "PATCH" and rest.startswith("git/refs/heads/"):
+            self.refs[rest[len("git/refs/heads/"):]] = body["sha"]
+            return 200, {}, {}
+
+        if rest.startswith("contents/"):
+            file_path = rest[len("contents/"):]
+            files = self.trees[self.commits[self.refs["main"]]["tree"]]
+            if method == "GET":
+                if file_path not in files:
+                    return 404, {"message": "Not Found"}, {}
+                return 200, {"sha": files[file_path]}, {}
+            if method in ("PUT", "DELETE"):
+                if file_path in files and body.get("sha") != files[file_path]:
+                    return 409, {"message": "sha mismatch"}, {}
+                if method == "DELETE" and file_path not in files:
+                    return 404, {"message": "Not Found"}, {}
+                content = (
+                    base64.b64decode(body["content"]).decode()
+                    if method == "PUT" else None
+                )
+                sha = self._commit_file("main", file_path, content, body["message"])
+                return 200, {"commit": {"sha": sha, "html_url": ""}}, {}
+
+        return 404, {"message": "Not Found"}, {}
+
+
+@override_settings(GITHUB_TOKEN="token", GITHUB_REPO="owner/repo", GITHUB_BRANCH="main")
+class FakeGitHubTestCase(SimpleTestCase):
+    latency = 0.0
+
+    def setUp(self):
+        self.fake = FakeGitHub(latency=self.latency).start()
+        self.addCleanup(self.fake.stop)
+
+        # Record backoff sleeps instead of sleeping
+        self.sleeps = []
+        self.client_obj = github.GitHubClient(sleep=self.sleeps.append)
+        for target, value in (
+            ("API_BASE", self.fake.url),
+            ("_client", self.client_obj),
+            ("_tree_cache", github.TreeCache()),
+        ):
+            patcher = patch.object(github, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+class PublishFilesTest(FakeGitHubTestCase):
+    def test_multi_file_commit_writes_every_file(self):
+        ops = [{"path": f"src/data/f{i}.json", "content": f'{{"n": {i}}}'} for i in range(50)]
+        result = github.publish_files(ops, "data: publish 50 files")
+
+        self.assertTrue(result["success"])
+        files = self.fake.files()
+        self.assertEqual(len(files), 50)
+        self.assertEqual(files["src/data/f7.json"], '{"n": 7}')
+        self.assertEqual(self.fake.head_message(), "data: publish 50 files")
+
+    def test_fifty_files_cost_fifty_five_round_trips(self):
+        ops = [{"path": f"f{i}.json", "content": str(i)} for i in range(50)]
+        github.publish_files(ops, "data")
+
+        # ref, commit, 50 blobs, tree, commit, ref update
+        self.assertEqual(self.client_obj.request_count, 55)
+        self.assertEqual(len(self.fake.requests), 55)
+
+    def test_connections_are_pooled(self):
+        ops = [{"path": f"f{i}.json", "content": str(i)} for i in range(50)]
+        github.publish_files(ops, "data")
+
+        self.assertLessEqual(len(self.fake.connections), github.BLOB_UPLOAD_WORKERS)
+
+    def test_delete_op_removes_file(self):
+        github.publish_files([{"path": "a.md", "content": "a"}, {"path": "b.md", "content": "b"}], "add")
+        result = github.publish_files([{"path": "a.md", "content": None}], "remove")
+
+        self.assertTrue(result["success"])
+        self.assertEqual(self.fake.files(), {"b.md": "b"})
+
+
+class RetryTest(FakeGitHubTestCase):
+    def test_server_error_is_retried(self):
+        self.fake.failures = [(502, {}), (503, {})]
+        result = github.publish_files([{"path": "a.md", "content": "a"}], "add")
+
+        self.assertTrue(result["success"])
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertEqual(self.fake.files(), {"a.md": "a"})
+
+    def test_retry_after_is_respected(self):
+        self.fake.failures = [(429, {"Retry-After": "3"})]
+        result = github.publish_files([{"path": "a.md", "content": "a"}], "add")
+
+        self.assertTrue(result["success"])
+        self.assertEqual(self.sleeps, [3.0])
+
+    def test_exhausted_rate_limit_waits_for_reset(self):
+        reset = str(int(time.time()) + 5)
+        self.fake.failures = [(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset})]
+        result = github.publish_files([{"path": "a.md", "content": "a"}], "add")
+
+        self.assertTrue(result["success"])
+        self.assertEqual(len(self.sleeps), 1)
+        self.assertGreater(self.sleeps[0], 3)
+
+    def test_distant_rate_limit_reset_fails_fast(self):
+        reset = str(int(time.time()) + 3600)
+        self.fake.failures = [(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset})]
+        result = github.publish_files([{"path": "a.md", "content": "a"}], "add")
+
+        self.assertFalse(result["success"])
+        self.assertEqual(self.sleeps, [])
+
+    def test_gives_up_after_max_retries(self):
+        self.fake.failures = [(502, {})] * (github.MAX_RETRIES + 1)
+        result = github.publish_files([{"path": "a.md", "content": "a"}], "add")
+
+        self.assertFalse(result["success"])
+        self.assertEqual(len(self.sleeps), github.MAX_RETRIES)
+
+    def test_client_errors_are_not_retried(self):
+        self.fake.failures = [(422, {})]
+        result = github.publish_files([{"path": "a.md", "content": "a"}], "add")
+
+        self.assertFalse(result["success"])
+        self.assertEqual(self.sleeps, [])
+
+
+class ContentsApiTest(FakeGitHubTestCase):
+    def test_publish_then_update_then_delete(self):
+        self.assertTrue(github.publish_file("a.md", "one", "add")["success"])
+        self.assertTrue(github.publish_file("a.md", "two", "update")["success"])
+        self.assertEqual(self.fake.files(), {"a.md": "two"})
+
+        self.assertTrue(github.delete_file("a.md", "remove")["success"])
+        self.assertEqual(self.fake.files(), {})
+
+    def test_delete_missing_file_fails(self):
+        result = github.delete_file("missing.md", "remove")
+        self.assertFalse(result["success"])
+
+    def test_new_file_costs_tree_read_and_put(self):
+        github.publish_file("a.md", "one", "add")
+
+        self.assertEqual(
+            [method for method, _path in self.fake.requests], ["GET", "PUT"],
+        )
+        self.assertTrue(self.fake.requests[0][1].startswith("/repos/owner/repo/git/trees/main"))
+
+    def test_unchanged_file_is_not_uploaded(self):
+        first = github.publish_file("a.md", "same", "add")
+        self.fake.requests.clear()
+        second = github.publish_file("a.md", "same", "again")
+        third = github.publish_file("a.md", "same", "and again")
+
+        self.assertTrue(second["success"])
+        self.assertEqual(second["commit_sha"], "")
+        self.assertTrue(third["success"])
+        self.assertEqual(self.fake.head_message(), "add")
+        self.assertNotEqual(first["commit_sha"], "")
+        # One full tree read after the commit, then a bodiless 304
+        self.assertEqual([m for m, _p in self.fake.requests], ["GET", "GET"])
+        self.assertIsNotNone(github._tree_cache.etag)
+
+    def test_binary_file_uses_cached_sha(self):
+        github.publish_binary_file("img/a.png", b"v1", "add")
+        result = github.publish_binary_file("img/a.png", b"v2", "update")
+
+        self.assertTrue(result["success"])
+        self.assertEqual(self.fake.files(), {"img/a.png": "v2"})
+        self.assertFalse(any("/contents/" in p for m, p in self.fake.requests if m == "GET"))
+
+    def test_external_change_invalidates_cache(self):
+        github.publish_file("a.md", "one", "add")
+        github.publish_file("b.md", "b", "warm cache")
+        self.fake._commit_file("main", "a.md", "edited elsewhere", "external")
+
+        result = github.publish_file("a.md", "one", "restore")
+
+        self.assertTrue(result["success"])
+        self.assertNotEqual(result["commit_sha"], "")
+        self.assertEqual(self.fake.files()["a.md"], "one")
+
+    def test_tree_read_failure_falls_back_to_contents_lookup(self):
+        github.publish_file("a.md", "one", "add")
+        self.fake.failures = [(404, {})]
+
+        result = github.publish_file("a.md", "two", "update")
+
+        self.assertTrue(result["success"])
+        self.assertEqual(self.fake.files(), {"a.md": "two"})
+
+
+class ParallelBlobUploadTest(FakeGitHubTestCase):
+    """50-file commit at 20 ms per request: blob uploads overlap."""
+
+    latency = 0.02
+
+    def test_fifty_file_commit_uploads_blobs_concurrently(self):
+        ops = [{"path": f"f{i}.json", "content": str(i)} for i in range(50)]
+        github.publish_files(ops, "data")
+
+        # Asserts on overlap rather than wall time: the latency holds each
+        # request open long enough for the pool's uploads to overlap.
+        self.assertGreater(self.fake.max_in_flight, 1)
+        self.assertLessEqual(self.fake.max_in_flight, github.BLOB_UPLOAD_WORKERS)
+        self.assertEqual(len(self.fake.files()), 50)
+
+
+# ---------------------------------------------------------------------------
+# Local git backend
+# ---------------------------------------------------------------------------
+
+
+def _run_git(*args):
+    return subprocess.run(
+        ["git", *args], check=True, capture_output=True, text=True,
+    ).stdout
+
+
+class LocalGitBackendTest(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory(prefix="publish-test-")
+        self.addCleanup(tmp.cleanup)
+        self.repo = os.path.join(tmp.name, "site.git")
+        self.remote = os.path.join(tmp.name, "remote.git")
+        _run_git("init", "--quiet", "--bare", self.repo)
+        _run_git("init", "--quiet", "--bare", self.remote)
+
+        overrides = override_settings(
+            PUBLISH_BACKEND="local_git",
+            PUBLISH_GIT_REPO=self.repo,
+            PUBLISH_GIT_BRANCH="main",
+            PUBLISH_GIT_REMOTE="",
+            PUBLISH_GIT_COMMIT_URL="https://example.test/commit/{sha}",
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def show(self, path, repo=None):
+        return _run_git("-C", repo or self.repo, "show", f"main:{path}")
+
+    def tree(self, repo=None):
+        return _run_git("-C", repo or self.repo, "ls-tree", "-r", "--name-only", "main").split()
+
+    def test_multi_file_commit_adds_and_deletes(self):
+        local_git.publish_files(
+            [{"path": "a.md", "content": "a"}, {"path": "src/b.json", "content": "{}"}], "add",
+        )
+        result = local_git.publish_files(
+            [{"path": "a.md", "content": None}, {"path": "c.md", "content": "c"}], "swap",
+        )
+
+        self.assertTrue(result["success"])
+        self.assertEqual(self.tree(), ["c.md", "src/b.json"])
+        self.assertEqual(self.show("src/b.json"), "{}")
+        self.assertEqual(
+            result["commit_url"], f"https://example.test/commit/{result['commit_sha']}",
+        )
+        log = _run_git("-C", self.repo, "log", "--format=%s", "main").split()
+        self.assertEqual(log, ["swap", "add"])
+
+    def test_binary_file_round_trips(self):
+        data = bytes(range(256))
+        self.assertTrue(local_git.publish_binary_file("img/x.bin", data, "image")["success"])
+
+        out = subprocess.run(
+            ["git", "-C", self.repo, "show", "main:img/x.bin"], check=True, capture_output=True,
+        ).stdout
+        self.assertEqual(out, data)
+
+    def test_identical_content_makes_no_commit(self):
+        first = local_git.publish_file("a.md", "same", "add")
+        second = local_git.publish_file("a.md", "same", "again")
+
+        self.assertTrue(second["success"])
+        self.assertEqual(first["commit_sha"], second["commit_sha"])
+
+    def test_delete_missing_file_fails(self):
+        local_git.publish_file("a.md", "a", "add")
+        result = local_git.delete_file("missing.md", "remove")
+
+        self.assertFalse(result["success"])
+        self.assertEqual(self.tree(), ["a.md"])
+
+    def test_pushes_to_remote(self):
+        with override_settings(PUBLISH_GIT_REMOTE=self.remote):
+            result = local_git.publish_file("a.md", "pushed", "add")
+
+        self.assertTrue(result["success"])
+        self.assertEqual(self.show("a.md", repo=self.remote), "pushed")
+
+    def test_dispatcher_uses_configured_backend(self):
+        result = backend.publish_file("a.md", "via dispatcher", "add")
+
+        self.assertTrue(result["success"])
+        self.assertEqual(self.show("a.md"), "via dispatcher")
+        with override_settings(PUBLISH_BACKEND="svn"):
+            with self.assertRaises(ValueError):
+                backend.get_backend()
+
+
+# ---------------------------------------------------------------------------
+# Publish queue
+# ---------------------------------------------------------------------------
+
+
+def _spec(path, content, slug="a", content_type="essay"):
+    return {
+        "content_type": content_type,
+        "slug": slug,
+        "title": slug.title(),
+        "path": path,
+        "content": content,
+        "commit_message": f"feat(content): publish {slug}",
+    }
+
+
+class PublishQueueTest(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory(prefix="publish-queue-test-")
+        self.addCleanup(tmp.cleanup)
+        self.repo = os.path.join(tmp.name, "site.git")
+        _run_git("init", "--quiet", "--bare", self.repo)
+
+        overrides = override_settings(
+            PUBLISH_BACKEND="local_git",
+            PUBLISH_GIT_REPO=self.repo,
+            PUBLISH_GIT_BRANCH="main",
+            PUBLISH_GIT_REMOTE="",
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def commits(self):
+        return _run_git("-C", self.repo, "rev-list", "--count", "main").strip()
+
+    def test_requeueing_a_path_updates_the_queued_job(self):
+        first = queue.enqueue(_spec("a.md", "one"))
+        second = queue.enqueue(_spec("a.md", "two"))
+
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(PublishJob.objects.get().content, "two")
+
+    def test_batch_waits_for_window(self):
+        job = queue.enqueue(_spec("a.md", "one"))
+        window = timedelta(seconds=5)
+
+        self.assertEqual(queue.claim_batch(window, now=job.run_after + timedelta(seconds=1)), [])
+        claimed = queue.claim_batch(window, now=job.run_after + timedelta(seconds=6))
+        self.assertEqual([j.pk for j in claimed], [job.pk])
+        self.assertEqual(PublishJob.objects.get().status, PublishJob.Status.RUNNING)
+
+    def test_jobs_in_window_share_one_commit(self):
+        queue.enqueue(_spec("a.md", "a", slug="a"))
+        queue.enqueue(_spec("b.md", "b", slug="b"))
+        queue.enqueue(_spec("a.md", "a2", slug="a"))
+
+        self.assertEqual(queue.process_queue(window=timedelta(0)), 2)
+
+        self.assertEqual(self.commits(), "1")
+        self.assertEqual(_run_git("-C", self.repo, "show", "main:a.md"), "a2")
+        jobs = PublishJob.objects.all()
+        self.assertEqual({job.status for job in jobs}, {PublishJob.Status.SUCCEEDED})
+        self.assertEqual(len({job.commit_sha for job in jobs}), 1)
+        self.assertEqual(PublishLog.objects.filter(success=True).count(), 2)
+
+    def test_failed_batch_is_retried_then_fails(self):
+        job = queue.enqueue(_spec("a.md", "a"))
+        with override_settings(PUBLISH_GIT_REPO=os.path.join(self.repo, "missing")):
+            queue.process_queue(window=timedelta(0))
+            job.refresh_from_db()
+            self.assertEqual(job.status, PublishJob.Status.QUEUED)
+            self.assertEqual(job.attempts, 1)
+            self.assertGreater(job.run_after, timezone.now())
+            self.assertFalse(PublishLog.objects.exists())
+
+            for _ in range(queue.MAX_ATTEMPTS - 1):
+                queue.process_queue(window=timedelta(0), now=job.run_after)
+                job.refresh_from_db()
+
+        self.assertEqual(job.status, PublishJob.Status.FAILED)
+        self.assertFalse(job.publish_log.success)
+
+    def test_stale_running_jobs_are_requeued(self):
+        job = queue.enqueue(_spec("a.md", "a"))
+        queue.claim_batch(timedelta(0))
+
+        later = timezone.now() + queue.STALE_AFTER + timedelta(seconds=1)
+        self.assertEqual(queue.requeue_stale(later), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, PublishJob.Status.QUEUED)
+
+    def test_stale_job_out_of_attempts_fails(self):
+        job = queue.enqueue(_spec("a.md", "a"))
+        PublishJob.objects.filter(pk=job.pk).update(attempts=queue.MAX_ATTEMPTS - 1)
+        queue.claim_batch(timedelta(0))
+
+        later = timezone.now() + queue.STALE_AFTER + timedelta(seconds=1)
+        self.assertEqual(queue.requeue_stale(later), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, PublishJob.Status.FAILED)
+        self.assertEqual(job.attempts, queue.MAX_ATTEMPTS)
+        self.assertTrue(job.error_message)
+        self.assertFalse(job.publish_log.success)
+        self.assertEqual(queue.claim_batch(timedelta(0), now=later), [])
+
+    def test_publish_view_queues_and_status_polls(self):
+        user = get_user_model().objects.create_user("editor", password="pw")
+        self.client.force_login(user)
+        essay = Essay.objects.create(
+            title="Queued Essay", slug="queued-essay", date=date(2024, 1, 1),
+            summary="Summary", draft=True,
+        )
+
+        resp = self.client.post(
+            reverse("editor:essay-publish", kwargs={"slug": essay.slug}),
+            HTTP_HX_REQUEST="true",
+        )
+        self.assertEqual(resp.status_code, 202)
+        data = resp.json()
+        self.assertTrue(data["queued"])
+        self.assertFalse(data["done"])
+
+        queue.process_queue(window=timedelta(0))
+        status = self.client.get(data["status_url"]).json()
+        self.assertTrue(status["done"])
+        self.assertTrue(status["success"])
+        essay.refresh_from_db()
+        self.assertFalse(essay.draft)
@@ -9,6 +9,8 @@ Environment variables (set in .env for local dev, Railway dashboard for prod):
   GITHUB_TOKEN        GitHub PAT with repo scope
   GITHUB_REPO         Owner/repo format (e.g. "travisgilbert/website")
   GITHUB_BRANCH       Target branch (default: "main")
+  PUBLISH_BACKEND     "github" (default) or "local_git"
+  PUBLISH_GIT_REPO    Local repository path for the local_git backend
 """
 
 import os
@@ -203,6 +205,20 @@ GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN", "").strip()
 GITHUB_REPO = os.environ.get("GITHUB_REPO", "").strip()
 GITHUB_BRANCH = os.environ.get("GITHUB_BRANCH", "main").strip()
 
+# Publish backend: "github" (REST API) or "local_git" (commit into a local
+# repository with git, optionally pushing). See apps/publisher/local_git.py.
+PUBLISH_BACKEND = os.environ.get("PUBLISH_BACKEND", "github").strip()
+PUBLISH_GIT_REPO = os.environ.get("PUBLISH_GIT_REPO", "").strip()
+PUBLISH_GIT_BRANCH = os.environ.get("PUBLISH_GIT_BRANCH", "").strip()
+PUBLISH_GIT_REMOTE = os.environ.get("PUBLISH_GIT_REMOTE", "").strip()
+PUBLISH_GIT_COMMIT_URL = os.environ.get("PUBLISH_GIT_COMMIT_URL", "").strip()
+PUBLISH_GIT_AUTHOR_NAME = os.environ.get("PUBLISH_GIT_AUTHOR_NAME", "Publishing API").strip()
+PUBLISH_GIT_AUTHOR_EMAIL = os.environ.get("PUBLISH_GIT_AUTHOR_EMAIL", "publishing-api@localhost").strip()
+
+# Publish queue: seconds the publish_worker collects queued jobs before
+# committing them together (see apps/publisher/queue.py).
+PUBLISH_QUEUE_WINDOW = float(os.environ.get("PUBLISH_QUEUE_WINDOW", "3"))
+
 # Production security (only when DEBUG=False)
 if not DEBUG:
     SECURE_SSL_REDIRECT = True
@@ -151,3 +151,62 @@ class MentionSerializer(serializers.ModelSerializer):
             'mention_source', 'mention_source_name', 'mention_source_avatar',
             'created_at',
         ]
+
+
+# ---------------------------------------------------------------------------
+# Change feed serializers (flat records; relations by id)
+# ---------------------------------------------------------------------------
+
+class SourceChangeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Source
+        fields = [
+            'id', 'title', 'slug', 'creator', 'source_type',
+            'url', 'publication', 'date_published', 'date_encountered',
+            'public_annotation', 'key_findings', 'tags',
+            'location_name', 'latitude', 'longitude',
+            'created_at', 'updated_at',
+        ]
+
+
+class SourceLinkChangeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SourceLink
+        fields = [
+            'id', 'source', 'content_type', 'content_slug', 'content_title',
+            'role', 'key_quote', 'date_linked',
+            'created_at', 'updated_at',
+        ]
+
+
+class ThreadChangeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ResearchThread
+        fields = [
+            'id', 'title', 'slug', 'description',
+            'status', 'started_date', 'completed_date',
+            'resulting_essay_slug', 'tags',
+            'created_at', 'updated_at',
+        ]
+
+
+class ThreadEntryChangeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ThreadEntry
+        fields = [
+            'id', 'thread', 'entry_type', 'date', 'order',
+            'title', 'description', 'source', 'field_note_slug',
+            'created_at', 'updated_at',
+        ]
+
+
+class MentionChangeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Mention
+        fields = [
+            'id', 'source_url', 'source_title', 'source_excerpt',
+            'source_author', 'source_author_url', 'source_published',
+            'target_content_type', 'target_slug',
+            'mention_type', 'featured', 'mention_source',
+            'created_at', 'updated_at',
+        ]
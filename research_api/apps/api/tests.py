@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.db.models import F
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.core.changes import SETTLE_SECONDS
+from apps.core.models import ChangeEvent
+from apps.research.models import Source
+
+
+class ChangeFeedTest(TestCase):
+
+    def create_source(self, slug, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Source.objects.create(title=slug.title(), slug=slug, public=True, **fields)
+
+    def settle(self):
+        """Age every event past the settle window."""
+        ChangeEvent.objects.update(
+            created_at=F('created_at') - timedelta(seconds=SETTLE_SECONDS + 1),
+        )
+
+    def get(self, **params):
+        resp = self.client.get(reverse('api:change-feed'), params)
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()
+
+    def test_cursor_paging(self):
+        sources = [self.create_source(f'source-{i}') for i in range(5)]
+        self.settle()
+
+        first = self.get(since=0, limit=2)
+        self.assertEqual([c['id'] for c in first['changes']], [s.pk for s in sources[:2]])
+        self.assertTrue(first['has_more'])
+
+        rest = self.get(since=first['next'], limit=10)
+        self.assertEqual([c['id'] for c in rest['changes']], [s.pk for s in sources[2:]])
+        self.assertFalse(rest['has_more'])
+
+        empty = self.get(since=rest['next'])
+        self.assertEqual(empty['changes'], [])
+        self.assertEqual(empty['next'], rest['next'])
+
+    def test_unsettled_events_are_held_back(self):
+        self.create_source('fresh')
+        feed = self.get(since=0)
+        self.assertEqual(feed['changes'], [])
+        self.assertEqual(feed['next'], 0)
+
+    def test_events_for_one_record_collapse_to_the_latest(self):
+        source = self.create_source('edited')
+        with self.captureOnCommitCallbacks(execute=True):
+            source.title = 'Edited Again'
+            source.save()
+        self.settle()
+
+        changes = self.get(since=0)['changes']
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0]['op'], 'updated')
+        self.assertEqual(changes[0]['data']['title'], 'Edited Again')
+
+    def test_delete_collapses_to_deleted_with_keys(self):
+        source = self.create_source('doomed')
+        pk = source.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            source.delete()
+        self.settle()
+
+        changes = self.get(since=0)['changes']
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0]['op'], 'deleted')
+        self.assertEqual(changes[0]['id'], pk)
+        self.assertIsNone(changes[0]['data'])
+        self.assertEqual(changes[0]['keys'], {'slug': 'doomed'})
+
+    def test_record_no_longer_public_is_reported_deleted(self):
+        source = self.create_source('hidden')
+        with self.captureOnCommitCallbacks(execute=True):
+            source.public = False
+            source.save()
+        self.settle()
+
+        changes = self.get(since=0)['changes']
+        self.assertEqual([(c['id'], c['op']) for c in changes], [(source.pk, 'deleted')])
+
+    def test_invalid_parameters(self):
+        url = reverse('api:change-feed')
+        self.assertEqual(self.client.get(url, {'since': -1}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'limit': 'x'}).status_code, 400)
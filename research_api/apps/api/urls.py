@@ -33,6 +33,9 @@ urlpatterns = [
     # Activity data (for heatmap visualization)
     path('activity/', views.research_activity, name='research-activity'),
 
+    # Change feed for incremental sync
+    path('changes/', views.change_feed, name='change-feed'),
+
     # Aggregate stats
     path('stats/', views.research_stats, name='research-stats'),
 
@@ -43,4 +46,7 @@ urlpatterns = [
 
     # Internal: source promotion from publishing_api Sourcebox
     path('internal/promote/', views.promote_source, name='promote-source'),
+
+    # Internal: bulk suggestion moderation
+    path('internal/moderate/', views.moderate_suggestions, name='moderate-suggestions'),
 ]
@@ -22,22 +22,34 @@ from rest_framework.decorators import api_view
 from rest_framework.generics import ListAPIView, RetrieveAPIView
 from rest_framework.response import Response
 
+from apps.core.changes import settled_events
+from apps.core.models import ChangeOp
 from apps.mentions.models import Mention
+from apps.research.dedup import normalize_url
 from apps.research.models import (
+    ConnectionSuggestion,
     ResearchThread,
+    ReviewStatus,
     Source,
     SourceLink,
+    SourceSuggestion,
     SourceType,
     ThreadEntry,
 )
-from apps.research.services import detect_content_type, get_backlinks
+from apps.research.moderation import promote_suggestions, set_review_status
+from apps.research.services import build_graph, detect_content_type, get_backlinks
 
 from .serializers import (
+    MentionChangeSerializer,
     MentionSerializer,
+    SourceChangeSerializer,
     SourceDetailSerializer,
+    SourceLinkChangeSerializer,
     SourceLinkSerializer,
     SourceListSerializer,
+    ThreadChangeSerializer,
     ThreadDetailSerializer,
+    ThreadEntryChangeSerializer,
     ThreadListSerializer,
 )
 
@@ -335,70 +347,7 @@ def source_graph(request):
     Orphaned sources (no links yet) still appear as isolated nodes
     so newly promoted sources are visible immediately.
     """
-    links = (
-        SourceLink.objects
-        .select_related('source')
-        .filter(source__public=True)
-    )
-
-    # Build node sets (deduplicated)
-    source_nodes = {}
-    content_nodes = {}
-    edges = []
-
-    for lnk in links:
-        src = lnk.source
-        source_key = f'source:{src.slug}'
-        content_key = f'{lnk.content_type}:{lnk.content_slug}'
-
-        if source_key not in source_nodes:
-            source_nodes[source_key] = {
-                'id': source_key,
-                'type': 'source',
-                'label': src.title,
-                'slug': src.slug,
-                'sourceType': src.source_type,
-                'creator': src.creator,
-            }
-
-        if content_key not in content_nodes:
-            content_nodes[content_key] = {
-                'id': content_key,
-                'type': lnk.content_type,
-                'label': lnk.content_title or lnk.content_slug,
-                'slug': lnk.content_slug,
-            }
-
-        edges.append({
-            'source': source_key,
-            'target': content_key,
-            'role': lnk.role,
-        })
-
-    # Include orphaned public sources (promoted but not yet linked)
-    orphaned = (
-        Source.objects.public()
-        .exclude(slug__in=[
-            key.removeprefix('source:') for key in source_nodes
-        ])
-    )
-    for src in orphaned:
-        source_key = f'source:{src.slug}'
-        source_nodes[source_key] = {
-            'id': source_key,
-            'type': 'source',
-            'label': src.title,
-            'slug': src.slug,
-            'sourceType': src.source_type,
-            'creator': src.creator,
-        }
-
-    nodes = list(source_nodes.values()) + list(content_nodes.values())
-
-    return Response({
-        'nodes': nodes,
-        'edges': edges,
-    })
+    return Response(build_graph())
 
 
 # ---------------------------------------------------------------------------
@@ -506,11 +455,133 @@ def research_stats(request):
     })
 
 
+# ---------------------------------------------------------------------------
+# Change feed (incremental sync)
+# ---------------------------------------------------------------------------
+
+CHANGE_FEED_DEFAULT_LIMIT = 500
+CHANGE_FEED_MAX_LIMIT = 2000
+
+# Feed name -> (public queryset, serializer). A record missing from its
+# queryset (deleted, or no longer public) is reported as deleted.
+CHANGE_FEED_MODELS = {
+    'source': (
+        lambda: Source.objects.public(),
+        SourceChangeSerializer,
+    ),
+    'sourcelink': (
+        lambda: SourceLink.objects.filter(source__public=True),
+        SourceLinkChangeSerializer,
+    ),
+    'thread': (
+        lambda: ResearchThread.objects.public(),
+        ThreadChangeSerializer,
+    ),
+    'threadentry': (
+        lambda: ThreadEntry.objects.filter(thread__public=True),
+        ThreadEntryChangeSerializer,
+    ),
+    'mention': (
+        lambda: Mention.objects.public(),
+        MentionChangeSerializer,
+    ),
+}
+
+
+def _int_param(request, name, default):
+    try:
+        return int(request.query_params.get(name, default))
+    except (TypeError, ValueError):
+        return None
+
+
+@api_view(['GET'])
+def change_feed(request):
+    """
+    Created, updated and deleted records since a cursor, in commit order.
+
+    GET /api/v1/changes/?since=<cursor>&limit=<n>
+
+    Start with since=0 (the log is backfilled with every record that
+    existed when it was introduced), then pass back `next` until
+    `has_more` is false. Store `next` and poll with it later to receive
+    only the deltas.
+
+    Several events for one record inside a page collapse to the latest,
+    carrying that record's current public data. 'created' and 'updated'
+    both mean upsert. 'deleted' means remove: the record is gone or no
+    longer public, and `data` is null; `keys` still identifies it.
+
+    Returns:
+        {
+            "changes": [
+                {"cursor": N, "model": "source", "id": N,
+                 "op": "updated", "keys": {...}, "data": {...}}
+            ],
+            "next": N,
+            "has_more": false
+        }
+    """
+    since = _int_param(request, 'since', 0)
+    limit = _int_param(request, 'limit', CHANGE_FEED_DEFAULT_LIMIT)
+    if since is None or since < 0:
+        return Response({'error': 'since must be a non-negative integer'}, status=400)
+    if limit is None or limit < 1:
+        return Response({'error': 'limit must be a positive integer'}, status=400)
+    limit = min(limit, CHANGE_FEED_MAX_LIMIT)
+
+    # Only settled events, so the cursor never skips a late commit
+    events = list(
+        settled_events()
+        .filter(id__gt=since)
+        .order_by('id')[:limit + 1]
+    )
+    has_more = len(events) > limit
+    events = events[:limit]
+
+    latest = {}
+    for event in events:
+        latest[(event.model, event.object_id)] = event
+
+    ids_by_model = defaultdict(list)
+    for model, object_id in latest:
+        ids_by_model[model].append(object_id)
+
+    current = {}
+    for model, ids in ids_by_model.items():
+        if model not in CHANGE_FEED_MODELS:
+            continue
+        queryset, serializer = CHANGE_FEED_MODELS[model]
+        for obj in queryset().filter(pk__in=ids):
+            current[(model, obj.pk)] = serializer(obj).data
+
+    changes = []
+    for event in sorted(latest.values(), key=lambda e: e.id):
+        data = current.get((event.model, event.object_id))
+        changes.append({
+            'cursor': event.id,
+            'model': event.model,
+            'id': event.object_id,
+            'op': event.op if data is not None else ChangeOp.DELETED,
+            'keys': event.keys,
+            'data': data,
+        })
+
+    return Response({
+        'changes': changes,
+        'next': events[-1].id if events else since,
+        'has_more': has_more,
+    })
+
+
 # ---------------------------------------------------------------------------
 # Internal: Source promotion (from publishing_api Sourcebox)
 # ---------------------------------------------------------------------------
 
 
+MODERATION_MAX_IDS = 1000
+
+
 def _check_internal_api_key(request):
     """Validate the Authorization: Bearer <key> header against INTERNAL_API_KEY."""
     api_key = settings.INTERNAL_API_KEY
@@ -597,7 +668,7 @@ def promote_source(request):
         return Response({'error': 'title is required'}, status=400)
 
     # Check for duplicate by URL
-    existing = Source.objects.filter(url=url).first()
+    existing = Source.objects.filter(normalized_url=normalize_url(url)).first()
     if existing:
         logger.info('Promote: source already exists for URL %s (slug=%s)', url, existing.slug)
         return Response({
@@ -631,3 +702,65 @@ def promote_source(request):
         'id': source.id,
         'title': source.title,
     }, status=201)
+
+
+@api_view(['POST'])
+def moderate_suggestions(request):
+    """
+    POST /api/v1/internal/moderate/
+
+    Bulk-moderate community suggestions in one transaction.
+
+    Expects:
+        Authorization: Bearer <INTERNAL_API_KEY>
+        {
+            "kind": "source" | "connection",
+            "action": "approve" | "reject",
+            "ids": [1, 2, 3],
+            "note": "..." (optional, stored on source suggestions)
+        }
+
+    Approving source suggestions promotes them to Sources + SourceLinks
+    (reusing Sources that already have the same normalized URL). Only
+    pending suggestions are affected.
+
+    Returns:
+        200: {"kind": ..., "action": ..., "updated": N, ...counts}
+        400: {"error": "..."}
+        401: {"error": "Invalid API key"}
+    """
+    if not _check_internal_api_key(request):
+        return Response({'error': 'Invalid API key'}, status=401)
+
+    data = request.data
+    kind = data.get('kind', '')
+    action = data.get('action', '')
+    ids = data.get('ids') or []
+
+    if kind not in ('source', 'connection'):
+        return Response({'error': 'kind must be "source" or "connection"'}, status=400)
+    if action not in ('approve', 'reject'):
+        return Response({'error': 'action must be "approve" or "reject"'}, status=400)
+    if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+        return Response({'error': 'ids must be a list of integers'}, status=400)
+    if len(ids) > MODERATION_MAX_IDS:
+        return Response(
+            {'error': f'at most {MODERATION_MAX_IDS} ids per request'},
+            status=400,
+        )
+
+    model = SourceSuggestion if kind == 'source' else ConnectionSuggestion
+    queryset = model.objects.filter(pk__in=ids)
+    note = data.get('note') if kind == 'source' else None
+
+    if kind == 'source' and action == 'approve':
+        result = promote_suggestions(queryset, reviewer_note=note)
+        updated = result.pop('promoted')
+    else:
+        status = ReviewStatus.APPROVED if action == 'approve' else ReviewStatus.REJECTED
+        updated = set_review_status(queryset, status, reviewer_note=note)
+        result = {}
+
+    logger.info('Moderate: %s %s suggestions, %d updated', action, kind, updated)
+
+    return Response({'kind': kind, 'action': action, 'updated': updated, **result})
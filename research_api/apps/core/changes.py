@@ -0,0 +1,81 @@
+"""
+Change tracking for the /api/v1/changes/ sync feed.
+
+Models opt in with track_changes() from their app's ready(). Saves and
+deletes then append a ChangeEvent once the surrounding transaction
+commits: rolled-back writes never appear in the feed, and events are
+numbered in commit order.
+
+QuerySet.update(), bulk_create() and bulk_update() bypass model signals.
+Code that writes tracked models in bulk must call record_changes() for
+the affected rows itself.
+
+Readers that advance a cursor over event ids (the feed, and
+publish_changed_trails) only read settled_events().
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .models import ChangeEvent, ChangeOp
+
+# Events younger than this are held back from cursor readers. Event ids
+# are allocated at insert time, so a slow concurrent insert could
+# otherwise commit a lower id after a reader has already advanced its
+# cursor past it.
+SETTLE_SECONDS = 2
+
+# model class -> (feed name, key fields)
+_TRACKED = {}
+
+
+def track_changes(model, name, key_fields=()):
+    """
+    Log saves and deletes of `model` under the feed name `name`.
+
+    key_fields are copied into each event's keys so deletes can still be
+    attributed (for example a SourceLink's content_slug).
+    """
+    _TRACKED[model] = (name, tuple(key_fields))
+    uid = f'change_feed:{name}'
+    post_save.connect(_on_save, sender=model, dispatch_uid=f'{uid}:save')
+    post_delete.connect(_on_delete, sender=model, dispatch_uid=f'{uid}:delete')
+
+
+def _event(instance, op):
+    name, key_fields = _TRACKED[type(instance)]
+    return ChangeEvent(
+        model=name,
+        object_id=instance.pk,
+        op=op,
+        keys={field: getattr(instance, field) for field in key_fields},
+    )
+
+
+def _write(events):
+    if events:
+        transaction.on_commit(lambda: ChangeEvent.objects.bulk_create(events))
+
+
+def _on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    _write([_event(instance, ChangeOp.CREATED if created else ChangeOp.UPDATED)])
+
+
+def _on_delete(sender, instance, **kwargs):
+    _write([_event(instance, ChangeOp.DELETED)])
+
+
+def record_changes(instances, op=ChangeOp.UPDATED):
+    """Log one event per instance after a bulk write (single INSERT)."""
+    _write([_event(instance, op) for instance in instances])
+
+
+def settled_events(now=None):
+    """ChangeEvents older than SETTLE_SECONDS, safe to advance a cursor over."""
+    now = now or timezone.now()
+    return ChangeEvent.objects.filter(created_at__lte=now - timedelta(seconds=SETTLE_SECONDS))
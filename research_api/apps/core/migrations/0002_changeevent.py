@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:09
+
+from django.db import migrations, models
+
+# (app, model, feed name, key fields), parents before children so a
+# client replaying from cursor 0 sees referenced records first.
+BACKFILL = [
+    ('research', 'Source', 'source', ['slug']),
+    ('research', 'SourceLink', 'sourcelink', ['source_id', 'content_type', 'content_slug']),
+    ('research', 'ResearchThread', 'thread', ['slug', 'resulting_essay_slug']),
+    ('research', 'ThreadEntry', 'threadentry', ['thread_id', 'source_id', 'field_note_slug']),
+    ('mentions', 'Mention', 'mention', ['target_content_type', 'target_slug']),
+]
+
+
+def backfill_change_events(apps, schema_editor):
+    """Seed the log with a 'created' event for every existing record."""
+    ChangeEvent = apps.get_model('core', 'ChangeEvent')
+    for app_label, model_name, name, key_fields in BACKFILL:
+        model = apps.get_model(app_label, model_name)
+        batch = []
+        for row in model.objects.order_by('pk').values('pk', *key_fields).iterator(chunk_size=2000):
+            batch.append(ChangeEvent(
+                model=name,
+                object_id=row['pk'],
+                op='created',
+                keys={field: row[field] for field in key_fields},
+            ))
+            if len(batch) >= 2000:
+                ChangeEvent.objects.bulk_create(batch)
+                batch = []
+        ChangeEvent.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('research', '0003_source_normalized_url_sourcemergesuggestion'),
+        ('mentions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=30)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('op', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('deleted', 'Deleted')], max_length=10)),
+                ('keys', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['model', 'object_id'], name='changeevent_object_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_change_events, migrations.RunPython.noop),
+    ]
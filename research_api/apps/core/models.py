@@ -14,3 +14,36 @@ class TimeStampedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class ChangeOp(models.TextChoices):
+    CREATED = 'created', 'Created'
+    UPDATED = 'updated', 'Updated'
+    DELETED = 'deleted', 'Deleted'
+
+
+class ChangeEvent(models.Model):
+    """
+    Append-only log of writes to the public research data.
+
+    The auto-increment id is the sync cursor for /api/v1/changes/.
+    Rows are written after the originating transaction commits (see
+    apps.core.changes), so ids follow commit order. A 'deleted' row is
+    the tombstone for a removed record; `keys` keeps the identifying
+    fields (slugs, parent ids) so consumers can act on it after the
+    record itself is gone.
+    """
+    model = models.CharField(max_length=30)
+    object_id = models.PositiveBigIntegerField()
+    op = models.CharField(max_length=10, choices=ChangeOp.choices)
+    keys = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['model', 'object_id'], name='changeevent_object_idx'),
+        ]
+
+    def __str__(self):
+        return f'#{self.pk} {self.op} {self.model}:{self.object_id}'
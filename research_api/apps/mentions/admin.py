@@ -1,7 +1,10 @@
 from django.contrib import admin
 from django.db.models import Count
 
-from .models import Mention, MentionSource
+from apps.core.changes import record_changes
+
+from .models import Mention, MentionSource, OutboundStatus, OutboundWebmention, SourceHost
+from .queue import queue_fields
 
 
 @admin.register(MentionSource)
@@ -45,21 +48,29 @@ class MentionSourceAdmin(admin.ModelAdmin):
 class MentionAdmin(admin.ModelAdmin):
     list_display = [
         'source_url_short', 'target_slug', 'target_content_type',
-        'mention_type', 'discovery_method', 'verified', 'public',
-        'featured', 'created_at',
+        'mention_type', 'discovery_method', 'verified',
+        'verification_status', 'public', 'featured', 'created_at',
     ]
     list_filter = [
         'mention_type', 'discovery_method', 'target_content_type',
-        'verified', 'public', 'featured',
+        'verified', 'verification_status', 'public', 'featured',
     ]
     search_fields = [
         'source_url', 'source_title', 'source_author',
         'target_slug', 'source_excerpt',
     ]
-    readonly_fields = ['created_at', 'updated_at', 'verified_at']
+    readonly_fields = [
+        'created_at', 'updated_at', 'verified_at',
+        'verification_status', 'verification_attempts', 'verify_after',
+        'verification_started_at', 'verification_error',
+        'last_checked_at', 'source_etag', 'source_last_modified', 'link_lost_at',
+    ]
     list_select_related = ['mention_source']
     raw_id_fields = ['mention_source']
-    actions = ['verify_and_publish', 'make_public', 'make_private', 'toggle_featured']
+    actions = [
+        'verify_and_publish', 'requeue_verification',
+        'make_public', 'make_private', 'toggle_featured',
+    ]
 
     fieldsets = [
         ('Source (external page)', {
@@ -77,6 +88,20 @@ class MentionAdmin(admin.ModelAdmin):
         ('Verification and Visibility', {
             'fields': ['verified', 'verified_at', 'public', 'featured'],
         }),
+        ('Verification Queue', {
+            'fields': [
+                'verification_status', 'verification_attempts', 'verify_after',
+                'verification_started_at', 'verification_error',
+            ],
+            'classes': ['collapse'],
+        }),
+        ('Re-verification', {
+            'fields': [
+                'last_checked_at', 'link_lost_at',
+                'source_etag', 'source_last_modified',
+            ],
+            'classes': ['collapse'],
+        }),
         ('Webmention Extensions', {
             'fields': ['webmention_vouch'],
             'classes': ['collapse'],
@@ -98,18 +123,74 @@ class MentionAdmin(admin.ModelAdmin):
     def verify_and_publish(self, request, queryset):
         from django.utils import timezone as tz
         now = tz.now()
+        # Read first: the changelist filters may stop matching after the update
+        mentions = list(queryset)
         queryset.update(verified=True, verified_at=now, public=True)
+        record_changes(mentions)
+
+    @admin.action(description='Queue selected mentions for re-verification')
+    def requeue_verification(self, request, queryset):
+        queryset.update(**queue_fields())
 
     @admin.action(description='Make selected mentions public')
     def make_public(self, request, queryset):
+        # Read first: the changelist filters may stop matching after the update
+        mentions = list(queryset)
         queryset.update(public=True)
+        record_changes(mentions)
 
     @admin.action(description='Make selected mentions private')
     def make_private(self, request, queryset):
+        # Read first: the changelist filters may stop matching after the update
+        mentions = list(queryset)
         queryset.update(public=False)
+        record_changes(mentions)
 
     @admin.action(description='Toggle featured status')
     def toggle_featured(self, request, queryset):
         for mention in queryset:
             mention.featured = not mention.featured
             mention.save(update_fields=['featured', 'updated_at'])
+
+
+@admin.register(SourceHost)
+class SourceHostAdmin(admin.ModelAdmin):
+    list_display = [
+        'domain', 'avg_response_time', 'checks', 'failures',
+        'last_status', 'last_checked_at', 'webmention_endpoint',
+    ]
+    search_fields = ['domain', 'webmention_endpoint']
+    readonly_fields = [
+        'domain', 'checks', 'failures', 'avg_response_time',
+        'last_status', 'last_checked_at', 'webmention_endpoint',
+        'endpoint_checked_at', 'created_at', 'updated_at',
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(OutboundWebmention)
+class OutboundWebmentionAdmin(admin.ModelAdmin):
+    list_display = [
+        'target_url', 'content_type', 'content_slug', 'status',
+        'response_status', 'attempts', 'sent_at',
+    ]
+    list_filter = ['status', 'content_type']
+    search_fields = ['target_url', 'content_slug', 'endpoint']
+    readonly_fields = [
+        'content_type', 'content_slug', 'source_url', 'target_url',
+        'status', 'endpoint', 'attempts', 'send_after', 'sent_at',
+        'response_status', 'error', 'created_at', 'updated_at',
+    ]
+    actions = ['resend']
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description='Send selected Webmentions again')
+    def resend(self, request, queryset):
+        from django.utils import timezone as tz
+        queryset.update(
+            status=OutboundStatus.PENDING, send_after=tz.now(), attempts=0, error='',
+        )
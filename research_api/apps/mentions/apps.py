@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+
+
+class MentionsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.mentions'
+    verbose_name = 'Mentions'
+
+    def ready(self):
+        from apps.core.changes import track_changes
+
+        from .models import Mention
+
+        track_changes(Mention, 'mention', ['target_content_type', 'target_slug'])
+
+        from . import signals  # noqa: F401
@@ -0,0 +1,121 @@
+"""
+In-memory domain index for matching mentions to MentionSources.
+
+Mention.save() used to run up to two queries per save (exact hostname,
+then without "www.") and could not match a subdomain such as
+blog.example.com to a MentionSource for example.com. Instead, every
+MentionSource domain goes into a trie keyed by reversed labels:
+
+    com -> example -> (source)      example.com
+                   -> blog -> (source)   blog.example.com
+
+match() walks a hostname's labels from the right and returns the
+deepest source on the path, so the longest matching suffix wins, in
+O(labels) and with no queries. The index also remembers each source's
+trusted flag, so save() can apply trust without loading the source.
+
+The index is built once per process and rebuilt when stale: saving or
+deleting a MentionSource bumps a version key in the cache (after the
+transaction commits), and each process compares it on lookup. When the
+cache isn't shared between processes (LocMemCache), MAX_AGE bounds how
+long another process can serve an outdated index.
+"""
+
+import threading
+import time
+import uuid
+from typing import NamedTuple
+
+from django.core.cache import cache
+
+CACHE_KEY = 'mentions:domain_index_version'
+
+# Seconds before a process rebuilds its index regardless of the version
+MAX_AGE = 300
+
+# Trie key holding the source at a node; labels are never empty
+_SOURCE = ''
+
+
+class MatchedSource(NamedTuple):
+    id: int
+    trusted: bool
+
+
+def _labels(hostname):
+    return [label for label in hostname.lower().strip().strip('.').split('.') if label][::-1]
+
+
+class DomainIndex:
+    """Reversed-label trie of MentionSource domains."""
+
+    def __init__(self, sources=()):
+        self.root = {}
+        self.by_id = {}
+        for source_id, domain, trusted in sources:
+            self.add(source_id, domain, trusted)
+
+    def add(self, source_id, domain, trusted):
+        labels = _labels(domain)
+        if not labels:
+            return
+        node = self.root
+        for label in labels:
+            node = node.setdefault(label, {})
+        node[_SOURCE] = self.by_id[source_id] = MatchedSource(source_id, trusted)
+
+    def match(self, hostname):
+        """The source whose domain is the longest suffix of hostname, or None."""
+        node = self.root
+        best = None
+        for label in _labels(hostname or ''):
+            node = node.get(label)
+            if node is None:
+                break
+            best = node.get(_SOURCE, best)
+        return best
+
+
+_lock = threading.Lock()
+_index = None
+_version = None
+_built_at = 0.0
+
+
+def get_index():
+    """This process's DomainIndex, rebuilt if a source changed."""
+    global _index, _version, _built_at
+    version = cache.get(CACHE_KEY)
+    with _lock:
+        if (
+            _index is None
+            or version != _version
+            or time.monotonic() - _built_at > MAX_AGE
+        ):
+            from .models import MentionSource
+
+            _index = DomainIndex(
+                MentionSource.objects.values_list('pk', 'domain', 'trusted')
+            )
+            _version = version
+            _built_at = time.monotonic()
+        return _index
+
+
+def invalidate():
+    """Mark every process's index stale (call after the change commits)."""
+    global _index
+    cache.set(CACHE_KEY, uuid.uuid4().hex, None)
+    with _lock:
+        _index = None
+
+
+def match(hostname):
+    """MatchedSource for a hostname, or None."""
+    return get_index().match(hostname)
+
+
+def source_trust(source_id):
+    """Trusted flag of a source by id, or None if the index doesn't know it."""
+    source = get_index().by_id.get(source_id)
+    return None if source is None else source.trusted
@@ -0,0 +1,316 @@
+"""
+Bulk import of mentions from JSONL exports.
+
+Backfilling through the ingest webhook costs an update_or_create per
+mention. import_mentions() instead streams JSON lines and, per chunk of
+CHUNK_SIZE records:
+
+  1. Converts each record to an unsaved Mention (to_mention), matching
+     its MentionSource in memory (domains.py) and applying the trusted
+     source rules Mention.save() would.
+  2. Looks up which (source_url, target_slug) pairs already exist, in
+     one query.
+  3. Inserts the new ones with bulk_create. If a mention was created
+     concurrently (by the webhook, say) the chunk is retried with
+     ignore_conflicts, so it is skipped rather than an error.
+     Existing ones are skipped, or with update=True have their content
+     fields (IMPORT_UPDATE_FIELDS) overwritten in one upsert;
+     moderation state (verified, public, featured) is never touched.
+  4. Records change feed events for the written rows, since bulk writes
+     bypass the signals (apps.core.changes).
+
+Each line is either a payload as accepted by the ingest webhook
+(source_url, target_slug or target_url, source_title, ...) or a
+webmention.io JF2 entry (wm-source, wm-target, wm-property, author,
+content, ...). Invalid lines are counted and reported, not fatal.
+"""
+
+import json
+import time
+from datetime import timezone as dt_timezone
+from urllib.parse import urlparse
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.core.changes import record_changes
+from apps.core.models import ChangeOp
+
+from . import domains
+from .models import DiscoveryMethod, Mention, MentionType, TargetContentType, VerificationStatus
+from .queue import queue_fields
+from .targets import parse_target_path
+
+CHUNK_SIZE = 2000
+
+# Invalid lines reported back in detail (the rest are only counted)
+MAX_REPORTED_ERRORS = 20
+
+# Overwritten on existing mentions by an import with update=True
+IMPORT_UPDATE_FIELDS = [
+    'source_title',
+    'source_excerpt',
+    'source_author',
+    'source_author_url',
+    'source_published',
+    'target_content_type',
+    'target_url',
+    'mention_type',
+    'updated_at',
+]
+
+# webmention.io wm-property -> MentionType
+WM_PROPERTY_TYPES = {
+    'in-reply-to': MentionType.REPLY,
+    'like-of': MentionType.LIKE,
+    'repost-of': MentionType.REPOST,
+    'bookmark-of': MentionType.LINK,
+    'mention-of': MentionType.MENTION,
+}
+
+_CHOICES = {
+    'mention_type': frozenset(MentionType.values),
+    'target_content_type': frozenset(TargetContentType.values),
+    'discovery_method': frozenset(DiscoveryMethod.values),
+}
+
+_MAX_LENGTHS = {
+    field.name: field.max_length
+    for field in Mention._meta.get_fields()
+    if getattr(field, 'max_length', None)
+}
+
+_TEXT_FIELDS = frozenset(
+    field.name
+    for field in Mention._meta.concrete_fields
+    if field.get_internal_type() in ('CharField', 'TextField')
+)
+
+
+def clean_fields(fields):
+    """
+    Check a dict of Mention field values and clip strings to their
+    max_length, in place. Returns fields.
+
+    Raises ValueError for a choice outside its field's choices or a
+    non-string value for a text field.
+    """
+    for name, value in fields.items():
+        if name in _CHOICES and value not in _CHOICES[name]:
+            raise ValueError(f'Unknown {name} {value!r}.')
+        if name in _TEXT_FIELDS and not isinstance(value, str):
+            raise ValueError(f'{name} must be a string.')
+        limit = _MAX_LENGTHS.get(name)
+        if limit and isinstance(value, str) and len(value) > limit:
+            fields[name] = value[:limit]
+    return fields
+
+
+def parse_timestamp(value):
+    """
+    An aware datetime from an ISO 8601 string, or None if blank or not
+    in that format. Raises ValueError for a non-string or an impossible
+    date.
+    """
+    if not value:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f'Expected an ISO 8601 string, got {value!r}.')
+    dt = parse_datetime(value)
+    if dt and timezone.is_naive(dt):
+        dt = timezone.make_aware(dt, dt_timezone.utc)
+    return dt
+
+
+def _webmention_io_fields(record):
+    author = record.get('author') or {}
+    content = record.get('content') or {}
+    return {
+        'source_url': record.get('wm-source') or record.get('url') or '',
+        'target_url': record.get('wm-target') or '',
+        'mention_type': WM_PROPERTY_TYPES.get(record.get('wm-property'), MentionType.MENTION),
+        'source_title': record.get('name') or '',
+        'source_excerpt': content.get('text') or '',
+        'source_author': author.get('name') or '',
+        'source_author_url': author.get('url') or '',
+        'source_published': parse_timestamp(record.get('published') or record.get('wm-received')),
+        'discovery_method': DiscoveryMethod.WEBMENTION,
+    }
+
+
+def _payload_fields(record):
+    fields = {
+        name: record[name]
+        for name in (
+            'source_url', 'target_url', 'target_slug', 'target_content_type',
+            'source_title', 'source_excerpt', 'source_author', 'source_author_url',
+            'webmention_vouch', 'mention_type', 'discovery_method',
+        )
+        if record.get(name)
+    }
+    fields.setdefault('discovery_method', DiscoveryMethod.MANUAL)
+    if record.get('source_published'):
+        fields['source_published'] = parse_timestamp(record['source_published'])
+    for name in ('verified', 'public', 'featured'):
+        if name in record:
+            fields[name] = bool(record[name])
+    return fields
+
+
+def to_mention(record, now=None, queue=False, index=None):
+    """
+    Build an unsaved Mention from one import record.
+
+    index is the domains.DomainIndex to match sources against (fetched
+    if not given). Raises ValueError if the record lacks a source URL or
+    a target.
+    """
+    if not isinstance(record, dict):
+        raise ValueError('Expected a JSON object.')
+    now = now or timezone.now()
+    index = index or domains.get_index()
+    fields = _webmention_io_fields(record) if 'wm-source' in record else _payload_fields(record)
+
+    source_url = str(fields.get('source_url', '')).strip()
+    if urlparse(source_url).scheme not in ('http', 'https'):
+        raise ValueError('Missing or invalid source URL.')
+    fields['source_url'] = source_url
+    if not fields.get('target_slug'):
+        content_type, slug = parse_target_path(urlparse(fields.get('target_url', '')).path)
+        if not slug:
+            raise ValueError('Missing target_slug and no usable target URL.')
+        fields['target_slug'] = slug
+        fields.setdefault('target_content_type', content_type)
+    fields.setdefault('target_content_type', TargetContentType.OTHER)
+
+    mention = Mention(**clean_fields(fields))
+    if mention.verified and not mention.verified_at:
+        mention.verified_at = now
+    if queue and not mention.verified:
+        for name, value in queue_fields(now).items():
+            setattr(mention, name, value)
+
+    # What Mention.save() would do, without its per-row lookups
+    match = index.match(urlparse(source_url).hostname)
+    if match:
+        mention.mention_source_id = match.id
+        if match.trusted:
+            mention.verified = True
+            mention.verified_at = mention.verified_at or now
+            mention.public = True
+            if mention.verification_status:
+                mention.verification_status = VerificationStatus.VERIFIED
+    return mention
+
+
+def iter_lines(lines):
+    """Yield (line number, parsed record or ValueError) for non-blank JSON lines."""
+    for number, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', errors='replace')
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield number, ValueError(f'Invalid JSON: {e.msg}')
+
+
+def _write_chunk(mentions, update, stats, now):
+    # Last record wins for a pair repeated within the chunk
+    by_pair = {(m.source_url, m.target_slug): m for m in mentions}
+    stats['duplicates'] += len(mentions) - len(by_pair)
+
+    existing = {
+        (url, slug): pk
+        for pk, url, slug in Mention.objects.filter(
+            source_url__in={url for url, _slug in by_pair},
+        ).values_list('pk', 'source_url', 'target_slug')
+        if (url, slug) in by_pair
+    }
+    new = [m for pair, m in by_pair.items() if pair not in existing]
+    old = [m for pair, m in by_pair.items() if pair in existing]
+
+    with transaction.atomic():
+        if new:
+            try:
+                # Sets pks where the database returns them (PostgreSQL, SQLite)
+                with transaction.atomic():
+                    Mention.objects.bulk_create(new)
+                created = new
+            except IntegrityError:
+                # A pair was created concurrently: insert the rest and
+                # read back what this import created.
+                Mention.objects.bulk_create(new, ignore_conflicts=True)
+                created = None
+            if created is None or any(m.pk is None for m in created):
+                new_pairs = {(m.source_url, m.target_slug) for m in new}
+                created = [
+                    m for m in Mention.objects.filter(
+                        source_url__in={url for url, _slug in new_pairs},
+                        created_at__gte=now,
+                    ).only('pk', 'source_url', 'target_slug', 'target_content_type')
+                    if (m.source_url, m.target_slug) in new_pairs
+                ]
+            record_changes(created, ChangeOp.CREATED)
+            stats['created'] += len(created)
+            stats['skipped'] += len(new) - len(created)
+
+        if old and update:
+            Mention.objects.bulk_create(
+                old,
+                update_conflicts=True,
+                unique_fields=['source_url', 'target_slug'],
+                update_fields=IMPORT_UPDATE_FIELDS,
+            )
+            for m in old:
+                m.pk = existing[(m.source_url, m.target_slug)]
+            record_changes(old, ChangeOp.UPDATED)
+            stats['updated'] += len(old)
+        else:
+            stats['skipped'] += len(old)
+
+
+def import_mentions(lines, update=False, queue=False, chunk_size=CHUNK_SIZE):
+    """
+    Import mentions from an iterable of JSON lines (str or bytes).
+
+    Args:
+        lines: file object, request, or any iterable of lines
+        update: overwrite content fields of mentions that already exist
+        queue: queue new unverified mentions for background verification
+
+    Returns a stats dict: read, created, updated, skipped, duplicates,
+    invalid, errors (the first MAX_REPORTED_ERRORS as [line, message]),
+    seconds and per_second.
+    """
+    started = time.perf_counter()
+    stats = {
+        'read': 0, 'created': 0, 'updated': 0, 'skipped': 0,
+        'duplicates': 0, 'invalid': 0, 'errors': [],
+    }
+    now = timezone.now()
+    index = domains.get_index()
+    chunk = []
+    for number, record in iter_lines(lines):
+        stats['read'] += 1
+        try:
+            if isinstance(record, ValueError):
+                raise record
+            chunk.append(to_mention(record, now=now, queue=queue, index=index))
+        except (ValueError, TypeError, AttributeError) as e:
+            stats['invalid'] += 1
+            if len(stats['errors']) < MAX_REPORTED_ERRORS:
+                stats['errors'].append([number, str(e)])
+            continue
+        if len(chunk) >= chunk_size:
+            _write_chunk(chunk, update, stats, now)
+            chunk = []
+    if chunk:
+        _write_chunk(chunk, update, stats, now)
+
+    stats['seconds'] = round(time.perf_counter() - started, 3)
+    stats['per_second'] = round(stats['read'] / stats['seconds']) if stats['seconds'] else 0
+    return stats
@@ -0,0 +1,149 @@
+"""
+Management command to compare buffered and streaming Webmention verification.
+
+Serves synthetic multi-megabyte HTML pages from a local HTTP server and
+checks each one both ways:
+
+  buffered   requests.get() -> resp.text -> substring search (the old
+             verifier: whole body in memory, any text match counts)
+  streaming  verification.fetch_links_to(): byte-capped, incremental
+             HTML parsing that stops at the first matching link
+
+for pages with the link near the top, at the bottom, only as plain text
+(a false positive for the substring search), or absent. Reports wall
+time, tracemalloc peak and the verdict. Pages larger than
+WEBMENTION_MAX_FETCH_BYTES are only read up to the cap by the streaming
+verifier, so a link past it is not found.
+
+Usage:
+    python manage.py benchmark_verification                # 0.5, 5, 20 MB pages
+    python manage.py benchmark_verification --sizes 2,50
+"""
+
+import http.server
+import threading
+import time
+import tracemalloc
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.mentions.verification import fetch_links_to
+
+TARGET = 'https://travisgilbert.me/on/benchmark-essay/'
+
+FILLER = (
+    '<p>Filler paragraph with an <a href="/elsewhere/{i}">unrelated link</a> '
+    'and some <em>markup</em> to parse.</p>\n'
+)
+LINK = f'<p>See <a href="{TARGET}">the essay</a>.</p>\n'
+TEXT_ONLY = f'<p>Someone should write about {TARGET} one day.</p>\n'
+
+# page kind -> where the target reference goes
+PLACEMENTS = {
+    'link-top': ('link', 'top'),
+    'link-bottom': ('link', 'bottom'),
+    'text-only': ('text', 'bottom'),
+    'absent': (None, None),
+}
+
+
+def _page(size, kind):
+    reference, position = PLACEMENTS[kind]
+    snippet = {'link': LINK, 'text': TEXT_ONLY}.get(reference, '')
+    parts = ['<!doctype html><html><head><title>Benchmark</title></head><body>\n']
+    if position == 'top':
+        parts.append(snippet)
+    length = sum(len(p) for p in parts)
+    i = 0
+    while length < size:
+        filler = FILLER.format(i=i)
+        parts.append(filler)
+        length += len(filler)
+        i += 1
+    if position == 'bottom':
+        parts.append(snippet)
+    parts.append('</body></html>\n')
+    return ''.join(parts).encode('utf-8')
+
+
+def _buffered_verify(source_url, target_url):
+    """The pre-streaming verifier, kept here as the baseline."""
+    resp = requests.get(source_url, timeout=30)
+    resp.raise_for_status()
+    target_path = urlparse(target_url).path
+    return target_url in resp.text or target_path in resp.text
+
+
+def _measure(fn, *args):
+    """(result, seconds, peak bytes), timed without tracemalloc overhead."""
+    started = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        fn(*args)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+class Command(BaseCommand):
+    help = 'Benchmark buffered vs streaming Webmention source verification.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='0.5,5,20',
+            help='Comma-separated page sizes in MB (default: 0.5,5,20).',
+        )
+
+    def handle(self, *args, **options):
+        sizes = [float(s) for s in options['sizes'].split(',') if s.strip()]
+        pages = {}
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = pages[self.path]
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the streaming verifier hung up early
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f'http://127.0.0.1:{server.server_port}'
+
+        mb = 1024 * 1024
+        self.stdout.write(f'Streaming byte cap: {settings.WEBMENTION_MAX_FETCH_BYTES / mb:g} MB')
+        self.stdout.write(
+            f'{"page":<18}{"method":<11}{"verdict":>8}{"time s":>9}{"peak MB":>10}'
+        )
+        try:
+            for size in sizes:
+                for kind in PLACEMENTS:
+                    path = f'/{size:g}mb-{kind}'
+                    pages[path] = _page(int(size * mb), kind)
+                    for method, fn in (
+                        ('buffered', _buffered_verify),
+                        ('streaming', fetch_links_to),
+                    ):
+                        found, seconds, peak = _measure(fn, base + path, TARGET)
+                        self.stdout.write(
+                            f'{path[1:]:<18}{method:<11}{str(found):>8}'
+                            f'{seconds:9.3f}{peak / mb:10.1f}'
+                        )
+                    del pages[path]
+        finally:
+            server.shutdown()
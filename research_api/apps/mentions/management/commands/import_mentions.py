@@ -0,0 +1,76 @@
+"""
+Management command to bulk import mentions from a JSONL export.
+
+Each line is an ingest-webhook payload or a webmention.io JF2 entry
+(see apps.mentions.importer). Mentions are written in chunks with
+bulk_create; pairs of (source_url, target_slug) that already exist are
+skipped unless --update is given.
+
+Usage:
+    python manage.py import_mentions mentions.jsonl
+    python manage.py import_mentions export.jsonl.gz --update
+    python manage.py import_mentions - --queue < mentions.jsonl
+"""
+
+import gzip
+import io
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.mentions.importer import CHUNK_SIZE, import_mentions
+
+
+class Command(BaseCommand):
+    help = 'Bulk import mentions from a JSONL file (webhook payloads or webmention.io entries).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='JSONL file, optionally gzipped (.gz), or - for stdin.',
+        )
+        parser.add_argument(
+            '--update',
+            action='store_true',
+            help='Overwrite the content fields of mentions that already exist.',
+        )
+        parser.add_argument(
+            '--queue',
+            action='store_true',
+            help='Queue new unverified mentions for background verification.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help=f'Records written per batch (default: {CHUNK_SIZE}).',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            if path == '-':
+                lines = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='replace')
+            elif path.endswith('.gz'):
+                lines = gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+            else:
+                lines = open(path, encoding='utf-8', errors='replace')
+        except OSError as e:
+            raise CommandError(f'Cannot read {path}: {e}') from e
+
+        with lines:
+            stats = import_mentions(
+                lines,
+                update=options['update'],
+                queue=options['queue'],
+                chunk_size=options['chunk_size'],
+            )
+
+        for number, message in stats['errors']:
+            self.stderr.write(self.style.WARNING(f'  line {number}: {message}'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Read {stats["read"]} record(s) in {stats["seconds"]:.2f}s '
+            f'({stats["per_second"]}/s): {stats["created"]} created, '
+            f'{stats["updated"]} updated, {stats["skipped"]} skipped, '
+            f'{stats["duplicates"]} duplicate(s), {stats["invalid"]} invalid.'
+        ))
@@ -0,0 +1,58 @@
+"""
+Management command to re-verify verified mentions (link rot).
+
+Fetches the sources of mentions not checked for
+MENTION_REVERIFY_AFTER_DAYS with conditional requests, and unpublishes
+those whose page is gone or no longer links (see
+apps.mentions.reverify). Meant to run daily from cron.
+
+Usage:
+    python manage.py reverify_mentions
+    python manage.py reverify_mentions --limit 2000 --workers 16
+    python manage.py reverify_mentions --after-days 0      # everything
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.mentions.reverify import reverify
+
+
+class Command(BaseCommand):
+    help = 'Re-check verified mentions and unpublish those whose source link is gone.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=500,
+            help='Most mentions to check in this run (default: 500).',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Concurrent fetches (default: WEBMENTION_VERIFY_WORKERS).',
+        )
+        parser.add_argument(
+            '--after-days',
+            type=float,
+            default=None,
+            help='Check mentions last checked this many days ago (default: MENTION_REVERIFY_AFTER_DAYS).',
+        )
+
+    def handle(self, *args, **options):
+        after = options['after_days']
+        outcomes = reverify(
+            limit=options['limit'],
+            workers=options['workers'],
+            after=timedelta(days=after) if after is not None else None,
+        )
+        total = sum(outcomes.values())
+        lost = outcomes['unlinked'] + outcomes['gone']
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {total} mention(s): {outcomes["unchanged"]} unchanged, '
+            f'{outcomes["linked"]} still linked, {lost} lost, '
+            f'{outcomes["error"]} error(s).'
+        ))
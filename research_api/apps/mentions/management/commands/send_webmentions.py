@@ -0,0 +1,50 @@
+"""
+Management command to send due outbound Webmentions.
+
+Links are queued after each successful publish_research; this sends
+those whose WEBMENTION_SEND_DELAY has passed (see
+apps.mentions.outbound). Run it from cron every few minutes.
+
+Usage:
+    python manage.py send_webmentions
+    python manage.py send_webmentions --queue         # queue new links first
+    python manage.py send_webmentions --limit 50 --workers 4
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.mentions.outbound import queue_new_links, send_due
+
+
+class Command(BaseCommand):
+    help = 'Send due Webmentions for links from the site to cited sources.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queue',
+            action='store_true',
+            help='Queue links not seen before (normally done after publishing).',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=500,
+            help='Most Webmentions to send in this run (default: 500).',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Target hosts handled concurrently (default: WEBMENTION_VERIFY_WORKERS).',
+        )
+
+    def handle(self, *args, **options):
+        if options['queue']:
+            self.stdout.write(f'Queued {queue_new_links()} new link(s).')
+
+        counts = send_due(limit=options['limit'], workers=options['workers'])
+        if not counts:
+            self.stdout.write('No Webmentions due.')
+            return
+        summary = ', '.join(f'{count} {status}' for status, count in sorted(counts.items()))
+        self.stdout.write(self.style.SUCCESS(f'Processed {sum(counts.values())}: {summary}.'))
@@ -0,0 +1,75 @@
+"""
+Management command: verify queued Webmentions in a thread pool.
+
+Runs as its own process next to the web server. Each worker thread
+fetches one source page at a time; claims respect the per-host cap
+WEBMENTION_DOMAIN_CONCURRENCY across all worker processes, and
+transient failures are retried with backoff. See apps/mentions/queue.py.
+
+Usage:
+    python manage.py verify_webmentions
+    python manage.py verify_webmentions --workers 16
+    python manage.py verify_webmentions --once      # Verify due mentions and exit
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.mentions.queue import claim_batch, process_queue, requeue_stale, verify_mention
+
+
+class Command(BaseCommand):
+    help = 'Verify queued Webmentions with a pool of worker threads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Concurrent fetches (default: WEBMENTION_VERIFY_WORKERS).',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds between queue checks when idle (default: 1).',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Verify every due mention, then exit.',
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers'] or settings.WEBMENTION_VERIFY_WORKERS
+        poll = options['poll_interval']
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='webmention') as pool:
+            if options['once']:
+                total = 0
+                while count := process_queue(pool, workers):
+                    total += count
+                self.stdout.write(f'Verified {total} mention(s).')
+                return
+
+            self.stdout.write(
+                f'Webmention verifier started ({workers} workers, poll {poll:g}s).'
+            )
+            in_flight = set()
+            try:
+                while True:
+                    requeue_stale()
+                    for pk in claim_batch(workers - len(in_flight)):
+                        in_flight.add(pool.submit(verify_mention, pk))
+                    if not in_flight:
+                        time.sleep(poll)
+                        continue
+                    done, in_flight = wait(in_flight, timeout=poll, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future.exception() is not None:
+                            self.stderr.write(f'Verification raised: {future.exception()!r}')
+            except KeyboardInterrupt:
+                self.stdout.write('Webmention verifier stopped.')
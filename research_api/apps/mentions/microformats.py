@@ -0,0 +1,267 @@
+"""
+Mention metadata from the source page: microformats2 h-entry, with
+OpenGraph and plain HTML fallbacks.
+
+EntryCollector is fed the same tag and text events as the verifier's
+HTML parser (verification.SourceParser), so the metadata comes out of
+the fetch that verifies the mention. It understands the subset of mf2
+that mention displays need:
+
+  h-entry        p-name, p-summary, e-content, dt-published,
+                 p-author (plain or h-card with p-name / u-url), u-author
+  mention type   u-in-reply-to, u-like-of, u-repost-of, u-bookmark-of
+                 whose URL is the Webmention target
+
+Properties of other microformats nested in the entry (comments, quoted
+h-cites) are ignored. On a page with several h-entries (a feed), the
+entry containing the target link wins, else the first.
+
+Fallbacks, from the page head: og:title / <title>, og:description /
+description, article:published_time, author / article:author.
+"""
+
+from datetime import datetime, time as dt_time, timezone as dt_timezone
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from apps.research.dedup import normalize_url
+
+# Elements without end tags: never pushed on the element stack
+VOID_ELEMENTS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+})
+
+# u-* property -> Mention.mention_type, when it points at the target
+RESPONSE_PROPERTIES = {
+    'u-in-reply-to': 'reply',
+    'u-like-of': 'like',
+    'u-repost-of': 'repost',
+    'u-bookmark-of': 'link',
+}
+
+EXCERPT_LENGTH = 500
+
+# <meta property|name> -> metadata key
+META_FALLBACKS = {
+    'og:title': 'title',
+    'twitter:title': 'title',
+    'og:description': 'excerpt',
+    'description': 'excerpt',
+    'article:published_time': 'published',
+    'author': 'author',
+    'article:author': 'author',
+}
+
+# Frame kinds: the h-entry root, its author h-card, any other microformat
+ENTRY, CARD, NESTED = 'entry', 'card', 'nested'
+
+
+def _text(parts):
+    return ' '.join(''.join(parts).split())
+
+
+def _excerpt(text):
+    if len(text) <= EXCERPT_LENGTH:
+        return text
+    return text[:EXCERPT_LENGTH].rsplit(' ', 1)[0] + '…'
+
+
+def parse_published(value):
+    """An aware datetime from an ISO 8601 date or datetime string, or None."""
+    value = (value or '').strip()
+    if not value:
+        return None
+    try:
+        dt = parse_datetime(value)
+        if dt is None:
+            date = parse_date(value[:10])
+            dt = date and datetime.combine(date, dt_time())
+    except ValueError:
+        return None
+    if dt and timezone.is_naive(dt):
+        dt = timezone.make_aware(dt, dt_timezone.utc)
+    return dt
+
+
+class EntryCollector:
+    """
+    Collects h-entry properties from HTML parser events.
+
+    join(url) makes an attribute value absolute (against the page URL or
+    its <base>); target_key is normalize_url() of the target.
+    """
+
+    def __init__(self, join, target_key):
+        self.join = join
+        self.target_key = target_key
+        # [tag, kind or None, captures ending here] from the open h-entry
+        # or <title> inwards
+        self.stack = []
+        self.kinds = []  # kinds of the open frames that have one
+        self.captures = []  # open [key, text parts]
+        self.entry = None  # the open h-entry's properties
+        self.entries = []  # closed h-entries (with '_has_link')
+        self.head = {}
+        self.in_body = False
+
+    @property
+    def in_entry(self):
+        return self.entry is not None
+
+    def _context(self):
+        return self.kinds[-1] if self.kinds else None
+
+    def link_found(self):
+        """The verifier found the target link at the current position."""
+        if self.entry is not None and self._context() == ENTRY:
+            self.entry['_has_link'] = True
+
+    def _set(self, key, value):
+        if value and not self.entry.get(key):
+            self.entry[key] = value
+
+    def _capture(self, key, frame):
+        capture = [key, []]
+        self.captures.append(capture)
+        frame[2].append(capture)
+
+    # -- events ------------------------------------------------------------
+
+    def start(self, tag, attrs):
+        # Outside an h-entry (or <title>) only a few elements matter, and
+        # there is nothing on the stack to close: skip the rest cheaply.
+        if not self.stack and tag not in ('meta', 'title', 'body'):
+            if not any(name == 'class' and value and 'h-entry' in value for name, value in attrs):
+                return
+        attrs = dict(attrs)
+        if tag == 'body':
+            self.in_body = True
+        elif tag == 'meta' and not self.in_body:
+            key = META_FALLBACKS.get((attrs.get('property') or attrs.get('name') or '').lower())
+            if key and attrs.get('content') and key not in self.head:
+                self.head[key] = attrs['content'].strip()
+
+        frame = [tag, None, []]
+        classes = set((attrs.get('class') or '').split())
+        context = self._context()
+
+        if tag == 'title' and not self.in_body and 'html_title' not in self.head:
+            self._capture('title', frame)
+
+        if 'h-entry' in classes and context is None and self.entry is None:
+            self.entry = {}
+            frame[1] = ENTRY
+        elif context == ENTRY:
+            self._entry_property(tag, attrs, classes, frame)
+        elif context == CARD:
+            self._card_property(attrs, classes, frame)
+            if frame[1] is None and any(c.startswith('h-') for c in classes):
+                frame[1] = NESTED
+
+        if tag not in VOID_ELEMENTS and (self.stack or frame[1] or frame[2]):
+            self.stack.append(frame)
+            if frame[1]:
+                self.kinds.append(frame[1])
+
+    def _entry_property(self, tag, attrs, classes, frame):
+        href = attrs.get('href') or attrs.get('src')
+        value = attrs.get('value') if tag in ('data', 'input') else None
+
+        for name, mention_type in RESPONSE_PROPERTIES.items():
+            if name in classes and href and normalize_url(self.join(href)) == self.target_key:
+                self._set('mention_type', mention_type)
+
+        if 'p-name' in classes:
+            if value:
+                self._set('title', value)
+            else:
+                self._capture('title', frame)
+        if 'p-summary' in classes:
+            self._capture('summary', frame)
+        if 'e-content' in classes:
+            self._capture('content', frame)
+        if 'dt-published' in classes:
+            stamp = attrs.get('datetime') or attrs.get('value')
+            if stamp:
+                self._set('published', stamp)
+            else:
+                self._capture('published', frame)
+        if 'u-author' in classes and href:
+            self._set('author_url', self.join(href))
+        if 'p-author' in classes:
+            if href:
+                self._set('author_url', self.join(href))
+            if 'h-card' in classes:
+                frame[1] = CARD
+            else:
+                self._capture('author', frame)
+
+        if frame[1] is None and any(c.startswith('h-') for c in classes):
+            frame[1] = NESTED
+
+    def _card_property(self, attrs, classes, frame):
+        if 'p-name' in classes:
+            self._capture('author', frame)
+        if 'u-url' in classes and attrs.get('href'):
+            self._set('author_url', self.join(attrs['href']))
+
+    def end(self, tag):
+        if not self.stack or tag in VOID_ELEMENTS:
+            return
+        # Unwind to the matching element, closing anything left open
+        if not any(frame[0] == tag for frame in self.stack):
+            return
+        while self.stack:
+            frame = self.stack.pop()
+            self._close(frame)
+            if frame[0] == tag:
+                break
+
+    def _close(self, frame):
+        _tag, kind, captures = frame
+        if kind:
+            self.kinds.pop()
+        for capture in captures:
+            self.captures.remove(capture)
+            key, parts = capture
+            text = _text(parts)
+            if key == 'title' and self.entry is None:
+                self.head.setdefault('html_title', text)
+            elif self.entry is not None:
+                self._set(key, text)
+        if kind == ENTRY:
+            self.entries.append(self.entry)
+            self.entry = None
+
+    def data(self, text):
+        for _key, parts in self.captures:
+            parts.append(text)
+
+    # -- result ------------------------------------------------------------
+
+    def metadata(self):
+        """
+        The collected metadata: title, excerpt, author, author_url,
+        published (aware datetime or None) and mention_type (or None).
+        """
+        entries = self.entries + ([self.entry] if self.entry else [])
+        entry = next((e for e in entries if e.get('_has_link')), entries[0] if entries else {})
+        head = self.head
+
+        author = entry.get('author') or head.get('author', '')
+        author_url = entry.get('author_url', '')
+        if not author_url and author.startswith(('http://', 'https://')):
+            author, author_url = '', author
+
+        return {
+            'title': entry.get('title') or head.get('title') or head.get('html_title', ''),
+            'excerpt': _excerpt(
+                entry.get('summary') or entry.get('content') or head.get('excerpt', '')
+            ),
+            'author': author,
+            'author_url': author_url,
+            'published': parse_published(entry.get('published') or head.get('published')),
+            'mention_type': entry.get('mention_type'),
+        }
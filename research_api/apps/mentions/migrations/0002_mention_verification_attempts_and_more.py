@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:44
+
+from django.db import migrations, models
+
+
+def mark_verified(apps, schema_editor):
+    """Mentions verified before the queue existed count as verified by it."""
+    Mention = apps.get_model('mentions', 'Mention')
+    Mention.objects.filter(verified=True).update(verification_status='verified')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mentions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mention',
+            name='verification_attempts',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Fetches of the source made so far.'),
+        ),
+        migrations.AddField(
+            model_name='mention',
+            name='verification_error',
+            field=models.TextField(blank=True, help_text='Why the last verification attempt failed.'),
+        ),
+        migrations.AddField(
+            model_name='mention',
+            name='verification_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='mention',
+            name='verification_status',
+            field=models.CharField(blank=True, choices=[('queued', 'Queued'), ('verifying', 'Verifying'), ('verified', 'Verified'), ('failed', 'Failed')], help_text='Background verification state (blank: not queued, e.g. manual mentions).', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='mention',
+            name='verify_after',
+            field=models.DateTimeField(blank=True, help_text='When a queued verification is next due.', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='mention',
+            index=models.Index(fields=['verification_status', 'verify_after'], name='idx_mention_verify_queue'),
+        ),
+        migrations.RunPython(mark_verified, migrations.RunPython.noop),
+    ]
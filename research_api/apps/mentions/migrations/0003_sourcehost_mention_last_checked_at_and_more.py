@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mentions', '0002_mention_verification_attempts_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SourceHost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('domain', models.CharField(help_text='Host name, without a leading "www.".', max_length=300, unique=True)),
+                ('checks', models.PositiveIntegerField(default=0)),
+                ('failures', models.PositiveIntegerField(default=0, help_text='Checks that ended in an error (timeouts, 5xx, ...).')),
+                ('avg_response_time', models.FloatField(default=0.0, help_text='Moving average of response time, in seconds.')),
+                ('last_status', models.PositiveSmallIntegerField(blank=True, help_text='HTTP status of the last check (blank: no response).', null=True)),
+                ('last_checked_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'source host',
+                'verbose_name_plural': 'source hosts',
+                'ordering': ['-avg_response_time'],
+            },
+        ),
+        migrations.AddField(
+            model_name='mention',
+            name='last_checked_at',
+            field=models.DateTimeField(blank=True, help_text='When re-verification last fetched the source.', null=True),
+        ),
+        migrations.AddField(
+            model_name='mention',
+            name='link_lost_at',
+            field=models.DateTimeField(blank=True, help_text='When re-verification found the source gone or no longer linking.', null=True),
+        ),
+        migrations.AddField(
+            model_name='mention',
+            name='source_etag',
+            field=models.CharField(blank=True, help_text='ETag of the source at the last check (sent as If-None-Match).', max_length=500),
+        ),
+        migrations.AddField(
+            model_name='mention',
+            name='source_last_modified',
+            field=models.CharField(blank=True, help_text='Last-Modified of the source at the last check (sent as If-Modified-Since).', max_length=100),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mentions', '0003_sourcehost_mention_last_checked_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sourcehost',
+            name='endpoint_checked_at',
+            field=models.DateTimeField(blank=True, help_text='When the endpoint was last discovered (blank: never).', null=True),
+        ),
+        migrations.AddField(
+            model_name='sourcehost',
+            name='webmention_endpoint',
+            field=models.URLField(blank=True, help_text='Webmention endpoint discovered on this host (blank: none found).', max_length=2000),
+        ),
+        migrations.CreateModel(
+            name='OutboundWebmention',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('content_type', models.CharField(choices=[('essay', 'Essay'), ('field_note', 'Field Note'), ('project', 'Project'), ('toolkit', 'Toolkit'), ('shelf', 'Shelf'), ('page', 'Page'), ('other', 'Other')], max_length=20)),
+                ('content_slug', models.SlugField(max_length=300)),
+                ('source_url', models.URLField(help_text='Our page that links to the target.', max_length=2000)),
+                ('target_url', models.URLField(help_text='External page being notified.', max_length=2000)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('no_endpoint', 'No endpoint'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('endpoint', models.URLField(blank=True, help_text="The target's Webmention endpoint, as used.", max_length=2000)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('send_after', models.DateTimeField(help_text='When a pending Webmention is next due (after the page deploys).')),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('response_status', models.PositiveSmallIntegerField(blank=True, help_text="HTTP status of the endpoint's last response.", null=True)),
+                ('error', models.TextField(blank=True)),
+            ],
+            options={
+                'verbose_name': 'outbound webmention',
+                'verbose_name_plural': 'outbound webmentions',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'send_after'], name='idx_outbound_due')],
+                'constraints': [models.UniqueConstraint(fields=('source_url', 'target_url'), name='unique_outbound_webmention')],
+            },
+        ),
+    ]
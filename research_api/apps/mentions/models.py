@@ -27,6 +27,22 @@ class DiscoveryMethod(models.TextChoices):
     SEARCH = 'search', 'Search'
 
 
+class VerificationStatus(models.TextChoices):
+    """Where a Webmention is in the background verification queue."""
+    QUEUED = 'queued', 'Queued'
+    VERIFYING = 'verifying', 'Verifying'
+    VERIFIED = 'verified', 'Verified'
+    FAILED = 'failed', 'Failed'
+
+
+class OutboundStatus(models.TextChoices):
+    """Where an outbound Webmention is in sending."""
+    PENDING = 'pending', 'Pending'
+    SENT = 'sent', 'Sent'
+    NO_ENDPOINT = 'no_endpoint', 'No endpoint'
+    FAILED = 'failed', 'Failed'
+
+
 class TargetContentType(models.TextChoices):
     """Content types on the site that can receive mentions."""
     ESSAY = 'essay', 'Essay'
@@ -235,6 +251,51 @@ class Mention(TimeStampedModel):
         null=True,
         blank=True,
     )
+    verification_status = models.CharField(
+        max_length=20,
+        choices=VerificationStatus.choices,
+        blank=True,
+        help_text='Background verification state (blank: not queued, e.g. manual mentions).',
+    )
+    verification_attempts = models.PositiveSmallIntegerField(
+        default=0,
+        help_text='Fetches of the source made so far.',
+    )
+    verify_after = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='When a queued verification is next due.',
+    )
+    verification_started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+    verification_error = models.TextField(
+        blank=True,
+        help_text='Why the last verification attempt failed.',
+    )
+
+    # Periodic re-verification (reverify.py)
+    last_checked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='When re-verification last fetched the source.',
+    )
+    source_etag = models.CharField(
+        max_length=500,
+        blank=True,
+        help_text='ETag of the source at the last check (sent as If-None-Match).',
+    )
+    source_last_modified = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text='Last-Modified of the source at the last check (sent as If-Modified-Since).',
+    )
+    link_lost_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='When re-verification found the source gone or no longer linking.',
+    )
     public = models.BooleanField(
         default=False,
         db_index=True,
@@ -287,55 +348,192 @@ class Mention(TimeStampedModel):
                 fields=['verified', '-created_at'],
                 name='idx_mention_verified_date',
             ),
+            models.Index(
+                fields=['verification_status', 'verify_after'],
+                name='idx_mention_verify_queue',
+            ),
         ]
 
     def __str__(self):
         return f'{self.source_url} -> {self.target_content_type}:{self.target_slug}'
 
     def save(self, *args, **kwargs):
+        self.apply_source_rules()
+        super().save(*args, **kwargs)
+
+    def apply_source_rules(self):
+        """
+        Match the MentionSource and apply its trust, as save() does.
+
+        Bulk writes (which skip save()) call this on each instance.
+        """
         # Auto-match mention_source by domain if not already set
         if not self.mention_source_id:
             self._try_match_source()
         # Auto-verify and auto-publish from trusted sources
-        if self.mention_source and self.mention_source.trusted:
+        if self._source_trusted():
             if not self.verified:
                 self.verified = True
                 self.verified_at = timezone.now()
+            if self.verification_status:
+                self.verification_status = VerificationStatus.VERIFIED
             if not self.public:
                 self.public = True
-        super().save(*args, **kwargs)
 
     def _try_match_source(self):
-        """Attempt to match this mention to a known MentionSource by domain."""
-        from urllib.parse import urlparse
+        """
+        Match this mention to a known MentionSource by domain.
 
-        parsed = urlparse(self.source_url)
-        hostname = parsed.hostname or ''
+        Uses the in-memory suffix index (domains.py), so blog.example.com
+        matches a source for example.com and no query is made.
+        """
+        from urllib.parse import urlparse
 
-        # Try exact domain match, then strip www. prefix
-        match = MentionSource.objects.filter(domain=hostname).first()
-        if not match and hostname.startswith('www.'):
-            match = MentionSource.objects.filter(
-                domain=hostname[4:]
-            ).first()
+        from . import domains
 
+        match = domains.match(urlparse(self.source_url).hostname)
         if match:
-            self.mention_source = match
+            self.mention_source_id = match.id
+
+    def _source_trusted(self):
+        """Trusted flag of mention_source, from the domain index when it knows the source."""
+        if not self.mention_source_id:
+            return False
+        from . import domains
+
+        trusted = domains.source_trust(self.mention_source_id)
+        if trusted is None:
+            return self.is_trusted
+        return trusted
 
     @property
     def target_path(self):
         """Construct a path from content type and slug."""
-        type_prefix = {
-            TargetContentType.ESSAY: 'on',
-            TargetContentType.FIELD_NOTE: 'field-notes',
-            TargetContentType.PROJECT: 'projects',
-            TargetContentType.TOOLKIT: 'toolkit',
-            TargetContentType.SHELF: 'shelf',
-        }
-        prefix = type_prefix.get(self.target_content_type, self.target_content_type)
+        from .targets import ROUTES
+
+        prefix = ROUTES.get(self.target_content_type, self.target_content_type)
         return f'/{prefix}/{self.target_slug}'
 
     @property
     def is_trusted(self):
         """Whether this mention comes from a trusted source."""
         return bool(self.mention_source and self.mention_source.trusted)
+
+
+class SourceHost(TimeStampedModel):
+    """Response statistics for a host that mention sources are fetched from.
+
+    Updated by re-verification (reverify.py), which spaces requests to a
+    host by its average response time so slow sites get fewer requests
+    at once. Also caches the host's Webmention endpoint for outbound
+    Webmentions (outbound.py).
+    """
+
+    domain = models.CharField(
+        max_length=300,
+        unique=True,
+        help_text='Host name, without a leading "www.".',
+    )
+    checks = models.PositiveIntegerField(default=0)
+    failures = models.PositiveIntegerField(
+        default=0,
+        help_text='Checks that ended in an error (timeouts, 5xx, ...).',
+    )
+    avg_response_time = models.FloatField(
+        default=0.0,
+        help_text='Moving average of response time, in seconds.',
+    )
+    last_status = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        help_text='HTTP status of the last check (blank: no response).',
+    )
+    last_checked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+    webmention_endpoint = models.URLField(
+        max_length=2000,
+        blank=True,
+        help_text='Webmention endpoint discovered on this host (blank: none found).',
+    )
+    endpoint_checked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='When the endpoint was last discovered (blank: never).',
+    )
+
+    class Meta:
+        ordering = ['-avg_response_time']
+        verbose_name = 'source host'
+        verbose_name_plural = 'source hosts'
+
+    def __str__(self):
+        return self.domain
+
+
+class OutboundWebmention(TimeStampedModel):
+    """A Webmention sent (or to send) for a link from the site to another page.
+
+    One per (source_url, target_url): a published page of ours and a
+    Source it cites. Rows are created when the link first appears, so
+    each link is notified once (see outbound.py).
+    """
+
+    content_type = models.CharField(
+        max_length=20,
+        choices=TargetContentType.choices,
+    )
+    content_slug = models.SlugField(max_length=300)
+    source_url = models.URLField(
+        max_length=2000,
+        help_text='Our page that links to the target.',
+    )
+    target_url = models.URLField(
+        max_length=2000,
+        help_text='External page being notified.',
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=OutboundStatus.choices,
+        default=OutboundStatus.PENDING,
+    )
+    endpoint = models.URLField(
+        max_length=2000,
+        blank=True,
+        help_text="The target's Webmention endpoint, as used.",
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    send_after = models.DateTimeField(
+        help_text='When a pending Webmention is next due (after the page deploys).',
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+    response_status = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        help_text="HTTP status of the endpoint's last response.",
+    )
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'outbound webmention'
+        verbose_name_plural = 'outbound webmentions'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['source_url', 'target_url'],
+                name='unique_outbound_webmention',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['status', 'send_after'],
+                name='idx_outbound_due',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.source_url} -> {self.target_url}'
@@ -0,0 +1,319 @@
+"""
+Outbound Webmentions for the pages the site cites.
+
+Every public Source linked to an essay or field note (SourceLink) is a
+link from our page to Source.url, and the cited site may want to know.
+
+  1. queue_new_links() runs after each successful publish
+     (publish_research). It creates a pending OutboundWebmention for
+     every link not seen before, due WEBMENTION_SEND_DELAY seconds later
+     so the receiver can fetch the deployed page. Links already queued
+     or sent are left alone, so only newly added links are notified.
+  2. send_due() (the send_webmentions command, from cron) sends the due
+     ones. Per target host it finds the Webmention endpoint, from the
+     HTTP Link header first and then the HTML <link>/<a rel="webmention">,
+     and caches it on SourceHost for WEBMENTION_ENDPOINT_TTL seconds
+     (hosts without an endpoint are cached too). Hosts are handled
+     concurrently, and at most WEBMENTION_SEND_HOST_CONCURRENCY
+     notifications go to one endpoint host at a time (many sites share
+     webmention.io). Workers only make requests; database writes happen
+     on the calling thread.
+
+A transient failure (connection error, timeout, 429 or 5xx) is retried
+with the inbound queue's backoff until MAX_ATTEMPTS; other failures are
+final.
+"""
+
+import ipaddress
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+from requests.utils import parse_header_links
+
+from apps.research.models import SourceLink
+
+from .models import OutboundStatus, OutboundWebmention, SourceHost
+from .queue import MAX_ATTEMPTS, RETRY_BACKOFF, RETRY_BACKOFF_MAX, source_domain
+from .targets import ROUTES, content_url
+from .verification import (
+    CHUNK_SIZE,
+    FETCH_TIMEOUT,
+    HTML_TYPES,
+    RETRY_STATUSES,
+    USER_AGENT,
+    decoder_for,
+    max_fetch_bytes,
+)
+
+logger = logging.getLogger(__name__)
+
+SENT_STATUSES = {200, 201, 202}
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+# ---------------------------------------------------------------------------
+# Queueing
+# ---------------------------------------------------------------------------
+
+
+def queue_new_links(now=None):
+    """
+    Queue a Webmention for every public source link not queued before.
+
+    Returns the number of links queued.
+    """
+    now = now or timezone.now()
+    send_after = now + timedelta(seconds=_setting('WEBMENTION_SEND_DELAY', 600))
+
+    links = {}
+    for content_type, slug, target_url in (
+        SourceLink.objects
+        .filter(source__public=True, content_type__in=ROUTES)
+        .exclude(source__url='')
+        .values_list('content_type', 'content_slug', 'source__url')
+        .iterator()
+    ):
+        if urlparse(target_url).scheme in ('http', 'https'):
+            links[(content_url(content_type, slug), target_url)] = (content_type, slug)
+
+    known = set(OutboundWebmention.objects.values_list('source_url', 'target_url').iterator())
+    new = [
+        OutboundWebmention(
+            content_type=content_type,
+            content_slug=slug,
+            source_url=source_url,
+            target_url=target_url,
+            send_after=send_after,
+        )
+        for (source_url, target_url), (content_type, slug) in links.items()
+        if (source_url, target_url) not in known
+    ]
+    OutboundWebmention.objects.bulk_create(new, ignore_conflicts=True)
+    return len(new)
+
+
+# ---------------------------------------------------------------------------
+# Endpoint discovery
+# ---------------------------------------------------------------------------
+
+
+class EndpointFinder(HTMLParser):
+    """Finds the first <link> or <a> with rel="webmention"."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.href = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.href is not None or tag not in ('link', 'a'):
+            return
+        attrs = dict(attrs)
+        if 'webmention' in (attrs.get('rel') or '').lower().split() and attrs.get('href') is not None:
+            self.href = attrs['href'].strip()
+
+
+def _allowed_endpoint(url):
+    """Refuse endpoints on loopback or private addresses (the spec's SSRF advice)."""
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+        return False
+    if parsed.hostname == 'localhost':
+        return False
+    try:
+        address = ipaddress.ip_address(parsed.hostname)
+    except ValueError:
+        return True
+    return address.is_global
+
+
+def discover_endpoint(target_url):
+    """
+    The Webmention endpoint advertised by target_url, or '' if none.
+
+    Raises requests.RequestException if the page can't be fetched.
+    """
+    with requests.get(
+        target_url,
+        timeout=FETCH_TIMEOUT,
+        headers={'User-Agent': USER_AGENT},
+        allow_redirects=True,
+        stream=True,
+    ) as resp:
+        resp.raise_for_status()
+        href = None
+        for link in parse_header_links(resp.headers.get('Link', '')):
+            if 'webmention' in link.get('rel', '').lower().split():
+                href = link.get('url', '').strip()
+                break
+
+        content_type = resp.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if href is None and content_type in HTML_TYPES:
+            finder = EndpointFinder()
+            decoder = decoder_for(resp)
+            bytes_read, max_bytes = 0, max_fetch_bytes()
+            for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                bytes_read += len(chunk)
+                finder.feed(decoder.decode(chunk))
+                if finder.href is not None or bytes_read >= max_bytes:
+                    break
+            href = finder.href
+
+        if href is None:
+            return ''
+        # An empty href is the page itself
+        endpoint = urljoin(resp.url, href)
+    return endpoint if _allowed_endpoint(endpoint) else ''
+
+
+# ---------------------------------------------------------------------------
+# Sending
+# ---------------------------------------------------------------------------
+
+
+class _EndpointLimits:
+    """A semaphore per endpoint host, created on first use."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.lock = threading.Lock()
+        self.semaphores = {}
+
+    def __call__(self, endpoint):
+        host = urlparse(endpoint).hostname or ''
+        with self.lock:
+            if host not in self.semaphores:
+                self.semaphores[host] = threading.BoundedSemaphore(self.limit)
+            return self.semaphores[host]
+
+
+def _send(endpoint, source_url, target_url):
+    """POST one Webmention. Returns (status, error, transient)."""
+    try:
+        resp = requests.post(
+            endpoint,
+            data={'source': source_url, 'target': target_url},
+            timeout=FETCH_TIMEOUT,
+            headers={'User-Agent': USER_AGENT},
+        )
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        return None, str(e), True
+    except requests.exceptions.RequestException as e:
+        return None, str(e), False
+    with resp:
+        if resp.status_code in SENT_STATUSES:
+            return resp.status_code, '', False
+        return resp.status_code, f'HTTP {resp.status_code}', resp.status_code in RETRY_STATUSES
+
+
+def _send_host(domain, rows, endpoint, limits):
+    """
+    Worker: send one target host's Webmentions.
+
+    endpoint is the cached endpoint ('' for none), or None to discover
+    it from the first target. Returns (domain, endpoint or None if
+    discovery failed, [(row, outcome)]).
+    """
+    outcomes = []
+    if endpoint is None:
+        try:
+            endpoint = discover_endpoint(rows[0].target_url)
+        except requests.exceptions.RequestException as e:
+            logger.info('Webmention endpoint discovery failed for %s: %s', domain, e)
+            transient = not isinstance(e, requests.exceptions.HTTPError) or (
+                e.response is not None and e.response.status_code in RETRY_STATUSES
+            )
+            outcome = {'status': None, 'error': str(e), 'transient': transient, 'endpoint': ''}
+            return domain, None, [(row, outcome) for row in rows]
+
+    for row in rows:
+        if not endpoint:
+            outcomes.append((row, {'status': None, 'error': '', 'transient': False, 'endpoint': ''}))
+            continue
+        with limits(endpoint):
+            status, error, transient = _send(endpoint, row.source_url, row.target_url)
+        outcomes.append((row, {
+            'status': status, 'error': error, 'transient': transient, 'endpoint': endpoint,
+        }))
+    return domain, endpoint, outcomes
+
+
+def _record(row, outcome, now):
+    row.attempts += 1
+    row.endpoint = outcome['endpoint']
+    row.response_status = outcome['status']
+    row.error = outcome['error']
+    if not outcome['endpoint'] and not outcome['error']:
+        row.status = OutboundStatus.NO_ENDPOINT
+    elif not outcome['error']:
+        row.status = OutboundStatus.SENT
+        row.sent_at = now
+    elif outcome['transient'] and row.attempts < MAX_ATTEMPTS:
+        row.status = OutboundStatus.PENDING
+        row.send_after = now + timedelta(
+            seconds=min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * 2 ** (row.attempts - 1))
+        )
+    else:
+        row.status = OutboundStatus.FAILED
+    row.save(update_fields=[
+        'attempts', 'endpoint', 'response_status', 'error', 'status',
+        'sent_at', 'send_after', 'updated_at',
+    ])
+
+
+def send_due(limit=500, workers=None, now=None):
+    """
+    Send up to `limit` due Webmentions.
+
+    Returns a dict counting the resulting statuses.
+    """
+    now = now or timezone.now()
+    workers = workers or settings.WEBMENTION_VERIFY_WORKERS
+    ttl = timedelta(seconds=_setting('WEBMENTION_ENDPOINT_TTL', 24 * 60 * 60))
+
+    by_host = defaultdict(list)
+    for row in (
+        OutboundWebmention.objects
+        .filter(status=OutboundStatus.PENDING, send_after__lte=now)
+        .order_by('send_after', 'pk')[:limit]
+    ):
+        by_host[source_domain(row.target_url)].append(row)
+    if not by_host:
+        return {}
+
+    hosts = {host.domain: host for host in SourceHost.objects.filter(domain__in=by_host)}
+    cached = {
+        domain: host.webmention_endpoint
+        for domain, host in hosts.items()
+        if host.endpoint_checked_at and host.endpoint_checked_at > now - ttl
+    }
+
+    counts = defaultdict(int)
+    limits = _EndpointLimits(_setting('WEBMENTION_SEND_HOST_CONCURRENCY', 2))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='webmention-send') as pool:
+        futures = [
+            pool.submit(_send_host, domain, rows, cached.get(domain), limits)
+            for domain, rows in by_host.items()
+        ]
+        for future in as_completed(futures):
+            domain, endpoint, outcomes = future.result()
+            if endpoint is not None and domain not in cached:
+                host = hosts.get(domain) or SourceHost(domain=domain)
+                host.webmention_endpoint = endpoint
+                host.endpoint_checked_at = timezone.now()
+                host.save()
+            for row, outcome in outcomes:
+                _record(row, outcome, timezone.now())
+                counts[row.status] += 1
+    return dict(counts)
+
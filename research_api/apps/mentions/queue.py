@@ -0,0 +1,283 @@
+"""
+Background verification queue for inbound Webmentions.
+
+receive_webmention() stores the mention with verification_status
+'queued' and answers 202 Accepted at once, as the W3C Webmention spec
+allows, instead of holding a web worker while it fetches an arbitrary
+third-party page. The verify_webmentions management command drains the
+queue with a thread pool:
+
+  1. Requeue mentions left 'verifying' by a worker that died (STALE_AFTER),
+     or fail them once they have used MAX_ATTEMPTS.
+  2. Claim due mentions, at most WEBMENTION_DOMAIN_CONCURRENCY per source
+     host across all workers, so a burst from one site can't monopolise
+     the pool or hammer that site.
+  3. Check that each source links to the target (verification.py). A
+     transient failure (connection error, timeout, 429 or 5xx) is retried
+     with exponential backoff until MAX_ATTEMPTS; anything else is final.
+     An unexpected error is logged and retried the same way.
+     A verified mention's empty title, excerpt, author and date are
+     filled in from the page (microformats.py), and its mention type from
+     the h-entry's u-in-reply-to / u-like-of / u-repost-of.
+
+Queue state lives on the Mention rows, so pending retries survive
+restarts, and GET /webhooks/webmention/<id>/ reports progress.
+"""
+
+import logging
+from datetime import timedelta
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Mention, MentionType, VerificationStatus
+from .verification import TransientFetchError, fetch_source
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+
+# Retry n waits RETRY_BACKOFF * 2 ** (n - 1) seconds, capped.
+RETRY_BACKOFF = 60
+RETRY_BACKOFF_MAX = 60 * 60
+
+# A 'verifying' mention older than this belongs to a worker that died.
+STALE_AFTER = timedelta(minutes=10)
+
+# Due mentions examined per claim when picking under the domain caps.
+CLAIM_SCAN = 500
+
+
+def _domain_cap():
+    return getattr(settings, 'WEBMENTION_DOMAIN_CONCURRENCY', 2)
+
+
+def source_domain(url):
+    """Host a source URL is fetched from, without a leading www."""
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+# ---------------------------------------------------------------------------
+# Enqueue
+# ---------------------------------------------------------------------------
+
+
+def queue_fields(now=None):
+    """Field values that (re)queue a mention for verification."""
+    return {
+        'verification_status': VerificationStatus.QUEUED,
+        'verification_attempts': 0,
+        'verify_after': now or timezone.now(),
+        'verification_started_at': None,
+        'verification_error': '',
+    }
+
+
+# ---------------------------------------------------------------------------
+# Verification
+# ---------------------------------------------------------------------------
+
+# Source metadata key -> Mention field, filled in only when empty
+METADATA_FIELDS = {
+    'title': 'source_title',
+    'excerpt': 'source_excerpt',
+    'author': 'source_author',
+    'author_url': 'source_author_url',
+    'published': 'source_published',
+}
+
+
+def _retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * 2 ** (attempts - 1)))
+
+
+def apply_metadata(mention, metadata):
+    """
+    Fill a mention's empty source fields from fetched page metadata.
+
+    Returns the names of the fields that changed. The mention type is
+    only set while it is still the default (MentionType.MENTION).
+    """
+    changed = []
+    for key, field in METADATA_FIELDS.items():
+        value = metadata.get(key)
+        if not value or getattr(mention, field):
+            continue
+        max_length = Mention._meta.get_field(field).max_length
+        if max_length and isinstance(value, str):
+            value = value[:max_length]
+        setattr(mention, field, value)
+        changed.append(field)
+    mention_type = metadata.get('mention_type')
+    if mention_type and mention.mention_type == MentionType.MENTION:
+        mention.mention_type = mention_type
+        changed.append('mention_type')
+    return changed
+
+
+def verify_mention(mention_id):
+    """
+    Verify one claimed mention and record the outcome.
+
+    Safe to call from a worker thread: it closes its own database
+    connection when done, and never raises. Returns the resulting
+    VerificationStatus (QUEUED when a retry was scheduled), or None if
+    the mention is gone.
+    """
+    try:
+        return _verify(mention_id)
+    except Exception as e:
+        logger.exception('Webmention %s verification raised', mention_id)
+        return _record_error(mention_id, e)
+    finally:
+        close_old_connections()
+
+
+def _record_error(mention_id, error):
+    """Record an unexpected verification error, retrying until MAX_ATTEMPTS."""
+    try:
+        attempts = (
+            Mention.objects.filter(pk=mention_id)
+            .values_list('verification_attempts', flat=True).first()
+        )
+        if attempts is None:
+            return None
+        fields = {'verification_error': f'Unexpected error: {error!r}'}
+        if attempts < MAX_ATTEMPTS:
+            fields['verification_status'] = VerificationStatus.QUEUED
+            fields['verify_after'] = timezone.now() + _retry_delay(attempts)
+        else:
+            fields['verification_status'] = VerificationStatus.FAILED
+        Mention.objects.filter(pk=mention_id).update(updated_at=timezone.now(), **fields)
+        return fields['verification_status']
+    except Exception:
+        # Left 'verifying'; requeue_stale() picks it up
+        logger.exception('Could not record the error for Webmention %s', mention_id)
+        return None
+
+
+def _verify(mention_id):
+    try:
+        mention = Mention.objects.get(pk=mention_id)
+    except Mention.DoesNotExist:
+        return None
+
+    update = ['verification_status', 'verification_error', 'updated_at']
+    try:
+        found, metadata = fetch_source(mention.source_url, mention.target_url)
+    except TransientFetchError as e:
+        logger.info(
+            'Webmention %s verification attempt %s failed: %s',
+            mention.pk, mention.verification_attempts, e,
+        )
+        mention.verification_error = str(e)
+        if mention.verification_attempts < MAX_ATTEMPTS:
+            mention.verification_status = VerificationStatus.QUEUED
+            mention.verify_after = timezone.now() + _retry_delay(mention.verification_attempts)
+            update.append('verify_after')
+        else:
+            mention.verification_status = VerificationStatus.FAILED
+    else:
+        # A source that no longer links loses its verification, and
+        # with it its place on the site, as the spec expects when a
+        # Webmention is re-sent after an edit.
+        mention.verified = found
+        mention.verified_at = timezone.now() if found else None
+        if found:
+            mention.verification_status = VerificationStatus.VERIFIED
+            mention.verification_error = ''
+        else:
+            mention.verification_status = VerificationStatus.FAILED
+            mention.verification_error = 'Source does not link to the target.'
+            mention.public = False
+            update.append('public')
+        update += ['verified', 'verified_at']
+        if found:
+            update += apply_metadata(mention, metadata)
+
+    mention.save(update_fields=update)
+    return mention.verification_status
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+
+def requeue_stale(now=None):
+    """
+    Return mentions stuck 'verifying' by a dead worker to the queue, or
+    fail them if they have no attempts left. Returns the number requeued.
+    """
+    now = now or timezone.now()
+    stale = Mention.objects.filter(
+        verification_status=VerificationStatus.VERIFYING,
+        verification_started_at__lt=now - STALE_AFTER,
+    )
+    stale.filter(verification_attempts__gte=MAX_ATTEMPTS).update(
+        verification_status=VerificationStatus.FAILED,
+        verification_error=f'Verification did not finish in {MAX_ATTEMPTS} attempts.',
+        updated_at=now,
+    )
+    return stale.update(verification_status=VerificationStatus.QUEUED, verify_after=now)
+
+
+def claim_batch(limit, now=None):
+    """
+    Claim up to `limit` due mentions for verification.
+
+    Mentions already being verified (by any worker) count against their
+    source host's WEBMENTION_DOMAIN_CONCURRENCY cap. Returns the claimed
+    mention ids.
+    """
+    if limit <= 0:
+        return []
+    now = now or timezone.now()
+    cap = _domain_cap()
+    with transaction.atomic():
+        in_flight = {}
+        for url in Mention.objects.filter(
+            verification_status=VerificationStatus.VERIFYING,
+        ).values_list('source_url', flat=True):
+            domain = source_domain(url)
+            in_flight[domain] = in_flight.get(domain, 0) + 1
+
+        due = (
+            Mention.objects
+            .select_for_update(skip_locked=True)
+            .filter(verification_status=VerificationStatus.QUEUED, verify_after__lte=now)
+            .order_by('verify_after', 'pk')
+            .values_list('pk', 'source_url')
+        )
+        claimed = []
+        for pk, url in due[:CLAIM_SCAN]:
+            domain = source_domain(url)
+            if in_flight.get(domain, 0) >= cap:
+                continue
+            in_flight[domain] = in_flight.get(domain, 0) + 1
+            claimed.append(pk)
+            if len(claimed) >= limit:
+                break
+
+        Mention.objects.filter(pk__in=claimed).update(
+            verification_status=VerificationStatus.VERIFYING,
+            verification_started_at=now,
+            verification_attempts=F('verification_attempts') + 1,
+        )
+    return claimed
+
+
+def process_queue(pool, limit, now=None):
+    """
+    Run one batch to completion on a concurrent.futures pool.
+
+    Returns the number of mentions processed.
+    """
+    requeue_stale(now)
+    claimed = claim_batch(limit, now)
+    list(pool.map(verify_mention, claimed))
+    return len(claimed)
@@ -0,0 +1,211 @@
+"""
+Periodic re-verification of verified mentions (link rot).
+
+A mention is verified once, but the source page can later be deleted or
+edited to drop the link. reverify_mentions (run daily from cron) walks
+verified mentions whose last check is older than
+MENTION_REVERIFY_AFTER_DAYS, least recently checked first, and fetches
+each source again with check_source():
+
+  unchanged  304 for the stored ETag / Last-Modified: nothing to do
+  linked     still links; the new validators are stored
+  unlinked   no longer links: the mention loses verified and public
+  gone       404 / 410: as unlinked
+  error      timeout, 5xx, ...: left as is until the next run
+
+Only mentions received as Webmentions with a target URL are checked.
+Mentions from trusted MentionSources are skipped, as they are never
+fetched in the first place, and so are manual and webhook mentions,
+which are curated by hand and may have no target URL to look for.
+
+Fetches run on a thread pool with at most one request per host at a
+time. After each response the host waits HOST_SPACING times its average
+response time (SourceHost.avg_response_time, between MIN_HOST_INTERVAL
+and MAX_HOST_INTERVAL) before its next request, so slow hosts are
+spaced out while fast ones are barely delayed. Database writes happen
+on the calling thread; workers only fetch.
+"""
+
+import logging
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import DiscoveryMethod, Mention, SourceHost, VerificationStatus
+from .queue import source_domain
+from .verification import check_source
+
+logger = logging.getLogger(__name__)
+
+# Seconds a host waits between requests, as a multiple of its average
+# response time, with bounds
+HOST_SPACING = 4
+MIN_HOST_INTERVAL = 1.0
+MAX_HOST_INTERVAL = 60.0
+
+# Weight of the newest response in SourceHost.avg_response_time
+RESPONSE_TIME_WEIGHT = 0.3
+
+LOST_MESSAGES = {
+    'unlinked': 'Source no longer links to the target.',
+    'gone': 'Source page is gone (HTTP {status}).',
+}
+
+
+def _reverify_after():
+    return timedelta(days=getattr(settings, 'MENTION_REVERIFY_AFTER_DAYS', 30))
+
+
+def due_mentions(now=None, after=None):
+    """
+    Verified, untrusted Webmentions due for a check, least recently
+    checked first.
+    """
+    now = now or timezone.now()
+    cutoff = now - (after if after is not None else _reverify_after())
+    return (
+        Mention.objects
+        .filter(verified=True, discovery_method=DiscoveryMethod.WEBMENTION)
+        .exclude(target_url='')
+        .exclude(mention_source__trusted=True)
+        .annotate(checked=Coalesce('last_checked_at', 'verified_at'))
+        .filter(Q(checked__isnull=True) | Q(checked__lt=cutoff))
+        .order_by(F('checked').asc(nulls_first=True), 'pk')
+    )
+
+
+# ---------------------------------------------------------------------------
+# Per-host statistics
+# ---------------------------------------------------------------------------
+
+
+def host_interval(host):
+    """Seconds to wait after a response from this SourceHost."""
+    return min(MAX_HOST_INTERVAL, max(MIN_HOST_INTERVAL, host.avg_response_time * HOST_SPACING))
+
+
+def _record_response(host, result, now):
+    if host.checks:
+        host.avg_response_time += RESPONSE_TIME_WEIGHT * (result['elapsed'] - host.avg_response_time)
+    else:
+        host.avg_response_time = result['elapsed']
+    host.checks += 1
+    if result['outcome'] == 'error':
+        host.failures += 1
+    host.last_status = result['status']
+    host.last_checked_at = now
+    host.save()
+
+
+# ---------------------------------------------------------------------------
+# Applying results
+# ---------------------------------------------------------------------------
+
+
+def _clip(value, field):
+    return value[:Mention._meta.get_field(field).max_length]
+
+
+def apply_result(mention, result, now=None):
+    """Store one check_source() result on its mention."""
+    now = now or timezone.now()
+    outcome = result['outcome']
+    mention.last_checked_at = now
+    update = ['last_checked_at', 'updated_at']
+
+    if outcome == 'error':
+        mention.verification_error = result['error']
+        update.append('verification_error')
+    else:
+        mention.source_etag = _clip(result['etag'], 'source_etag')
+        mention.source_last_modified = _clip(result['last_modified'], 'source_last_modified')
+        update += ['source_etag', 'source_last_modified']
+
+    if outcome == 'linked':
+        mention.verification_error = ''
+        update.append('verification_error')
+    elif outcome in LOST_MESSAGES:
+        logger.info('Mention %s lost its source link (%s)', mention.pk, outcome)
+        mention.verified = False
+        mention.verified_at = None
+        mention.public = False
+        mention.link_lost_at = now
+        mention.verification_status = VerificationStatus.FAILED
+        mention.verification_error = LOST_MESSAGES[outcome].format(status=result['status'])
+        update += [
+            'verified', 'verified_at', 'public', 'link_lost_at',
+            'verification_status', 'verification_error',
+        ]
+
+    mention.save(update_fields=update)
+
+
+# ---------------------------------------------------------------------------
+# Run
+# ---------------------------------------------------------------------------
+
+
+def reverify(limit=500, workers=None, after=None, now=None):
+    """
+    Check up to `limit` due mentions.
+
+    Returns a Counter of outcomes ('unchanged', 'linked', ...).
+    """
+    workers = workers or settings.WEBMENTION_VERIFY_WORKERS
+    now = now or timezone.now()
+
+    queues = {}
+    for mention in due_mentions(now, after)[:limit]:
+        queues.setdefault(source_domain(mention.source_url), deque()).append(mention)
+    hosts = {host.domain: host for host in SourceHost.objects.filter(domain__in=queues)}
+    for domain in queues:
+        hosts.setdefault(domain, SourceHost(domain=domain))
+
+    outcomes = Counter()
+    next_allowed = {}
+    in_flight = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='reverify') as pool:
+        while queues or in_flight:
+            clock = time.monotonic()
+            busy = {domain for domain, _mention in in_flight.values()}
+            for domain in list(queues):
+                if len(in_flight) >= workers:
+                    break
+                if domain in busy or next_allowed.get(domain, 0) > clock:
+                    continue
+                mention = queues[domain].popleft()
+                if not queues[domain]:
+                    del queues[domain]
+                future = pool.submit(
+                    check_source,
+                    mention.source_url,
+                    mention.target_url,
+                    mention.source_etag,
+                    mention.source_last_modified,
+                )
+                in_flight[future] = (domain, mention)
+                busy.add(domain)
+
+            # Sleep until a fetch finishes or a waiting host's interval ends
+            waits = [next_allowed.get(domain, 0) - clock for domain in queues if domain not in busy]
+            timeout = max(0.0, min(waits)) if waits and len(in_flight) < workers else None
+            if not in_flight:
+                time.sleep(timeout or 0)
+                continue
+            done, _pending = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                domain, mention = in_flight.pop(future)
+                result = future.result()
+                checked_at = timezone.now()
+                _record_response(hosts[domain], result, checked_at)
+                next_allowed[domain] = time.monotonic() + host_interval(hosts[domain])
+                apply_result(mention, result, checked_at)
+                outcomes[result['outcome']] += 1
+    return outcomes
@@ -0,0 +1,19 @@
+"""
+Signal handlers for mentions models.
+
+Saving or deleting a MentionSource invalidates the in-memory domain
+index (domains.py) in every process, once the change has committed.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import domains
+from .models import MentionSource
+
+
+@receiver(post_save, sender=MentionSource)
+@receiver(post_delete, sender=MentionSource)
+def invalidate_domain_index(sender, instance, **kwargs):
+    transaction.on_commit(domains.invalidate)
@@ -0,0 +1,67 @@
+"""
+Mapping between URLs on the site and mention targets (content type, slug).
+"""
+
+import re
+
+from django.conf import settings
+
+from .models import TargetContentType
+
+# Content types with a page per slug on the Next.js site:
+# src/app/<prefix>/[slug]
+ROUTES = {
+    TargetContentType.ESSAY: 'essays',
+    TargetContentType.FIELD_NOTE: 'field-notes',
+}
+
+# Old prefixes still redirected by next.config.ts
+REDIRECTED_PREFIXES = {
+    'investigations': TargetContentType.ESSAY,
+    'working-ideas': TargetContentType.FIELD_NOTE,
+}
+
+_PATH_PATTERNS = [
+    (re.compile(rf'^/{re.escape(prefix)}/(?P<slug>[\w-]+)/?$'), content_type)
+    for prefix, content_type in [
+        *((prefix, content_type) for content_type, prefix in ROUTES.items()),
+        *REDIRECTED_PREFIXES.items(),
+    ]
+]
+
+
+def parse_target_path(path):
+    """
+    Extract content type and slug from a URL path.
+
+    Returns (content_type, slug) or (TargetContentType.OTHER, '') if
+    no pattern matches. The path patterns match the Next.js route
+    structure.
+    """
+    for pattern, content_type in _PATH_PATTERNS:
+        match = pattern.match(path)
+        if match:
+            return content_type, match.group('slug')
+
+    # Fallback: treat the last path segment as the slug
+    segments = [s for s in path.strip('/').split('/') if s]
+    if segments:
+        return TargetContentType.OTHER, segments[-1]
+    return TargetContentType.OTHER, ''
+
+
+def content_path(content_type, slug):
+    """
+    Path of a piece of content on the site.
+
+    Raises ValueError for content types without a page per slug.
+    """
+    if content_type not in ROUTES:
+        raise ValueError(f'No page route for content type {content_type!r}.')
+    return f'/{ROUTES[content_type]}/{slug}'
+
+
+def content_url(content_type, slug):
+    """Public URL of a piece of content on the site (see content_path)."""
+    domain = getattr(settings, 'WEBMENTION_TARGET_DOMAIN', 'travisgilbert.me')
+    return f'https://{domain}{content_path(content_type, slug)}'
@@ -0,0 +1,113 @@
+import hashlib
+import hmac
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from .models import Mention, TargetContentType
+from .targets import REDIRECTED_PREFIXES, ROUTES, content_url, parse_target_path
+
+# The Next.js app router, beside research_api/
+APP_DIR = Path(settings.BASE_DIR).parent / 'src' / 'app'
+NEXT_CONFIG = Path(settings.BASE_DIR).parent / 'next.config.ts'
+
+
+@override_settings(WEBMENTION_TARGET_DOMAIN='travisgilbert.me')
+class ContentUrlTest(SimpleTestCase):
+
+    def test_essay_and_field_note_urls(self):
+        self.assertEqual(
+            content_url(TargetContentType.ESSAY, 'the-map'),
+            'https://travisgilbert.me/essays/the-map',
+        )
+        self.assertEqual(
+            content_url(TargetContentType.FIELD_NOTE, 'a-note'),
+            'https://travisgilbert.me/field-notes/a-note',
+        )
+
+    def test_every_route_has_a_slug_page(self):
+        for content_type, prefix in ROUTES.items():
+            with self.subTest(content_type=content_type):
+                self.assertTrue((APP_DIR / prefix / '[slug]' / 'page.tsx').is_file())
+
+    def test_redirected_prefixes_are_in_next_config(self):
+        config = NEXT_CONFIG.read_text()
+        for prefix, content_type in REDIRECTED_PREFIXES.items():
+            with self.subTest(prefix=prefix):
+                self.assertIn(f"source: '/{prefix}/:slug'", config)
+                self.assertIn(f"destination: '/{ROUTES[content_type]}/:slug'", config)
+
+    def test_round_trip(self):
+        for content_type in ROUTES:
+            with self.subTest(content_type=content_type):
+                path = content_url(content_type, 'some-slug').removeprefix('https://travisgilbert.me')
+                self.assertEqual(parse_target_path(path), (content_type, 'some-slug'))
+
+    def test_content_type_without_page(self):
+        with self.assertRaises(ValueError):
+            content_url(TargetContentType.SHELF, 'a-book')
+
+
+@override_settings(WEBHOOK_SECRET='test-secret')
+class WebhookBatchTest(TestCase):
+
+    def post(self, items):
+        body = json.dumps(items).encode()
+        signature = hmac.new(b'test-secret', body, hashlib.sha256).hexdigest()
+        return self.client.post(
+            reverse('mentions:receive-webhook-batch'),
+            body,
+            content_type='application/json',
+            HTTP_X_WEBHOOK_SIGNATURE=f'sha256={signature}',
+        )
+
+    def test_batch_upserts_in_order(self):
+        Mention.objects.create(source_url='https://a.example/2', target_slug='x')
+        resp = self.post([
+            {'source_url': 'https://a.example/1', 'target_slug': 'x', 'mention_type': 'reply'},
+            {'source_url': 'https://a.example/2', 'target_slug': 'x', 'source_title': 'Two'},
+        ])
+
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual((data['created'], data['updated']), (1, 1))
+        self.assertEqual([r['status'] for r in data['results']], ['accepted', 'updated'])
+        self.assertEqual(Mention.objects.get(source_url='https://a.example/2').source_title, 'Two')
+
+    def test_invalid_items_are_reported_by_index_and_nothing_is_saved(self):
+        resp = self.post([
+            {'source_url': 'https://a.example/1', 'target_slug': 'x'},
+            {'source_url': 'https://a.example/2'},
+            {'source_url': 'https://a.example/3', 'target_slug': 'x', 'mention_type': 'bogus'},
+            {'source_url': 'https://a.example/4', 'target_slug': 'x', 'target_content_type': 'nope'},
+            {'source_url': 'https://a.example/5', 'target_slug': 'x', 'source_published': 12345},
+            {'source_url': 'https://a.example/6', 'target_slug': 'x', 'source_title': ['list']},
+            {'source_url': 'https://a.example/7', 'target_slug': 'x' * 1000},
+            'not an object',
+        ])
+
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual([e['index'] for e in resp.json()['errors']], [1, 2, 3, 4, 5, 6, 7])
+        self.assertFalse(Mention.objects.exists())
+
+    def test_over_long_strings_are_clipped(self):
+        resp = self.post([
+            {'source_url': 'https://a.example/1', 'target_slug': 'x', 'source_title': 't' * 5000},
+        ])
+
+        self.assertEqual(resp.status_code, 200)
+        limit = Mention._meta.get_field('source_title').max_length
+        self.assertEqual(len(Mention.objects.get().source_title), limit)
+
+    def test_bad_signature_is_rejected(self):
+        resp = self.client.post(
+            reverse('mentions:receive-webhook-batch'),
+            '[]',
+            content_type='application/json',
+            HTTP_X_WEBHOOK_SIGNATURE='sha256=0',
+        )
+        self.assertEqual(resp.status_code, 403)
+        self.assertFalse(Mention.objects.exists())
@@ -0,0 +1,101 @@
+"""
+Flood protection for the public Webmention endpoint.
+
+Anyone can POST to receive_webmention(), and each accepted POST costs an
+update_or_create and a queued fetch of a third-party page, so repeats
+are cheap to send and expensive to serve. Two defences, both kept in
+the Django cache:
+
+  Deduplication  The response for a (source, target) pair is remembered
+                 for WEBMENTION_DEDUP_WINDOW seconds; a repeat inside the
+                 window gets the same response with no database write
+                 and no new verification.
+  Token buckets  Per client IP and per source domain, each holding up to
+                 *_BURST tokens refilled at *_RATE per minute. A request
+                 that finds its bucket empty gets 429 with Retry-After.
+
+With the default LocMemCache the buckets are per process; a shared
+cache backend makes them global. Bucket updates are serialized within a
+process but not across processes, so with a shared cache a burst can
+slightly overshoot the limit.
+"""
+
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+_lock = threading.Lock()
+
+
+def _digest(*parts):
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()[:32]
+
+
+class TokenBucket:
+    """Buckets of `burst` tokens per key, refilled at `per_minute` tokens a minute."""
+
+    def __init__(self, name, per_minute, burst):
+        self.name = name
+        self.rate = per_minute / 60
+        self.burst = max(burst, 1)
+
+    def take(self, key, now=None):
+        """
+        Take a token from key's bucket.
+
+        Returns 0 if one was available, else the seconds until one will
+        be. A bucket with a rate of 0 never runs out.
+        """
+        if self.rate <= 0:
+            return 0
+        now = time.time() if now is None else now
+        cache_key = f'throttle:{self.name}:{_digest(key)}'
+        with _lock:
+            tokens, updated = cache.get(cache_key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens < 1:
+                return (1 - tokens) / self.rate
+            # Kept only until the bucket would be full again anyway
+            cache.set(cache_key, (tokens - 1, now), math.ceil(self.burst / self.rate) + 1)
+        return 0
+
+
+def ip_bucket():
+    return TokenBucket(
+        'webmention-ip',
+        getattr(settings, 'WEBMENTION_IP_RATE', 30),
+        getattr(settings, 'WEBMENTION_IP_BURST', 10),
+    )
+
+
+def domain_bucket():
+    return TokenBucket(
+        'webmention-domain',
+        getattr(settings, 'WEBMENTION_DOMAIN_RATE', 60),
+        getattr(settings, 'WEBMENTION_DOMAIN_BURST', 20),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Deduplication
+# ---------------------------------------------------------------------------
+
+
+def _result_key(source, target):
+    return f'webmention:recent:{_digest(source, target)}'
+
+
+def recent_result(source, target):
+    """The response data remembered for this pair, or None."""
+    return cache.get(_result_key(source, target))
+
+
+def remember_result(source, target, data):
+    """Remember a pair's response data for WEBMENTION_DEDUP_WINDOW seconds."""
+    window = getattr(settings, 'WEBMENTION_DEDUP_WINDOW', 60)
+    if window > 0:
+        cache.set(_result_key(source, target), data, window)
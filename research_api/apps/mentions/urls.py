@@ -6,5 +6,8 @@ app_name = 'mentions'
 
 urlpatterns = [
     path('webmention/', views.receive_webmention, name='receive-webmention'),
+    path('webmention/<int:pk>/', views.webmention_status, name='webmention-status'),
     path('ingest/', views.receive_webhook, name='receive-webhook'),
+    path('ingest/batch/', views.receive_webhook_batch, name='receive-webhook-batch'),
+    path('import/', views.import_mentions_view, name='import-mentions'),
 ]
@@ -0,0 +1,326 @@
+"""
+Webmention source verification: does the source page link to the target?
+
+The source is streamed, never read whole: at most
+WEBMENTION_MAX_FETCH_BYTES are downloaded, decoded incrementally and fed
+to an HTMLParser, and the download stops at the first matching link.
+Only real links count, resolved against the page URL (or its <base>):
+
+  <a href>, <link href>, <img src>
+
+A link matches when it normalizes to the same key as the target
+(apps.research.dedup.normalize_url: scheme, www., default port,
+fragment, tracking parameters and trailing slash ignored). So a page
+that merely mentions the URL in text, or links to some other page
+whose path happens to contain the target path, no longer verifies.
+
+Non-HTML sources (plain text, JSON) fall back to searching the capped
+text for the target URL, as the Webmention spec allows per media type.
+
+fetch_source() also collects the source's title, excerpt, author,
+publish date and mention type (microformats.py) from the same parse.
+Reading then continues past the link only until the h-entry around it
+closes, so the metadata costs no extra request.
+
+check_source() is the conditional variant used by re-verification
+(reverify.py): it sends the ETag / Last-Modified validators from the
+previous check, so an unchanged page costs a bodiless 304.
+"""
+
+import codecs
+import logging
+import time
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import requests
+from django.conf import settings
+
+from apps.research.dedup import normalize_url
+
+from .microformats import EntryCollector
+
+logger = logging.getLogger(__name__)
+
+FETCH_TIMEOUT = 10
+
+# Bytes per read from the socket
+CHUNK_SIZE = 16384
+
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+# The source page is gone for good
+GONE_STATUSES = {404, 410}
+
+USER_AGENT = 'research_api Webmention verifier'
+
+HTML_TYPES = ('text/html', 'application/xhtml+xml')
+
+
+class TransientFetchError(Exception):
+    """The source could not be fetched this time; worth retrying."""
+
+
+def max_fetch_bytes():
+    return getattr(settings, 'WEBMENTION_MAX_FETCH_BYTES', 1024 * 1024)
+
+
+class LinkFinder(HTMLParser):
+    """Incremental parser that stops looking once a link to the target is seen."""
+
+    LINK_ATTRS = {'a': 'href', 'link': 'href', 'img': 'src'}
+
+    def __init__(self, base_url, target_url):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.target_key = normalize_url(target_url)
+        # Any matching link contains the target's last path segment (or
+        # host), which rules out most links before urljoin/normalize.
+        self.needle = self.target_key.split('?')[0].rstrip('/').rsplit('/', 1)[-1].lower()
+        self.found = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.found:
+            return
+        if tag == 'base':
+            href = dict(attrs).get('href')
+            if href:
+                self.base_url = urljoin(self.base_url, href.strip())
+            return
+        attr = self.LINK_ATTRS.get(tag)
+        value = attr and dict(attrs).get(attr)
+        if not value or self.needle not in value.lower():
+            return
+        if normalize_url(urljoin(self.base_url, value.strip())) == self.target_key:
+            self.found = True
+
+    @property
+    def done(self):
+        return self.found
+
+
+class SourceParser(LinkFinder):
+    """LinkFinder that also collects the page's mention metadata."""
+
+    def __init__(self, base_url, target_url):
+        super().__init__(base_url, target_url)
+        self.entry = EntryCollector(self._join, self.target_key)
+
+    def _join(self, url):
+        return urljoin(self.base_url, url.strip())
+
+    @property
+    def done(self):
+        # Finish the h-entry holding the link: author and date often follow it
+        return self.found and not self.entry.in_entry
+
+    def handle_starttag(self, tag, attrs):
+        found = self.found
+        super().handle_starttag(tag, attrs)
+        if self.found and not found:
+            self.entry.link_found()
+        self.entry.start(tag, attrs)
+
+    def handle_endtag(self, tag):
+        self.entry.end(tag)
+
+    def handle_data(self, data):
+        self.entry.data(data)
+
+    def metadata(self):
+        return self.entry.metadata()
+
+
+class TextFinder:
+    """Substring search over streamed text, for non-HTML sources."""
+
+    def __init__(self, target_url):
+        self.target = target_url
+        self.tail = ''
+        self.found = False
+
+    def feed(self, text):
+        window = self.tail + text
+        if self.target in window:
+            self.found = True
+        # Keep enough to catch a match split across chunks
+        self.tail = window[-len(self.target):]
+
+    @property
+    def done(self):
+        return self.found
+
+    def metadata(self):
+        return {}
+
+
+def decoder_for(resp):
+    content_type = resp.headers.get('Content-Type', '')
+    encoding = resp.encoding if 'charset' in content_type.lower() else 'utf-8'
+    try:
+        return codecs.getincrementaldecoder(encoding)(errors='replace')
+    except LookupError:
+        return codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+
+def _finder(resp, target_url, parser=LinkFinder):
+    content_type = resp.headers.get('Content-Type', 'text/html').split(';')[0].strip().lower()
+    if content_type in HTML_TYPES or not content_type:
+        return parser(resp.url, target_url)
+    return TextFinder(target_url)
+
+
+def _stream(resp, finder, max_bytes):
+    """Feed the response to finder until it's done or max_bytes; returns bytes read."""
+    max_bytes = max_fetch_bytes() if max_bytes is None else max_bytes
+    decoder = decoder_for(resp)
+    bytes_read = 0
+    for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+        chunk = chunk[:max_bytes - bytes_read]
+        bytes_read += len(chunk)
+        finder.feed(decoder.decode(chunk))
+        if finder.done:
+            break
+        if bytes_read >= max_bytes:
+            logger.info(
+                'Webmention source %s exceeds %s bytes; stopped reading', resp.url, max_bytes,
+            )
+            break
+    return bytes_read
+
+
+def stream_links_to(resp, target_url, max_bytes=None):
+    """
+    Read a streamed response until a link to target_url turns up.
+
+    Returns (found, bytes_read). Stops at the first match, at the end of
+    the body, or after max_bytes.
+    """
+    finder = _finder(resp, target_url)
+    bytes_read = _stream(resp, finder, max_bytes)
+    return finder.found, bytes_read
+
+
+def stream_source(resp, target_url, max_bytes=None):
+    """
+    Like stream_links_to(), also collecting the source's metadata.
+
+    Returns (found, bytes_read, metadata); metadata is the dict from
+    EntryCollector.metadata(), empty for non-HTML sources.
+    """
+    finder = _finder(resp, target_url, parser=SourceParser)
+    bytes_read = _stream(resp, finder, max_bytes)
+    return finder.found, bytes_read, finder.metadata()
+
+
+def fetch_source(source_url, target_url, max_bytes=None):
+    """
+    Fetch the source URL; report whether it links to the target, and its metadata.
+
+    Returns (found, metadata): found is False if the source doesn't link
+    or can't be fetched for good (4xx), and metadata is empty unless the
+    page was read. Raises TransientFetchError for failures worth
+    retrying.
+    """
+    try:
+        resp = requests.get(
+            source_url,
+            timeout=FETCH_TIMEOUT,
+            headers={'User-Agent': USER_AGENT},
+            allow_redirects=True,
+            stream=True,
+        )
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        raise TransientFetchError(str(e)) from e
+    except requests.exceptions.RequestException as e:
+        logger.warning('Webmention source %s not fetchable: %s', source_url, e)
+        return False, {}
+
+    with resp:
+        if resp.status_code in RETRY_STATUSES:
+            raise TransientFetchError(f'HTTP {resp.status_code}')
+        if resp.status_code >= 400:
+            logger.info('Webmention source %s returned HTTP %s', source_url, resp.status_code)
+            return False, {}
+        try:
+            found, _bytes_read, metadata = stream_source(resp, target_url, max_bytes)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            raise TransientFetchError(str(e)) from e
+        except requests.exceptions.RequestException as e:
+            logger.warning('Webmention source %s read failed: %s', source_url, e)
+            return False, {}
+    return found, metadata
+
+
+def fetch_links_to(source_url, target_url, max_bytes=None):
+    """
+    Fetch the source URL and report whether it links to the target.
+
+    Returns True if it does and False if it doesn't or can't be
+    fetched for good (4xx). Raises TransientFetchError for failures
+    worth retrying.
+    """
+    return fetch_source(source_url, target_url, max_bytes)[0]
+
+
+def check_source(source_url, target_url, etag='', last_modified='', max_bytes=None):
+    """
+    Re-fetch a source conditionally and report whether it still links.
+
+    Returns a dict:
+        outcome: 'unchanged' (304), 'linked', 'unlinked', 'gone'
+                 (404/410) or 'error' (anything worth trying again later)
+        status: HTTP status, or None if there was no response
+        etag, last_modified: validators to send next time
+        elapsed: seconds until the response arrived
+        error: what went wrong, for 'error'
+    """
+    headers = {'User-Agent': USER_AGENT}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+    result = {
+        'outcome': 'error',
+        'status': None,
+        'etag': etag,
+        'last_modified': last_modified,
+        'elapsed': 0.0,
+        'error': '',
+    }
+
+    started = time.perf_counter()
+    try:
+        resp = requests.get(
+            source_url,
+            timeout=FETCH_TIMEOUT,
+            headers=headers,
+            allow_redirects=True,
+            stream=True,
+        )
+    except requests.exceptions.RequestException as e:
+        result['elapsed'] = time.perf_counter() - started
+        result['error'] = str(e)
+        return result
+
+    with resp:
+        result['elapsed'] = resp.elapsed.total_seconds()
+        result['status'] = resp.status_code
+        if resp.status_code == 304:
+            result['outcome'] = 'unchanged'
+            result['etag'] = resp.headers.get('ETag', etag)
+            result['last_modified'] = resp.headers.get('Last-Modified', last_modified)
+        elif resp.status_code in GONE_STATUSES:
+            result['outcome'] = 'gone'
+        elif resp.status_code >= 400:
+            result['error'] = f'HTTP {resp.status_code}'
+        else:
+            try:
+                found, _bytes_read = stream_links_to(resp, target_url, max_bytes)
+            except requests.exceptions.RequestException as e:
+                result['error'] = str(e)
+                return result
+            result['outcome'] = 'linked' if found else 'unlinked'
+            result['etag'] = resp.headers.get('ETag', '')
+            result['last_modified'] = resp.headers.get('Last-Modified', '')
+    return result
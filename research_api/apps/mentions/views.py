@@ -5,31 +5,53 @@ Two ingestion endpoints:
 
 1. W3C Webmention endpoint (open protocol):
    Accepts POST with source and target URL params. Validates that the
-   target is on travisgilbert.me, verifies the source actually links
-   to the target, extracts the target slug, and creates/updates a
-   Mention record.
+   target is on travisgilbert.me, extracts the target slug, creates or
+   updates a Mention record and answers 202 Accepted. Checking that the
+   source actually links to the target happens in the background
+   (queue.py); the Location header points at a status URL. Repeats of a
+   source/target pair and floods from one IP or source domain are
+   absorbed by throttle.py.
 
 2. HMAC-authenticated webhook (private/controlled sources):
    Accepts POST with JSON body and X-Webhook-Signature header. Verifies
    HMAC-SHA256 signature against WEBHOOK_SECRET, then creates/updates
-   a Mention from the structured payload.
+   a Mention from the structured payload. The batch variant takes an
+   array of payloads under one signature and upserts them together.
+
+3. Bulk import (backfills):
+   Accepts POST with a JSONL body and an INTERNAL_API_KEY bearer token,
+   and streams it through importer.import_mentions().
 """
 
 import hashlib
 import hmac
 import json
 import logging
-import re
+import math
 from urllib.parse import urlparse
 
-import requests
 from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_POST
+
+from apps.core.changes import record_changes
+from apps.core.models import ChangeOp
 
-from .models import DiscoveryMethod, Mention, MentionType, TargetContentType
+from .importer import clean_fields, import_mentions, parse_timestamp
+from .models import (
+    DiscoveryMethod,
+    Mention,
+    MentionType,
+    VerificationStatus,
+)
+from . import throttle
+from .queue import queue_fields, source_domain
+from .targets import parse_target_path
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +77,9 @@ def receive_webmention(request):
 
     Optional POST parameters:
         vouch: Vouch URL for extended verification
+
+    Responds 202 Accepted once the mention is stored; verification is
+    queued (re-sending a Webmention re-verifies it).
     """
     source = request.POST.get('source', '').strip()
     target = request.POST.get('target', '').strip()
@@ -93,14 +118,35 @@ def receive_webmention(request):
         )
 
     # Extract content type and slug from the target path
-    content_type, slug = _parse_target_path(target_parsed.path)
+    content_type, slug = parse_target_path(target_parsed.path)
     if not slug:
         return JsonResponse(
             {'error': 'Could not determine target content from URL.'},
             status=400,
         )
 
+    # A repeat within the dedup window gets the earlier answer, untouched
+    prior = throttle.recent_result(source, target)
+    if prior:
+        response = JsonResponse(prior, status=202)
+        response['Location'] = prior['status_url']
+        return response
+
+    for bucket, key in (
+        (throttle.ip_bucket(), _client_ip(request)),
+        (throttle.domain_bucket(), source_domain(source)),
+    ):
+        retry_after = bucket.take(key)
+        if retry_after:
+            response = JsonResponse(
+                {'error': 'Too many Webmentions; try again later.'},
+                status=429,
+            )
+            response['Retry-After'] = str(math.ceil(retry_after))
+            return response
+
     # Create or update the mention (idempotent on source_url + target_slug)
+    # and queue it for verification; trusted sources verify on save.
     mention, created = Mention.objects.update_or_create(
         source_url=source,
         target_slug=slug,
@@ -109,41 +155,59 @@ def receive_webmention(request):
             'target_url': target,
             'discovery_method': DiscoveryMethod.WEBMENTION,
             'webmention_vouch': vouch,
+            **queue_fields(),
         },
     )
 
-    # Attempt verification: fetch source and check for target link
-    verified = _verify_mention(source, target)
-    if verified:
-        mention.verified = True
-        mention.verified_at = timezone.now()
-        mention.save(update_fields=['verified', 'verified_at', 'updated_at'])
+    status_url = request.build_absolute_uri(
+        reverse('mentions:webmention-status', args=[mention.pk])
+    )
+    data = {
+        'status': 'accepted' if created else 'updated',
+        'verification': mention.verification_status,
+        'status_url': status_url,
+    }
+    throttle.remember_result(source, target, data)
+    response = JsonResponse(data, status=202)
+    response['Location'] = status_url
+    return response
 
-    status_code = 201 if created else 200
-    return JsonResponse(
-        {
-            'status': 'accepted' if created else 'updated',
-            'verified': mention.verified,
-        },
-        status=status_code,
+
+@require_GET
+def webmention_status(request, pk):
+    """
+    Verification progress of a Webmention (the 202 response's Location).
+
+    Reports only queue state, never the mention's content, since
+    unverified mentions are not public.
+    """
+    mention = get_object_or_404(
+        Mention.objects.filter(discovery_method=DiscoveryMethod.WEBMENTION),
+        pk=pk,
     )
+    return JsonResponse({
+        'id': mention.pk,
+        'status': mention.verification_status,
+        'verified': mention.verified,
+        'attempts': mention.verification_attempts,
+        'next_attempt': (
+            mention.verify_after.isoformat()
+            if mention.verification_status == VerificationStatus.QUEUED
+            else None
+        ),
+        'error': mention.verification_error,
+    })
 
 
 # ---------------------------------------------------------------------------
 # HMAC-Authenticated Webhook
 # ---------------------------------------------------------------------------
 
-@csrf_exempt
-@require_POST
-def receive_webhook(request):
+def _signature_error(request):
     """
-    Accept a mention via HMAC-signed JSON webhook.
+    Check the X-Webhook-Signature HMAC of the request body.
 
-    Expects:
-        Header X-Webhook-Signature: sha256=<hex digest>
-        Body: JSON with at least source_url and target_slug.
-
-    The HMAC is computed as SHA256(WEBHOOK_SECRET, request body).
+    Returns an error JsonResponse, or None if the signature is valid.
     """
     secret = getattr(settings, 'WEBHOOK_SECRET', '')
     if not secret:
@@ -153,7 +217,6 @@ def receive_webhook(request):
             status=503,
         )
 
-    # Verify signature
     signature_header = request.headers.get('X-Webhook-Signature', '')
     if not signature_header.startswith('sha256='):
         return JsonResponse(
@@ -162,10 +225,9 @@ def receive_webhook(request):
         )
 
     expected_sig = signature_header[7:]  # strip "sha256=" prefix
-    body = request.body
     computed_sig = hmac.new(
         secret.encode('utf-8'),
-        body,
+        request.body,
         hashlib.sha256,
     ).hexdigest()
 
@@ -175,26 +237,16 @@ def receive_webhook(request):
             {'error': 'Invalid signature.'},
             status=403,
         )
+    return None
 
-    # Parse JSON body
-    try:
-        payload = json.loads(body)
-    except json.JSONDecodeError:
-        return JsonResponse(
-            {'error': 'Invalid JSON body.'},
-            status=400,
-        )
-
-    source_url = payload.get('source_url', '').strip()
-    target_slug = payload.get('target_slug', '').strip()
 
-    if not source_url or not target_slug:
-        return JsonResponse(
-            {'error': 'source_url and target_slug are required.'},
-            status=400,
-        )
+def _webhook_defaults(payload):
+    """
+    Mention field values from a webhook payload (besides the lookup pair).
 
-    # Build defaults from payload
+    Checked and clipped like imported records (importer.clean_fields);
+    raises ValueError for an invalid value.
+    """
     defaults = {
         'discovery_method': DiscoveryMethod.MANUAL,
     }
@@ -220,8 +272,7 @@ def receive_webhook(request):
     if 'discovery_method' in payload:
         defaults['discovery_method'] = payload['discovery_method']
     if 'source_published' in payload and payload['source_published']:
-        from django.utils.dateparse import parse_datetime
-        dt = parse_datetime(payload['source_published'])
+        dt = parse_timestamp(payload['source_published'])
         if dt:
             defaults['source_published'] = dt
 
@@ -234,6 +285,53 @@ def receive_webhook(request):
         defaults['public'] = bool(payload['public'])
     if 'featured' in payload:
         defaults['featured'] = bool(payload['featured'])
+    return clean_fields(defaults)
+
+
+def _lookup(payload):
+    """(source_url, target_slug) of a webhook payload; raises ValueError if missing."""
+    if not isinstance(payload, dict):
+        raise ValueError('Expected a JSON object.')
+    source_url = str(payload.get('source_url') or '').strip()
+    target_slug = str(payload.get('target_slug') or '').strip()
+    if not source_url or not target_slug:
+        raise ValueError('source_url and target_slug are required.')
+    for name, value in (('source_url', source_url), ('target_slug', target_slug)):
+        if len(value) > Mention._meta.get_field(name).max_length:
+            raise ValueError(f'{name} is too long.')
+    return source_url, target_slug
+
+
+@csrf_exempt
+@require_POST
+def receive_webhook(request):
+    """
+    Accept a mention via HMAC-signed JSON webhook.
+
+    Expects:
+        Header X-Webhook-Signature: sha256=<hex digest>
+        Body: JSON with at least source_url and target_slug.
+
+    The HMAC is computed as SHA256(WEBHOOK_SECRET, request body).
+    """
+    error = _signature_error(request)
+    if error:
+        return error
+
+    # Parse JSON body
+    try:
+        payload = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse(
+            {'error': 'Invalid JSON body.'},
+            status=400,
+        )
+
+    try:
+        source_url, target_slug = _lookup(payload)
+        defaults = _webhook_defaults(payload)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
 
     # Create or update
     mention, created = Mention.objects.update_or_create(
@@ -253,60 +351,201 @@ def receive_webhook(request):
 
 
 # ---------------------------------------------------------------------------
-# Helpers
+# Batched HMAC-Authenticated Webhook
 # ---------------------------------------------------------------------------
 
-# URL path patterns for the Next.js site
-_PATH_PATTERNS = [
-    (r'^/on/(?P<slug>[\w-]+)/?$', TargetContentType.ESSAY),
-    (r'^/field-notes/(?P<slug>[\w-]+)/?$', TargetContentType.FIELD_NOTE),
-    (r'^/projects/(?P<slug>[\w-]+)/?$', TargetContentType.PROJECT),
-    (r'^/toolkit/(?P<slug>[\w-]+)/?$', TargetContentType.TOOLKIT),
-    (r'^/shelf/(?P<slug>[\w-]+)/?$', TargetContentType.SHELF),
-]
+WEBHOOK_BATCH_MAX = 500
 
 
-def _parse_target_path(path):
+def _upsert_mentions(entries):
     """
-    Extract content type and slug from a URL path.
+    Create or update mentions for [((source_url, target_slug), defaults)],
+    defaults as returned by _webhook_defaults().
 
-    Returns (content_type, slug) or (TargetContentType.OTHER, '') if
-    no pattern matches. The path patterns match the Next.js route
-    structure.
+    One query finds the existing mentions; new ones are inserted with
+    bulk_create and existing ones written with bulk_update, all in one
+    transaction. Returns {pair: (mention, created)}.
     """
-    for pattern, content_type in _PATH_PATTERNS:
-        match = re.match(pattern, path)
-        if match:
-            return content_type, match.group('slug')
-
-    # Fallback: treat the last path segment as the slug
-    segments = [s for s in path.strip('/').split('/') if s]
-    if segments:
-        return TargetContentType.OTHER, segments[-1]
-    return TargetContentType.OTHER, ''
+    now = timezone.now()
+    merged = {}
+    for pair, defaults in entries:
+        merged.setdefault(pair, {}).update(defaults)
+
+    with transaction.atomic():
+        existing = {
+            (mention.source_url, mention.target_slug): mention
+            for mention in Mention.objects.select_for_update().filter(
+                source_url__in={url for url, _slug in merged},
+            )
+        }
+        created, updated = [], []
+        # Trusted-source rules can change these on any mention
+        fields = {'verified', 'verified_at', 'public', 'verification_status', 'mention_source', 'updated_at'}
+        for (source_url, target_slug), defaults in merged.items():
+            mention = existing.get((source_url, target_slug))
+            if mention is None:
+                mention = Mention(source_url=source_url, target_slug=target_slug, **defaults)
+                created.append(mention)
+            else:
+                for field, value in defaults.items():
+                    setattr(mention, field, value)
+                mention.updated_at = now
+                fields.update(defaults)
+                updated.append(mention)
+            mention.apply_source_rules()
+
+        Mention.objects.bulk_create(created)
+        if updated:
+            Mention.objects.bulk_update(updated, sorted(fields))
+        record_changes(created, ChangeOp.CREATED)
+        record_changes(updated)
+
+    result = {(m.source_url, m.target_slug): (m, True) for m in created}
+    result.update({(m.source_url, m.target_slug): (m, False) for m in updated})
+    return result
 
 
-def _verify_mention(source_url, target_url):
+@csrf_exempt
+@require_POST
+def receive_webhook_batch(request):
     """
-    Fetch the source URL and confirm it contains a link to the target.
+    Accept many mentions in one HMAC-signed JSON webhook.
 
-    Returns True if the source page contains the target URL (or its path).
+    Expects:
+        Header X-Webhook-Signature: sha256=<hex digest> (as receive_webhook)
+        Body: JSON array of receive_webhook payloads, at most
+        WEBHOOK_BATCH_MAX.
+
+    Every item is validated first (required fields, choices, types, as
+    receive_webhook): if any is invalid nothing is saved and the 400
+    response lists the errors by index. Over-long strings are clipped.
+    Otherwise the batch is upserted in one transaction and the response
+    has one result per item, in order. Items repeating a (source_url,
+    target_slug) pair update the same mention, later items winning.
     """
+    error = _signature_error(request)
+    if error:
+        return error
+
     try:
-        resp = requests.get(
-            source_url,
-            timeout=10,
-            headers={'User-Agent': 'research_api Webmention verifier'},
-            allow_redirects=True,
+        items = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse(
+            {'error': 'Invalid JSON body.'},
+            status=400,
+        )
+    if not isinstance(items, list) or not items:
+        return JsonResponse(
+            {'error': 'Body must be a non-empty JSON array.'},
+            status=400,
+        )
+    if len(items) > WEBHOOK_BATCH_MAX:
+        return JsonResponse(
+            {'error': f'At most {WEBHOOK_BATCH_MAX} items per batch.'},
+            status=413,
         )
-        resp.raise_for_status()
 
-        # Check for full URL or just the path portion
-        target_path = urlparse(target_url).path
-        return target_url in resp.text or target_path in resp.text
+    pairs, entries, errors = [], [], []
+    for index, item in enumerate(items):
+        try:
+            pair = _lookup(item)
+            entries.append((pair, _webhook_defaults(item)))
+            pairs.append(pair)
+        except ValueError as e:
+            errors.append({'index': index, 'error': str(e)})
+    if errors:
+        return JsonResponse(
+            {'error': 'Invalid items; nothing was saved.', 'errors': errors},
+            status=400,
+        )
 
-    except requests.exceptions.RequestException as e:
-        logger.warning(
-            'Webmention verification failed for %s: %s', source_url, e
+    try:
+        saved = _upsert_mentions(entries)
+    except IntegrityError:
+        # Another request created one of these mentions meanwhile
+        return JsonResponse(
+            {'error': 'Conflicting concurrent write; retry the batch.'},
+            status=409,
         )
+
+    results = []
+    for index, pair in enumerate(pairs):
+        mention, created = saved[pair]
+        results.append({
+            'index': index,
+            'status': 'accepted' if created else 'updated',
+            'mention_id': mention.id,
+        })
+    created_count = sum(1 for mention, created in saved.values() if created)
+    return JsonResponse({
+        'created': created_count,
+        'updated': len(saved) - created_count,
+        'results': results,
+    })
+
+
+# ---------------------------------------------------------------------------
+# Bulk Import
+# ---------------------------------------------------------------------------
+
+def _has_internal_api_key(request):
+    """Validate the Authorization: Bearer <key> header against INTERNAL_API_KEY."""
+    api_key = getattr(settings, 'INTERNAL_API_KEY', '')
+    auth_header = request.headers.get('Authorization', '')
+    if not api_key or not auth_header.startswith('Bearer '):
         return False
+    return hmac.compare_digest(auth_header[7:], api_key)
+
+
+@csrf_exempt
+@require_POST
+def import_mentions_view(request):
+    """
+    Bulk import mentions from a JSONL request body.
+
+    Expects:
+        Header Authorization: Bearer <INTERNAL_API_KEY>
+        Body: one JSON object per line (webhook payloads or webmention.io
+        JF2 entries; see importer.py)
+
+    Query parameters:
+        update=1: overwrite content fields of existing mentions
+        queue=1: queue new unverified mentions for verification
+
+    The body is read line by line rather than loaded whole, so it isn't
+    subject to DATA_UPLOAD_MAX_MEMORY_SIZE. Responds with the import
+    stats.
+    """
+    if not _has_internal_api_key(request):
+        return JsonResponse({'error': 'Unauthorized.'}, status=401)
+
+    stats = import_mentions(
+        request,
+        update=request.GET.get('update') == '1',
+        queue=request.GET.get('queue') == '1',
+    )
+    return JsonResponse(stats)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _client_ip(request):
+    """
+    Client IP for the per-IP bucket.
+
+    Entries at the left of X-Forwarded-For are whatever the client sent,
+    so only the one added by our own outermost proxy (WEBMENTION_PROXY_HOPS
+    from the right) is trusted; with no proxies, REMOTE_ADDR.
+    """
+    hops = getattr(settings, 'WEBMENTION_PROXY_HOPS', 1)
+    forwarded = [
+        part.strip()
+        for part in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')
+        if part.strip()
+    ]
+    if hops > 0 and len(forwarded) >= hops:
+        return forwarded[-hops]
+    return request.META.get('REMOTE_ADDR', '')
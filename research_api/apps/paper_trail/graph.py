@@ -0,0 +1,88 @@
+"""
+Versioned, precompressed graph payload for the Paper Trail explorer.
+
+The explorer HTML no longer inlines the graph. Instead it references
+/graph/<version>.json, where the version is a hash of the JSON body.
+Because the URL changes whenever the content does, the response can be
+cached forever by browsers and CDNs, and the page itself stays small.
+
+The payload is built once per change to the research data and kept in
+the Django cache together with a gzipped copy, so serving it is a cache
+lookup rather than a graph rebuild.
+"""
+
+import gzip
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from apps.research.models import Source, SourceLink
+from apps.research.services import build_graph
+
+CACHE_PREFIX = 'paper_trail:graph'
+
+# Payloads are addressed by content hash, so they never go stale; the
+# timeout only bounds how long superseded versions linger in the cache.
+CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def _fingerprint():
+    """
+    Cheap summary of the tables the graph is built from.
+
+    Row counts catch inserts and deletes; the latest updated_at catches
+    edits. Two aggregate queries instead of a full graph rebuild.
+    """
+    src = Source.objects.aggregate(n=Count('id'), latest=Max('updated_at'))
+    lnk = SourceLink.objects.aggregate(n=Count('id'), latest=Max('updated_at'))
+    raw = f"{src['n']}:{src['latest']}:{lnk['n']}:{lnk['latest']}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _build_payload():
+    graph = build_graph()
+    body = json.dumps(
+        graph, separators=(',', ':'), ensure_ascii=False,
+    ).encode('utf-8')
+    return {
+        'version': hashlib.sha256(body).hexdigest()[:16],
+        'body': body,
+        'gzip': gzip.compress(body, compresslevel=9, mtime=0),
+        'node_count': len(graph['nodes']),
+        'edge_count': len(graph['edges']),
+        'source_types': sorted({
+            n['sourceType'] for n in graph['nodes'] if n['type'] == 'source'
+        }),
+    }
+
+
+def get_graph_payload(version=None):
+    """
+    Return the graph payload dict for the current research data.
+
+    If a version is given and that payload is still cached, it is
+    returned as-is (a page rendered a moment ago keeps working while the
+    data changes underneath it). Otherwise the current payload is
+    returned; callers compare payload['version'] to detect a stale URL.
+
+    Payload keys: version, body (bytes), gzip (bytes), node_count,
+    edge_count, source_types.
+    """
+    if version:
+        payload = cache.get(f'{CACHE_PREFIX}:v:{version}')
+        if payload is not None:
+            return payload
+
+    fingerprint_key = f'{CACHE_PREFIX}:fp:{_fingerprint()}'
+    current_version = cache.get(fingerprint_key)
+    if current_version:
+        payload = cache.get(f'{CACHE_PREFIX}:v:{current_version}')
+        if payload is not None:
+            return payload
+
+    payload = _build_payload()
+    cache.set(f'{CACHE_PREFIX}:v:{payload["version"]}', payload, CACHE_TIMEOUT)
+    cache.set(fingerprint_key, payload['version'], CACHE_TIMEOUT)
+    return payload
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GraphSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(help_text='Graph payload version (content hash).', max_length=64)),
+                ('format', models.CharField(help_text="'svg' or 'png'.", max_length=8)),
+                ('data', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('version', 'format'), name='unique_graph_snapshot')],
+            },
+        ),
+    ]
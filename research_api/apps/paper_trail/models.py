@@ -0,0 +1,21 @@
+from django.db import models
+
+
+class GraphSnapshot(models.Model):
+    """
+    A rendered graph snapshot (see snapshot.py), stored so that every
+    process can serve it: publish_research renders it once and the web
+    process reads it instead of laying the graph out again.
+    """
+    version = models.CharField(max_length=64, help_text='Graph payload version (content hash).')
+    format = models.CharField(max_length=8, help_text="'svg' or 'png'.")
+    data = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['version', 'format'], name='unique_graph_snapshot'),
+        ]
+
+    def __str__(self):
+        return f'{self.version}.{self.format}'
@@ -0,0 +1,355 @@
+"""
+Static SVG/PNG snapshots of the research graph.
+
+The D3 explorer needs JavaScript (and a few seconds of force simulation)
+before it shows anything. A snapshot is drawn server-side from the same
+graph payload using a precomputed force-directed layout, so the Paper
+Trail page can paint the graph immediately and link previews get a real
+OpenGraph image.
+
+Layouts and rendered images are cached by graph version (the content
+hash from graph.get_graph_payload), so each version is laid out and
+rendered once. Rendered images are also stored in the database
+(GraphSnapshot): publish_all() renders them after every publish, in the
+publish_research process, and the web process serves the stored bytes
+instead of computing the layout again. Only the current version's rows
+are kept.
+"""
+
+import io
+import json
+import math
+
+import numpy as np
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils.html import escape
+from PIL import Image, ImageDraw
+
+from .graph import CACHE_TIMEOUT, get_graph_payload
+from .models import GraphSnapshot
+from .templatetags.paper_trail_tags import ROLE_COLORS
+
+CACHE_PREFIX = 'paper_trail:snapshot'
+
+# SVG matches the explorer's graph container; PNG is the OpenGraph size.
+SVG_SIZE = (960, 560)
+PNG_SIZE = (1200, 630)
+MARGIN = 40
+
+# Mirrors the color maps in templates/paper_trail/explorer.html
+SOURCE_TYPE_COLORS = {
+    'book': '#6B4C3B',
+    'article': '#B45A2D',
+    'paper': '#7A5C8A',
+    'video': '#C44040',
+    'podcast': '#2D5F6B',
+    'dataset': '#5A7A4A',
+    'document': '#8A7A5C',
+    'report': '#6A5E52',
+    'map': '#4A8A7A',
+    'archive': '#9A6A3A',
+    'interview': '#3A6A8A',
+    'website': '#7A8A5A',
+    'other': '#6A5E52',
+}
+CONTENT_COLORS = {
+    'essay': '#B45A2D',
+    'field_note': '#2D5F6B',
+}
+PAPER = '#F4EFE8'
+INK = '#2A2420'
+DEFAULT_COLOR = '#6A5E52'
+
+# Above this many nodes, only content nodes get labels (keeps the
+# snapshot legible and the SVG small).
+LABEL_ALL_MAX_NODES = 150
+
+# Rows per repulsion block: memory is O(chunk * n) instead of O(n^2).
+_REPULSION_CHUNK = 256
+
+# Above this many nodes, repulsion is estimated from a random sample of
+# nodes each iteration (scaled up to the full count): O(n * sample)
+# instead of O(n^2), which keeps a few thousand nodes to seconds.
+_EXACT_REPULSION_MAX = 800
+_REPULSION_SAMPLE = 200
+
+
+# ---------------------------------------------------------------------------
+# Layout
+# ---------------------------------------------------------------------------
+
+
+def compute_layout(graph, iterations=None, seed=7):
+    """
+    Fruchterman-Reingold layout of the graph in the unit square.
+
+    Deterministic for a given graph (fixed seed), so the same version
+    always produces the same picture. Returns an (n, 2) float array in
+    node order, with coordinates in [0, 1].
+    """
+    nodes = graph['nodes']
+    n = len(nodes)
+    if n == 0:
+        return np.zeros((0, 2))
+    if n == 1:
+        return np.full((1, 2), 0.5)
+
+    index = {node['id']: i for i, node in enumerate(nodes)}
+    edges = np.array(
+        [
+            (index[e['source']], index[e['target']])
+            for e in graph['edges']
+            if e['source'] in index and e['target'] in index
+        ],
+        dtype=np.intp,
+    ).reshape(-1, 2)
+
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n, 2)) - 0.5
+    k = math.sqrt(1.0 / n)
+    sampled = n > _EXACT_REPULSION_MAX
+    if iterations is None:
+        iterations = 80 if sampled else 150
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+
+    for _ in range(iterations):
+        disp = np.zeros((n, 2))
+
+        # Repulsion from every node (or a sample), one block of rows at a time
+        if sampled:
+            others = pos[rng.choice(n, _REPULSION_SAMPLE, replace=False)]
+            weight = n / _REPULSION_SAMPLE
+        else:
+            others = pos
+            weight = 1.0
+        for start in range(0, n, _REPULSION_CHUNK):
+            delta = pos[start:start + _REPULSION_CHUNK, None, :] - others[None, :, :]
+            dist2 = np.maximum((delta ** 2).sum(axis=-1), 1e-9)
+            disp[start:start + _REPULSION_CHUNK] += weight * (
+                delta * (k * k / dist2)[..., None]
+            ).sum(axis=1)
+
+        # Attraction along edges
+        if len(edges):
+            delta = pos[edges[:, 0]] - pos[edges[:, 1]]
+            dist = np.maximum(np.linalg.norm(delta, axis=1), 1e-9)
+            force = delta * (dist / k)[:, None]
+            np.subtract.at(disp, edges[:, 0], force)
+            np.add.at(disp, edges[:, 1], force)
+
+        # Weak gravity keeps orphans and small components on the canvas
+        disp -= pos * (k * n * 0.1)
+
+        length = np.maximum(np.linalg.norm(disp, axis=1), 1e-9)
+        pos += disp * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+
+    span = np.maximum(pos.max(axis=0) - pos.min(axis=0), 1e-9)
+    return (pos - pos.min(axis=0)) / span
+
+
+def _to_canvas(layout, size):
+    width, height = size
+    scale = np.array([width - 2 * MARGIN, height - 2 * MARGIN])
+    return layout * scale + MARGIN
+
+
+def get_layout(payload):
+    """Cached layout for a graph payload (one computation per version)."""
+    key = f'{CACHE_PREFIX}:{payload["version"]}:layout'
+    layout = cache.get(key)
+    if layout is None:
+        layout = compute_layout(json.loads(payload['body']))
+        cache.set(key, layout, CACHE_TIMEOUT)
+    return layout
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+
+def _node_color(node):
+    if node['type'] == 'source':
+        return SOURCE_TYPE_COLORS.get(node.get('sourceType'), DEFAULT_COLOR)
+    return CONTENT_COLORS.get(node['type'], '#B45A2D')
+
+
+def _node_scale(n):
+    """Shrink node glyphs on large graphs so they don't merge into a blob."""
+    return min(1.0, max(0.25, math.sqrt(300 / max(n, 1))))
+
+
+def _truncate(label, length=24):
+    if len(label) > length:
+        return label[:length - 1] + '…'
+    return label
+
+
+def render_svg(graph, layout, size=SVG_SIZE):
+    """Render the graph and a precomputed layout as a standalone SVG string."""
+    width, height = size
+    points = _to_canvas(layout, size)
+    index = {node['id']: i for i, node in enumerate(graph['nodes'])}
+    label_all = len(graph['nodes']) <= LABEL_ALL_MAX_NODES
+    scale = _node_scale(len(graph['nodes']))
+    r, w, h = 8 * scale, 10 * scale, 7 * scale
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" '
+        f'width="{width}" height="{height}" role="img" '
+        f'aria-label="Research source graph">',
+        f'<rect width="100%" height="100%" fill="{PAPER}"/>',
+        '<g stroke-opacity="0.4" stroke-width="1.2">',
+    ]
+    for edge in graph['edges']:
+        a, b = index.get(edge['source']), index.get(edge['target'])
+        if a is None or b is None:
+            continue
+        (x1, y1), (x2, y2) = points[a], points[b]
+        color = ROLE_COLORS.get(edge.get('role'), '#9A8E82')
+        parts.append(
+            f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" '
+            f'stroke="{color}"/>'
+        )
+    parts.append('</g>')
+
+    parts.append(
+        '<g fill-opacity="0.85" stroke-width="1.5" '
+        'font-family="Courier Prime, monospace" font-size="10">'
+    )
+    for node, (x, y) in zip(graph['nodes'], points):
+        color = _node_color(node)
+        if node['type'] == 'source':
+            parts.append(
+                f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{r:.1f}" '
+                f'fill="{color}" stroke="{color}"/>'
+            )
+        else:
+            parts.append(
+                f'<rect x="{x - w:.1f}" y="{y - h:.1f}" '
+                f'width="{2 * w:.1f}" height="{2 * h:.1f}" '
+                f'rx="3" fill="{color}" stroke="{color}"/>'
+            )
+        if label_all or node['type'] != 'source':
+            parts.append(
+                f'<text x="{x + 14:.1f}" y="{y + 4:.1f}" fill="{INK}" '
+                f'fill-opacity="1" stroke="none">'
+                f'{escape(_truncate(node["label"]))}</text>'
+            )
+    parts.append('</g></svg>')
+    return '\n'.join(parts)
+
+
+def render_png(graph, layout, size=PNG_SIZE, supersample=2):
+    """
+    Rasterize the graph with Pillow for OpenGraph previews.
+
+    Drawn at `supersample` times the target size and downscaled, which
+    gives anti-aliased edges without a vector rasterizer. Labels are
+    omitted: at preview size they are illegible anyway.
+    """
+    width, height = size
+    big = (width * supersample, height * supersample)
+    points = _to_canvas(layout, big)
+    index = {node['id']: i for i, node in enumerate(graph['nodes'])}
+
+    image = Image.new('RGB', big, PAPER)
+    edge_layer = Image.new('RGBA', big, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(edge_layer)
+    for edge in graph['edges']:
+        a, b = index.get(edge['source']), index.get(edge['target'])
+        if a is None or b is None:
+            continue
+        color = ROLE_COLORS.get(edge.get('role'), '#9A8E82')
+        draw.line(
+            [tuple(points[a]), tuple(points[b])],
+            fill=_rgba(color, 0.4),
+            width=max(1, int(1.2 * supersample)),
+        )
+    image.paste(edge_layer, (0, 0), edge_layer)
+
+    draw = ImageDraw.Draw(image)
+    scale = _node_scale(len(graph['nodes'])) * supersample
+    r, w, h = 8 * scale, 10 * scale, 7 * scale
+    for node, (x, y) in zip(graph['nodes'], points):
+        color = _node_color(node)
+        if node['type'] == 'source':
+            draw.ellipse([x - r, y - r, x + r, y + r], fill=color)
+        else:
+            draw.rounded_rectangle(
+                [x - w, y - h, x + w, y + h],
+                radius=3 * scale,
+                fill=color,
+            )
+
+    image = image.resize(size, Image.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def _rgba(hex_color, alpha):
+    hex_color = hex_color.lstrip('#')
+    r, g, b = (int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
+    return (r, g, b, int(255 * alpha))
+
+
+# ---------------------------------------------------------------------------
+# Cached access
+# ---------------------------------------------------------------------------
+
+_RENDERERS = {
+    'svg': lambda graph, layout: render_svg(graph, layout).encode('utf-8'),
+    'png': render_png,
+}
+
+
+def get_snapshot(payload, fmt):
+    """
+    Return the rendered snapshot bytes for a graph payload.
+
+    fmt is 'svg' or 'png'. Read from the process cache, then the stored
+    GraphSnapshot; rendered (and stored) only if neither has it, so
+    repeated requests and both formats share one layout computation.
+    """
+    version = payload['version']
+    key = f'{CACHE_PREFIX}:{version}:{fmt}'
+    data = cache.get(key)
+    if data is None:
+        stored = (
+            GraphSnapshot.objects
+            .filter(version=version, format=fmt)
+            .values_list('data', flat=True)
+            .first()
+        )
+        if stored is not None:
+            data = bytes(stored)
+        else:
+            graph = json.loads(payload['body'])
+            data = _RENDERERS[fmt](graph, get_layout(payload))
+            _store(version, fmt, data)
+        cache.set(key, data, CACHE_TIMEOUT)
+    return data
+
+
+def _store(version, fmt, data):
+    try:
+        with transaction.atomic():
+            GraphSnapshot.objects.create(version=version, format=fmt, data=data)
+    except IntegrityError:
+        pass  # Stored concurrently by another process
+
+
+def warm_snapshots():
+    """
+    Render and store both snapshot formats for the current graph
+    version, and delete those of older versions.
+    """
+    payload = get_graph_payload()
+    for fmt in _RENDERERS:
+        get_snapshot(payload, fmt)
+    GraphSnapshot.objects.exclude(version=payload['version']).delete()
+    return payload['version']
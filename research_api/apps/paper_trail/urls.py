@@ -6,6 +6,8 @@ app_name = 'paper_trail'
 
 urlpatterns = [
     path('', views.explorer, name='explorer'),
+    path('graph/<slug:version>.json', views.graph_data, name='graph-data'),
+    path('graph/<slug:version>.<str:fmt>', views.graph_snapshot, name='graph-snapshot'),
     path('essay/<slug:slug>/', views.essay_trail, name='essay-trail'),
     path('threads/', views.threads, name='threads'),
     path('threads/<slug:slug>/', views.thread_detail, name='thread-detail'),
@@ -5,105 +5,115 @@ These views render server-side templates using the same research models
 as the REST API. No HTTP round-trips: we query the ORM directly.
 """
 
-import json
-
 from django.db.models import Count, Prefetch
 from django.http import Http404, HttpResponse
-from django.shortcuts import render
-from django.views.decorators.http import require_POST
+from django.shortcuts import redirect, render
+from django.urls import reverse
+from django.views.decorators.http import require_GET, require_POST
 
 from apps.mentions.models import Mention
 from apps.research.models import (
     ResearchThread,
-    Source,
     SourceLink,
     SourceSuggestion,
     ThreadEntry,
 )
 from apps.research.services import detect_content_type, get_backlinks
 
+from .graph import get_graph_payload
+from .snapshot import get_snapshot
+
 
 def explorer(request):
     """
     Full-page D3 graph explorer.
 
-    Builds the same nodes + edges structure as the /api/v1/graph/ endpoint,
-    then passes it as JSON to the template for client-side D3 rendering.
-    Orphaned sources (promoted but not yet linked) appear as isolated nodes.
+    The graph itself is not inlined: the template references the
+    versioned JSON resource served by graph_data(), so the HTML stays
+    small and the data is cached independently of the page.
     """
-    links = (
-        SourceLink.objects
-        .select_related('source')
-        .filter(source__public=True)
-    )
-
-    source_nodes = {}
-    content_nodes = {}
-    edges = []
-
-    for lnk in links:
-        src = lnk.source
-        source_key = f'source:{src.slug}'
-        content_key = f'{lnk.content_type}:{lnk.content_slug}'
-
-        if source_key not in source_nodes:
-            source_nodes[source_key] = {
-                'id': source_key,
-                'type': 'source',
-                'label': src.title,
-                'slug': src.slug,
-                'sourceType': src.source_type,
-                'creator': src.creator or '',
-            }
-
-        if content_key not in content_nodes:
-            content_nodes[content_key] = {
-                'id': content_key,
-                'type': lnk.content_type,
-                'label': lnk.content_title or lnk.content_slug,
-                'slug': lnk.content_slug,
-            }
-
-        edges.append({
-            'source': source_key,
-            'target': content_key,
-            'role': lnk.role,
-        })
-
-    # Include orphaned public sources (promoted but not yet linked)
-    orphaned = (
-        Source.objects.public()
-        .exclude(slug__in=[
-            key.removeprefix('source:') for key in source_nodes
-        ])
-    )
-    for src in orphaned:
-        source_key = f'source:{src.slug}'
-        source_nodes[source_key] = {
-            'id': source_key,
-            'type': 'source',
-            'label': src.title,
-            'slug': src.slug,
-            'sourceType': src.source_type,
-            'creator': src.creator or '',
-        }
-
-    nodes = list(source_nodes.values()) + list(content_nodes.values())
-    graph_data = json.dumps({'nodes': nodes, 'edges': edges})
-
-    # Collect unique source types for the filter legend
-    source_types = sorted({n['sourceType'] for n in source_nodes.values()})
+    payload = get_graph_payload()
+    version = payload['version']
 
     return render(request, 'paper_trail/explorer.html', {
-        'graph_data': graph_data,
-        'source_types': source_types,
-        'node_count': len(nodes),
-        'edge_count': len(edges),
+        'graph_url': reverse(
+            'paper_trail:graph-data', kwargs={'version': version},
+        ),
+        'snapshot_url': reverse(
+            'paper_trail:graph-snapshot', kwargs={'version': version, 'fmt': 'svg'},
+        ),
+        'og_image_url': request.build_absolute_uri(reverse(
+            'paper_trail:graph-snapshot', kwargs={'version': version, 'fmt': 'png'},
+        )),
+        'source_types': payload['source_types'],
+        'node_count': payload['node_count'],
+        'edge_count': payload['edge_count'],
         'page_title': 'Paper Trail',
         'nav_section': 'explorer',
     })
 
 
+@require_GET
+def graph_data(request, version):
+    """
+    Graph nodes + edges as an immutable, content-addressed JSON resource.
+
+    The URL embeds a hash of the body, so responses carry a year-long
+    immutable Cache-Control. Requests for a superseded version redirect
+    (uncached) to the current one. A gzipped copy is precomputed and
+    served to clients that accept it.
+    """
+    payload = get_graph_payload(version)
+    if payload['version'] != version:
+        return redirect('paper_trail:graph-data', version=payload['version'])
+
+    etag = f'"{version}"'
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponse(status=304)
+    elif 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = HttpResponse(payload['gzip'], content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(payload['body'], content_type='application/json')
+
+    response['ETag'] = etag
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    response['Vary'] = 'Accept-Encoding'
+    return response
+
+
+_SNAPSHOT_CONTENT_TYPES = {
+    'svg': 'image/svg+xml',
+    'png': 'image/png',
+}
+
+
+@require_GET
+def graph_snapshot(request, version, fmt):
+    """
+    Static SVG or PNG rendering of the graph for a given version.
+
+    Gives the explorer a script-free first paint and link previews an
+    OpenGraph image. Same immutable caching as graph_data().
+    """
+    if fmt not in _SNAPSHOT_CONTENT_TYPES:
+        raise Http404(f'Unknown snapshot format "{fmt}"')
+
+    payload = get_graph_payload(version)
+    if payload['version'] != version:
+        return redirect(
+            'paper_trail:graph-snapshot', version=payload['version'], fmt=fmt,
+        )
+
+    response = HttpResponse(
+        get_snapshot(payload, fmt),
+        content_type=_SNAPSHOT_CONTENT_TYPES[fmt],
+    )
+    response['ETag'] = f'"{version}-{fmt}"'
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+
 def essay_trail(request, slug):
     """
     Per-essay research trail: sources, backlinks, thread, mentions.
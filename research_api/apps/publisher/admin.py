@@ -1,17 +1,38 @@
 from django.contrib import admin
 
-from .models import PublishLog
+from .charts import publish_trends
+from .models import PublishedFile, PublishLog
+
+# Publishes shown in the admin trend charts
+TREND_CHART_LOGS = 60
 
 
 @admin.register(PublishLog)
 class PublishLogAdmin(admin.ModelAdmin):
-    list_display = ['data_type', 'record_count', 'success', 'short_sha', 'created_at']
-    list_filter = ['data_type', 'success', 'created_at']
+    list_display = [
+        'data_type', 'record_count', 'success', 'noop',
+        'files_changed', 'duration_display', 'bytes_written', 'api_calls',
+        'short_sha', 'created_at',
+    ]
+    list_filter = ['data_type', 'success', 'noop', 'created_at']
     readonly_fields = [
         'data_type', 'record_count', 'commit_sha', 'commit_url',
-        'success', 'error_message', 'created_at', 'updated_at',
+        'success', 'noop', 'files_changed', 'files_unchanged',
+        'duration', 'phase_timings', 'bytes_written', 'file_bytes',
+        'api_calls', 'api_retries',
+        'error_message', 'created_at', 'updated_at',
     ]
     date_hierarchy = 'created_at'
+    change_list_template = 'admin/publisher/publishlog/change_list.html'
+
+    def changelist_view(self, request, extra_context=None):
+        """Add trend charts of the latest (filtered) publishes above the list."""
+        response = super().changelist_view(request, extra_context)
+        changelist = getattr(response, 'context_data', {}).get('cl')
+        if changelist is not None:
+            logs = list(changelist.queryset.order_by('-created_at')[:TREND_CHART_LOGS])
+            response.context_data['trend_charts'] = publish_trends(logs[::-1])
+        return response
 
     def has_add_permission(self, request):
         return False
@@ -19,8 +40,36 @@ class PublishLogAdmin(admin.ModelAdmin):
     def has_change_permission(self, request, obj=None):
         return False
 
+    @admin.display(description='Duration', ordering='duration')
+    def duration_display(self, obj):
+        return f'{obj.duration:.2f}s'
+
     @admin.display(description='Commit')
     def short_sha(self, obj):
         if obj.commit_sha:
             return obj.commit_sha[:8]
         return ''
+
+
+@admin.register(PublishedFile)
+class PublishedFileAdmin(admin.ModelAdmin):
+    """Manifest of published paths. Deleting a row forces that file to be
+    re-committed on the next publish."""
+
+    list_display = ['path', 'short_blob', 'short_commit', 'updated_at']
+    search_fields = ['path']
+    readonly_fields = ['path', 'blob_sha', 'commit_sha', 'created_at', 'updated_at']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description='Blob')
+    def short_blob(self, obj):
+        return obj.blob_sha[:8]
+
+    @admin.display(description='Commit')
+    def short_commit(self, obj):
+        return obj.commit_sha[:8]
@@ -0,0 +1,48 @@
+"""
+Publish backend dispatcher.
+
+Callers import publish_file and publish_files from here; the
+PUBLISH_BACKEND setting picks where they commit:
+
+  "github"     GitHub REST API (github.py), the default
+  "local_git"  A local repository via git plumbing (local_git.py)
+
+The backend is resolved on every call, so tests and management commands
+can switch it with override_settings.
+"""
+
+from importlib import import_module
+
+from django.conf import settings
+
+BACKENDS = {
+    "github": "apps.publisher.github",
+    "local_git": "apps.publisher.local_git",
+}
+
+
+def get_backend():
+    name = getattr(settings, "PUBLISH_BACKEND", "github") or "github"
+    try:
+        return import_module(BACKENDS[name])
+    except KeyError:
+        raise ValueError(
+            f"Unknown PUBLISH_BACKEND {name!r}; expected one of {sorted(BACKENDS)}"
+        ) from None
+
+
+def api_counters():
+    """
+    (requests, retries) the backend has made in this process, or (0, 0)
+    for backends that make no API calls. Callers diff two readings.
+    """
+    counters = getattr(get_backend(), "api_counters", None)
+    return counters() if counters else (0, 0)
+
+
+def publish_file(file_path, content, commit_message):
+    return get_backend().publish_file(file_path, content, commit_message)
+
+
+def publish_files(file_ops, commit_message):
+    return get_backend().publish_files(file_ops, commit_message)
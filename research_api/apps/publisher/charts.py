@@ -0,0 +1,154 @@
+"""
+Inline SVG trend charts of publish cost for the PublishLog admin.
+
+Drawn server-side as plain SVG strings (no charting library or
+JavaScript), one bar per publish, oldest on the left:
+
+  Phase timings   stacked seconds per phase (metrics.PHASES, plus
+                  "other" for time outside any phase)
+  Bytes written   size of the files each commit wrote
+  API calls       GitHub requests, with retries stacked on top
+
+Hovering a bar shows the publish and its values (SVG <title>).
+"""
+
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .metrics import PHASES
+
+WIDTH, HEIGHT = 720, 150
+PAD_LEFT, PAD_RIGHT, PAD_TOP, PAD_BOTTOM = 56, 8, 24, 8
+BAR_GAP = 2
+MAX_BAR_WIDTH = 24
+
+INK = '#2A2420'
+GRID = '#D8CFC4'
+
+PHASE_COLORS = {
+    'query': '#2D5F6B',
+    'serialize': '#B45A2D',
+    'compress': '#C49A3A',
+    'manifest': '#7A5C8A',
+    'upload': '#5A7A4A',
+    'commit': '#6B4C3B',
+    'other': '#B8AEA2',
+}
+
+
+def _format_value(value, unit):
+    if unit == 's':
+        return f'{value:.2f}s'
+    if unit == 'B':
+        for suffix, size in (('MB', 1024 * 1024), ('KB', 1024)):
+            if value >= size:
+                return f'{value / size:.1f} {suffix}'
+        return f'{value:.0f} B'
+    return f'{value:.0f}'
+
+
+def stacked_bars(title, columns, series, unit=''):
+    """
+    Render a stacked bar chart as an SVG string.
+
+    Args:
+        title: chart heading
+        columns: list of (label, {series name: value}), one per bar
+        series: list of (series name, color), bottom to top
+        unit: 's', 'B' or '' for value formatting
+    """
+    plot_w = WIDTH - PAD_LEFT - PAD_RIGHT
+    plot_h = HEIGHT - PAD_TOP - PAD_BOTTOM
+    peak = max((sum(values.values()) for _label, values in columns), default=0) or 1
+    bar_w = min(plot_w / max(len(columns), 1), MAX_BAR_WIDTH)
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {WIDTH} {HEIGHT}" '
+        f'width="{WIDTH}" height="{HEIGHT}" role="img" aria-label="{escape(title)}" '
+        f'font-family="sans-serif" font-size="11">',
+        f'<text x="0" y="14" fill="{INK}" font-weight="bold">{escape(title)}</text>',
+        f'<text x="{PAD_LEFT - 6}" y="{PAD_TOP + 4}" fill="{INK}" text-anchor="end">'
+        f'{_format_value(peak, unit)}</text>',
+        f'<text x="{PAD_LEFT - 6}" y="{HEIGHT - PAD_BOTTOM}" fill="{INK}" '
+        f'text-anchor="end">0</text>',
+        f'<line x1="{PAD_LEFT}" y1="{PAD_TOP}" x2="{WIDTH - PAD_RIGHT}" y2="{PAD_TOP}" '
+        f'stroke="{GRID}"/>',
+        f'<line x1="{PAD_LEFT}" y1="{HEIGHT - PAD_BOTTOM}" x2="{WIDTH - PAD_RIGHT}" '
+        f'y2="{HEIGHT - PAD_BOTTOM}" stroke="{GRID}"/>',
+    ]
+
+    # Legend, right-aligned on the title line
+    x = WIDTH - PAD_RIGHT
+    for name, color in reversed(series):
+        x -= 8 + 7 * len(name)
+        parts.append(
+            f'<rect x="{x}" y="5" width="9" height="9" fill="{color}"/>'
+            f'<text x="{x + 12}" y="14" fill="{INK}">{escape(name)}</text>'
+        )
+        x -= 12
+
+    for i, (label, values) in enumerate(columns):
+        x = PAD_LEFT + i * bar_w
+        y = HEIGHT - PAD_BOTTOM
+        tooltip = '\n'.join(
+            [label] + [
+                f'{name}: {_format_value(values[name], unit)}'
+                for name, _color in series if values.get(name)
+            ]
+        )
+        parts.append(f'<g><title>{escape(tooltip)}</title>')
+        for name, color in series:
+            h = plot_h * values.get(name, 0) / peak
+            if h <= 0:
+                continue
+            y -= h
+            parts.append(
+                f'<rect x="{x + BAR_GAP / 2:.1f}" y="{y:.1f}" '
+                f'width="{max(bar_w - BAR_GAP, 1):.1f}" height="{h:.1f}" fill="{color}"/>'
+            )
+        parts.append('</g>')
+
+    parts.append('</svg>')
+    return mark_safe(''.join(parts))
+
+
+def publish_trends(logs):
+    """
+    The three trend charts for PublishLogs, oldest first.
+
+    Returns a list of SVG strings, safe to output in a template.
+    """
+    labels = [
+        f'{log.created_at:%Y-%m-%d %H:%M} {log.get_data_type_display()}'
+        f'{" (no-op)" if log.noop else "" if log.success else " (failed)"}'
+        for log in logs
+    ]
+
+    phase_columns = []
+    for label, log in zip(labels, logs):
+        values = {name: log.phase_timings.get(name, 0) for name in PHASES}
+        values['other'] = max(0, log.duration - sum(values.values()))
+        phase_columns.append((label, values))
+
+    return [
+        stacked_bars(
+            'Phase timings',
+            phase_columns,
+            [(name, PHASE_COLORS[name]) for name in (*PHASES, 'other')],
+            unit='s',
+        ),
+        stacked_bars(
+            'Bytes written',
+            [(label, {'bytes': log.bytes_written}) for label, log in zip(labels, logs)],
+            [('bytes', PHASE_COLORS['serialize'])],
+            unit='B',
+        ),
+        stacked_bars(
+            'GitHub API calls',
+            [
+                (label, {'calls': log.api_calls - log.api_retries, 'retries': log.api_retries})
+                for label, log in zip(labels, logs)
+            ],
+            [('calls', PHASE_COLORS['query']), ('retries', '#C44040')],
+        ),
+    ]
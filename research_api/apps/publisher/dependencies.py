@@ -0,0 +1,94 @@
+"""
+Dependency tracking from research records to per-slug trail files.
+
+A trail (src/data/research/trails/<slug>.json) shows the slug's linked
+sources, its backlinks (other content sharing a source, with that
+content's title and the shared sources' titles), the thread whose
+resulting essay it is, and its mentions. So:
+
+  source       -> every slug linking it (the title appears in their
+                  source lists and shared-source lists), and the
+                  resulting slug of every thread with an entry citing it
+  source link  -> its content slug, every slug linking its source, and
+                  every slug backlinked to its content slug (the link
+                  decides which backlinks exist and carries the
+                  content title those backlinks display)
+  thread       -> its resulting essay slug, current and past
+  thread entry -> its thread's resulting essay slug
+  mention      -> its target slug
+
+affected_trail_slugs() maps a batch of ChangeEvents to that minimal set
+with a fixed number of queries. Event keys (recorded at write time)
+cover records that have since been deleted.
+"""
+
+from apps.core.models import ChangeEvent
+from apps.research.models import ResearchThread, SourceLink, ThreadEntry
+
+
+def affected_trail_slugs(events):
+    """Return the set of trail slugs affected by a ChangeEvent queryset."""
+    slugs = set()
+    source_ids = set()
+    link_slugs = set()
+    thread_ids = set()
+
+    for model, object_id, keys in events.values_list('model', 'object_id', 'keys').iterator():
+        if model == 'source':
+            source_ids.add(object_id)
+        elif model == 'sourcelink':
+            link_slugs.add(keys.get('content_slug'))
+            source_ids.add(keys.get('source_id'))
+        elif model == 'thread':
+            thread_ids.add(object_id)
+        elif model == 'threadentry':
+            thread_ids.add(keys.get('thread_id'))
+        elif model == 'mention':
+            slugs.add(keys.get('target_slug'))
+    source_ids.discard(None)
+    link_slugs.discard(None)
+    thread_ids.discard(None)
+
+    # Source -> linking slugs; thread entries citing it
+    if source_ids:
+        slugs.update(
+            SourceLink.objects
+            .filter(source_id__in=source_ids)
+            .values_list('content_slug', flat=True)
+        )
+        thread_ids.update(
+            ThreadEntry.objects
+            .filter(source_id__in=source_ids)
+            .values_list('thread_id', flat=True)
+        )
+
+    # Link -> its slug and everything backlinked to it
+    if link_slugs:
+        slugs.update(link_slugs)
+        slugs.update(
+            SourceLink.objects
+            .filter(
+                source_id__in=SourceLink.objects
+                .filter(content_slug__in=link_slugs)
+                .values('source_id'),
+            )
+            .values_list('content_slug', flat=True)
+        )
+
+    # Thread -> resulting slug, including slugs it pointed at before
+    if thread_ids:
+        slugs.update(
+            ResearchThread.objects
+            .filter(pk__in=thread_ids)
+            .values_list('resulting_essay_slug', flat=True)
+        )
+        for keys in (
+            ChangeEvent.objects
+            .filter(model='thread', object_id__in=thread_ids)
+            .values_list('keys', flat=True)
+        ):
+            slugs.add(keys.get('resulting_essay_slug'))
+
+    slugs.discard(None)
+    slugs.discard('')
+    return slugs
@@ -0,0 +1,173 @@
+"""
+Wire formats for published research data.
+
+The record files (sources shards, threads.json, mentions.json,
+backlink shards, graph.json) can be written in one of three formats,
+chosen with the RESEARCH_DATA_FORMAT setting:
+
+  pretty    indent=2 JSON, what to_json() has always written (default)
+  minified  no whitespace, and record keys shortened via SHORT_KEYS
+  columnar  minified, and every list of records becomes parallel
+            arrays: [{"id": 1, "title": "a"}, ...] is written as
+            {"id": [1, ...], "title": ["a", ...]}. Keys missing from a
+            record are null in its column. Field names appear once per
+            file, so they are not shortened.
+
+Index files stay pretty so they remain readable entry points, and
+format.json next to them records the format and the key legend
+(short -> long) a client needs to decode the rest.
+
+streaming.py writes the same bytes as encode() a record at a time, and
+precompress.py adds the .gz/.br siblings.
+"""
+
+import json
+
+from django.conf import settings
+
+from . import serializers
+
+FORMATS = ('pretty', 'minified', 'columnar')
+
+FORMAT_FILE = 'format.json'
+
+# Long -> short record keys for the minified format. Keys not listed
+# (such as 'id') are written unchanged, so no short key may equal a
+# long key that is left out.
+SHORT_KEYS = {
+    # Sources
+    'title': 't',
+    'slug': 's',
+    'creator': 'c',
+    'sourceType': 'st',
+    'url': 'u',
+    'publication': 'pb',
+    'datePublished': 'dp',
+    'dateEncountered': 'de',
+    'publicAnnotation': 'pa',
+    'keyFindings': 'kf',
+    'tags': 'tg',
+    'linkCount': 'lc',
+    'locationName': 'ln',
+    'latitude': 'la',
+    'longitude': 'lo',
+    # Threads
+    'description': 'd',
+    'status': 'ss',
+    'startedDate': 'sd',
+    'completedDate': 'cd',
+    'resultingEssaySlug': 'rs',
+    'entries': 'en',
+    'entryType': 'et',
+    'date': 'dt',
+    'order': 'o',
+    'sourceId': 'si',
+    'fieldNoteSlug': 'fn',
+    # Mentions
+    'sourceUrl': 'su',
+    'sourceTitle': 'sti',
+    'sourceExcerpt': 'sx',
+    'sourceAuthor': 'sa',
+    'sourceAuthorUrl': 'sau',
+    'sourcePublished': 'sp',
+    'targetContentType': 'tct',
+    'targetSlug': 'ts',
+    'targetUrl': 'tu',
+    'mentionType': 'mt',
+    'featured': 'f',
+    'createdAt': 'ca',
+    'mentionSource': 'ms',
+    'name': 'n',
+    'avatarUrl': 'au',
+    # Backlinks
+    'contentType': 'ct',
+    'contentSlug': 'cs',
+    'sharedSources': 'sh',
+    # Graph
+    'nodes': 'nd',
+    'edges': 'ed',
+    'type': 'ty',
+    'label': 'l',
+    'source': 'sr',
+    'target': 'tr',
+    'role': 'r',
+}
+
+# json.dumps arguments for the minified and columnar formats
+COMPACT = {'separators': (',', ':'), 'ensure_ascii': False}
+
+
+def data_format():
+    """The configured RESEARCH_DATA_FORMAT, validated."""
+    fmt = getattr(settings, 'RESEARCH_DATA_FORMAT', 'pretty')
+    if fmt not in FORMATS:
+        raise ValueError(
+            f'Unknown RESEARCH_DATA_FORMAT {fmt!r}; expected one of {", ".join(FORMATS)}'
+        )
+    return fmt
+
+
+# ---------------------------------------------------------------------------
+# Encoders
+# ---------------------------------------------------------------------------
+
+
+def shorten(data):
+    """Rename dict keys throughout data using SHORT_KEYS."""
+    if isinstance(data, dict):
+        return {SHORT_KEYS.get(k, k): shorten(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [shorten(v) for v in data]
+    return data
+
+
+def _is_records(value):
+    return isinstance(value, list) and all(
+        isinstance(v, dict) for v in value
+    )
+
+
+def to_columns(records):
+    """
+    Turn a list of dicts into a dict of equal-length lists.
+
+    Columns are ordered by first appearance; a record without a key
+    gets null in that column.
+    """
+    columns = {}
+    for i, record in enumerate(records):
+        for key in columns.keys() - record.keys():
+            columns[key].append(None)
+        for key, value in record.items():
+            if key not in columns:
+                columns[key] = [None] * i
+            columns[key].append(value)
+    return columns
+
+
+def columnar(data):
+    """
+    Columnar layout of a record file: a top-level list of records, or
+    a dict whose values are lists of records (the graph's nodes and
+    edges). Records themselves are left row-shaped inside.
+    """
+    if _is_records(data):
+        return to_columns(data)
+    if isinstance(data, dict):
+        return {k: to_columns(v) if _is_records(v) else v for k, v in data.items()}
+    return data
+
+
+def encode(data, fmt):
+    """Serialize a record file in the given format."""
+    if fmt == 'pretty':
+        return serializers.to_json(data)
+    if fmt == 'minified':
+        return json.dumps(shorten(data), **COMPACT) + '\n'
+    return json.dumps(columnar(data), **COMPACT) + '\n'
+
+
+def format_file(fmt):
+    """Contents of format.json for a publish in fmt."""
+    keys = {short: long for long, short in SHORT_KEYS.items()} if fmt == 'minified' else {}
+    return serializers.to_json({'format': fmt, 'keys': keys})
@@ -2,21 +2,44 @@
 GitHub API client for publishing static JSON to the Next.js repo.
 
 Mirrors the publishing_api pattern: Contents API for single files,
-Git Trees API for atomic multi-file commits.
+Git Trees API for atomic multi-file commits, all through one pooled
+GitHubClient with retries, rate-limit handling and concurrent blob
+creation (kept in sync with publishing_api/apps/publisher/github.py).
 
 Requires GITHUB_TOKEN and GITHUB_REPO in settings.
 """
 
 import base64
 import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from .metrics import phase
 
 logger = logging.getLogger(__name__)
 
 API_BASE = "https://api.github.com"
 
+# Concurrent blob uploads per commit; also the connection pool size.
+BLOB_UPLOAD_WORKERS = 8
+
+# Retries after the first attempt for transient errors and rate limits.
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+# Longest we will sleep for a rate limit before giving up on a request.
+MAX_RATE_LIMIT_WAIT = 60.0
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
 
 def _headers():
     return {
@@ -26,6 +49,198 @@ def _headers():
     }
 
 
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+
+class GitHubClient:
+    """
+    Thread-safe GitHub REST client over one pooled requests.Session.
+
+    request() returns the final response, or raises a requests exception
+    once retries are exhausted, like a plain requests call followed by
+    raise_for_status(). `request_count` counts HTTP round-trips
+    (retries included) and `retry_count` the retried ones, for measuring
+    publish cost.
+    """
+
+    def __init__(self, workers=BLOB_UPLOAD_WORKERS, sleep=time.sleep):
+        self.workers = workers
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.retry_count = 0
+        self.rate_limit_remaining = None
+
+    def request(self, method, url, *, timeout=30, **kwargs):
+        kwargs.setdefault("headers", _headers())
+        attempt = 0
+        while True:
+            with self._lock:
+                self.request_count += 1
+            try:
+                resp = self.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= MAX_RETRIES:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(
+                    "GitHub %s %s: connection error, retrying in %.1fs",
+                    method, url, delay,
+                )
+            else:
+                self._track_rate_limit(resp)
+                delay = self._retry_delay(resp, attempt)
+                if delay is None:
+                    resp.raise_for_status()
+                    return resp
+                logger.warning(
+                    "GitHub %s %s: HTTP %s, retrying in %.1fs",
+                    method, url, resp.status_code, delay,
+                )
+            with self._lock:
+                self.retry_count += 1
+            self._sleep(delay)
+            attempt += 1
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def create_blobs(self, contents):
+        """
+        Create one blob per item, concurrently. Returns SHAs in order.
+
+        Items are strings, or _FileBlobBody instances for large files,
+        which are uploaded from disk without being read into memory.
+        """
+        def create(content):
+            if isinstance(content, _FileBlobBody):
+                headers = {**_headers(), "Content-Type": "application/json"}
+                resp = self.post(_repo_url("git/blobs"), data=content, headers=headers)
+            else:
+                resp = self.post(
+                    _repo_url("git/blobs"),
+                    json={"content": content, "encoding": "utf-8"},
+                )
+            return resp.json()["sha"]
+
+        if len(contents) <= 1:
+            return [create(content) for content in contents]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(create, contents))
+
+    # -- retry policy --------------------------------------------------------
+
+    def _track_rate_limit(self, resp):
+        remaining = resp.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit():
+            self.rate_limit_remaining = int(remaining)
+
+    def _backoff(self, attempt):
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    def _retry_delay(self, resp, attempt):
+        """Seconds to wait before retrying resp, or None to not retry."""
+        status = resp.status_code
+        rate_limited = status == 429 or (
+            status == 403
+            and (
+                resp.headers.get("X-RateLimit-Remaining") == "0"
+                or "Retry-After" in resp.headers
+            )
+        )
+        if not rate_limited and status not in RETRY_STATUSES:
+            return None
+        if attempt >= MAX_RETRIES:
+            return None
+
+        if rate_limited:
+            delay = None
+            retry_after = resp.headers.get("Retry-After", "")
+            reset = resp.headers.get("X-RateLimit-Reset", "")
+            if retry_after.isdigit():
+                delay = float(retry_after)
+            elif resp.headers.get("X-RateLimit-Remaining") == "0" and reset.isdigit():
+                delay = max(0.0, int(reset) - time.time()) + 1
+            if delay is None:
+                delay = self._backoff(attempt)
+            if delay > MAX_RATE_LIMIT_WAIT:
+                logger.error(
+                    "GitHub rate limit resets in %.0fs, not waiting", delay,
+                )
+                return None
+            return delay
+
+        return self._backoff(attempt)
+
+
+class _FileBlobBody:
+    """
+    JSON body for POST git/blobs that streams a local file as base64.
+
+    Yields {"encoding": "base64", "content": "<base64>"} in chunks, with
+    its exact length known up front so requests sends a Content-Length
+    instead of chunked encoding. Every iteration reopens the file, so
+    the client can resend the same body on retry.
+    """
+
+    PREFIX = b'{"encoding": "base64", "content": "'
+    SUFFIX = b'"}'
+    READ_SIZE = 3 * 16384  # whole base64 groups per chunk
+
+    def __init__(self, path):
+        self.path = path
+        size = os.path.getsize(path)
+        self.length = len(self.PREFIX) + 4 * ((size + 2) // 3) + len(self.SUFFIX)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        yield self.PREFIX
+        with open(self.path, "rb") as fh:
+            while chunk := fh.read(self.READ_SIZE):
+                yield base64.b64encode(chunk)
+        yield self.SUFFIX
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide GitHubClient (one connection pool for all publishes)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = GitHubClient()
+        return _client
+
+
+def api_counters():
+    """(requests, retries) made by this process's client so far."""
+    client = get_client()
+    return client.request_count, client.retry_count
+
+
 def _repo_url(path=""):
     base = f"{API_BASE}/repos/{settings.GITHUB_REPO}"
     if path:
@@ -55,10 +270,11 @@ def _extract_error(exc):
 def _get_file_sha(file_path):
     url = f"{_repo_url('contents')}/{file_path}"
     params = {"ref": settings.GITHUB_BRANCH}
-    resp = requests.get(url, headers=_headers(), params=params, timeout=10)
-    if resp.status_code == 200:
-        return resp.json().get("sha")
-    return None
+    try:
+        resp = get_client().get(url, params=params, timeout=10)
+    except requests.exceptions.HTTPError:
+        return None
+    return resp.json().get("sha")
 
 
 def publish_file(file_path, content, commit_message):
@@ -77,8 +293,7 @@ def publish_file(file_path, content, commit_message):
         payload["sha"] = existing_sha
 
     try:
-        resp = requests.put(url, headers=_headers(), json=payload, timeout=30)
-        resp.raise_for_status()
+        resp = get_client().put(url, json=payload)
         data = resp.json()
         commit_info = data.get("commit", {})
         return _result(
@@ -92,80 +307,73 @@ def publish_file(file_path, content, commit_message):
         return _result(False, error=error_detail)
 
 
+def _is_delete(op):
+    return op.get("content") is None and "file" not in op
+
+
 def publish_files(file_ops, commit_message):
     """
     Atomic multi-file commit via the Git Trees API.
 
-    file_ops: list of dicts with 'path' and 'content' keys.
+    file_ops: list of dicts with 'path' and 'content' keys (content None
+    deletes the path), or 'path' and 'file', a local file whose bytes
+    are streamed up as the blob.
+
+    However many files there are, the commit costs the same five
+    sequential round-trips plus one blob upload per file, and the blob
+    uploads run in parallel over a pooled connection.
     """
-    headers = _headers()
+    client = get_client()
     branch = settings.GITHUB_BRANCH
 
     try:
         # Get current branch HEAD
         ref_url = _repo_url(f"git/ref/heads/{branch}")
-        ref_resp = requests.get(ref_url, headers=headers, timeout=10)
-        ref_resp.raise_for_status()
-        base_commit_sha = ref_resp.json()["object"]["sha"]
+        base_commit_sha = client.get(ref_url, timeout=10).json()["object"]["sha"]
 
         # Get the tree of that commit
         commit_url = _repo_url(f"git/commits/{base_commit_sha}")
-        commit_resp = requests.get(commit_url, headers=headers, timeout=10)
-        commit_resp.raise_for_status()
-        base_tree_sha = commit_resp.json()["tree"]["sha"]
-
-        # Create blobs and build tree entries
-        tree_entries = []
-        for op in file_ops:
-            if op.get("content") is None:
-                tree_entries.append({
-                    "path": op["path"],
-                    "mode": "100644",
-                    "type": "blob",
-                    "sha": None,
-                })
-            else:
-                blob_url = _repo_url("git/blobs")
-                blob_resp = requests.post(
-                    blob_url, headers=headers,
-                    json={"content": op["content"], "encoding": "utf-8"},
-                    timeout=30,
-                )
-                blob_resp.raise_for_status()
-                tree_entries.append({
-                    "path": op["path"],
-                    "mode": "100644",
-                    "type": "blob",
-                    "sha": blob_resp.json()["sha"],
-                })
+        base_tree_sha = client.get(commit_url, timeout=10).json()["tree"]["sha"]
+
+        # Create blobs (concurrently) and build tree entries
+        uploads = [
+            _FileBlobBody(op["file"]) if "file" in op else op["content"]
+            for op in file_ops if not _is_delete(op)
+        ]
+        with phase("upload"):
+            blob_shas = iter(client.create_blobs(uploads))
+        tree_entries = [
+            {
+                "path": op["path"],
+                "mode": "100644",
+                "type": "blob",
+                "sha": None if _is_delete(op) else next(blob_shas),
+            }
+            for op in file_ops
+        ]
 
         # Create new tree
-        tree_resp = requests.post(
-            _repo_url("git/trees"), headers=headers,
+        tree_resp = client.post(
+            _repo_url("git/trees"),
             json={"base_tree": base_tree_sha, "tree": tree_entries},
-            timeout=30,
         )
-        tree_resp.raise_for_status()
 
         # Create commit
-        new_commit_resp = requests.post(
-            _repo_url("git/commits"), headers=headers,
+        new_commit = client.post(
+            _repo_url("git/commits"),
             json={
                 "message": commit_message,
                 "tree": tree_resp.json()["sha"],
                 "parents": [base_commit_sha],
             },
-            timeout=30,
-        )
-        new_commit_resp.raise_for_status()
-        new_commit = new_commit_resp.json()
+        ).json()
 
         # Update branch ref
-        requests.patch(
-            _repo_url(f"git/refs/heads/{branch}"), headers=headers,
+        client.patch(
+            _repo_url(f"git/refs/heads/{branch}"),
             json={"sha": new_commit["sha"]},
             timeout=10,
-        ).raise_for_status()
+        )
 
         return _result(
             True,
@@ -0,0 +1,73 @@
+"""
+Content-hash manifest of files published to the Next.js repo.
+
+Every published path is stored with the git blob SHA of its content.
+The SHA is computed locally exactly as git does (sha1 of "blob <size>\0"
+followed by the bytes), so it equals the blob SHA GitHub reports and no
+API call is needed to tell whether a file changed.
+
+Before a publish, changed_files() drops the file ops whose content
+matches the manifest; if none are left there is nothing to commit.
+After a successful commit, record_published() stores the new SHAs.
+"""
+
+import hashlib
+
+from .models import PublishedFile
+
+
+def git_blob_sha(content):
+    """Git blob SHA-1 of a str (encoded as UTF-8) or bytes."""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    header = f'blob {len(content)}\0'.encode('ascii')
+    return hashlib.sha1(header + content).hexdigest()
+
+
+def op_blob_sha(op):
+    """
+    Blob SHA of a file op's content, or None for a deletion.
+
+    Streamed ops (see streaming.py) carry their SHA; in-memory ops are
+    hashed here.
+    """
+    if 'file' in op:
+        return op['sha']
+    if op.get('content') is None:
+        return None
+    return git_blob_sha(op['content'])
+
+
+def changed_files(file_ops):
+    """
+    Split file ops into those whose content differs from the manifest.
+
+    Returns (changed_ops, shas), where shas maps every changed path to
+    its new blob SHA (None for deletions). Deleting a path that was
+    never published is dropped as unchanged.
+    """
+    shas = {op['path']: op_blob_sha(op) for op in file_ops}
+    published = dict(
+        PublishedFile.objects
+        .filter(path__in=shas)
+        .values_list('path', 'blob_sha')
+    )
+    changed = [op for op in file_ops if shas[op['path']] != published.get(op['path'])]
+    return changed, {op['path']: shas[op['path']] for op in changed}
+
+
+def record_published(shas, commit_sha=''):
+    """Store the blob SHAs of a successful commit (None removes a path)."""
+    removed = [path for path, sha in shas.items() if sha is None]
+    if removed:
+        PublishedFile.objects.filter(path__in=removed).delete()
+
+    PublishedFile.objects.bulk_create(
+        [
+            PublishedFile(path=path, blob_sha=sha, commit_sha=commit_sha)
+            for path, sha in shas.items() if sha is not None
+        ],
+        update_conflicts=True,
+        unique_fields=['path'],
+        update_fields=['blob_sha', 'commit_sha', 'updated_at'],
+    )
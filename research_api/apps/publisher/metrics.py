@@ -0,0 +1,136 @@
+"""
+Per-phase timing and byte accounting for research publishes.
+
+A publish runs inside collect() (or a function decorated with
+@collected), which makes a PublishMetrics current for the calling
+context. Code along the way marks what it is doing:
+
+    with metrics.phase('serialize'):
+        ...
+    for source in metrics.timed(queryset.iterator(), 'query'):
+        ...
+
+Phases nest, and each phase is charged only its own time: a 'query'
+step inside 'serialize' moves that time from serialize to query, so the
+phase durations add up to the publish's wall time. With no metrics
+current (a shell call to a helper, say) phase() and timed() do nothing.
+
+commit_changed_files() stores the result on the PublishLog, which the
+admin charts (charts.py).
+"""
+
+import functools
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Phases in pipeline order (also the order of the admin chart legend)
+PHASES = ('query', 'serialize', 'compress', 'manifest', 'upload', 'commit')
+
+_current = ContextVar('publish_metrics', default=None)
+
+
+class PublishMetrics:
+    """Durations per phase and bytes per written file for one publish."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = defaultdict(float)
+        self.file_bytes = {}
+        self._stack = []  # [phase name, start, time spent in children]
+
+    @property
+    def duration(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def bytes_written(self):
+        return sum(self.file_bytes.values())
+
+    def enter(self, name):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def exit(self):
+        name, start, children = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        self.phases[name] += elapsed - children
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def record_files(self, file_ops):
+        """Record the size of every written (not deleted) file op."""
+        for op in file_ops:
+            if 'file' in op:
+                self.file_bytes[op['path']] = os.path.getsize(op['file'])
+            elif op.get('content') is not None:
+                content = op['content']
+                self.file_bytes[op['path']] = len(
+                    content.encode('utf-8') if isinstance(content, str) else content
+                )
+
+    def timings(self):
+        """Phase durations in seconds, rounded, for storing as JSON."""
+        return {name: round(self.phases[name], 4) for name in PHASES if name in self.phases}
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def collect():
+    """
+    Collect metrics for the enclosed publish; yields the PublishMetrics.
+
+    Nested calls share the outer collection.
+    """
+    metrics = _current.get()
+    if metrics is not None:
+        yield metrics
+        return
+    metrics = PublishMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+def collected(fn):
+    """Decorator: run a publish function inside collect()."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with collect():
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def phase(name):
+    """Charge the enclosed block to a phase of the current publish."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    metrics.enter(name)
+    try:
+        yield
+    finally:
+        metrics.exit()
+
+
+_DONE = object()
+
+
+def timed(iterable, name):
+    """Yield from iterable, charging the time spent fetching to a phase."""
+    iterator = iter(iterable)
+    while True:
+        with phase(name):
+            item = next(iterator, _DONE)
+        if item is _DONE:
+            return
+        yield item
+
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publisher', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublishedFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('path', models.CharField(max_length=500, unique=True)),
+                ('blob_sha', models.CharField(help_text='Git blob SHA-1 of the published content.', max_length=40)),
+                ('commit_sha', models.CharField(blank=True, help_text='Commit that last wrote this path.', max_length=40)),
+            ],
+            options={
+                'verbose_name': 'published file',
+                'verbose_name_plural': 'published files',
+                'ordering': ['path'],
+            },
+        ),
+        migrations.AddField(
+            model_name='publishlog',
+            name='files_changed',
+            field=models.PositiveIntegerField(default=0, help_text='Files written or deleted by this commit.'),
+        ),
+        migrations.AddField(
+            model_name='publishlog',
+            name='files_unchanged',
+            field=models.PositiveIntegerField(default=0, help_text='Files skipped because their content was already published.'),
+        ),
+        migrations.AddField(
+            model_name='publishlog',
+            name='noop',
+            field=models.BooleanField(default=False, help_text='Nothing differed from the last publish, so no commit was made.'),
+        ),
+        migrations.AlterField(
+            model_name='publishlog',
+            name='data_type',
+            field=models.CharField(choices=[('sources', 'Sources'), ('links', 'Source Links'), ('threads', 'Threads'), ('mentions', 'Mentions'), ('trail', 'Trail'), ('full', 'Full Publish')], db_index=True, max_length=20),
+        ),
+    ]
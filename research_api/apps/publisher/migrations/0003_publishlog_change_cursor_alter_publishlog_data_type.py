@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publisher', '0002_publishedfile_publishlog_files_changed_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publishlog',
+            name='change_cursor',
+            field=models.PositiveBigIntegerField(blank=True, help_text='Last ChangeEvent id covered by this publish (changed-trails runs).', null=True),
+        ),
+        migrations.AlterField(
+            model_name='publishlog',
+            name='data_type',
+            field=models.CharField(choices=[('sources', 'Sources'), ('links', 'Source Links'), ('threads', 'Threads'), ('mentions', 'Mentions'), ('trail', 'Trail'), ('trails', 'Changed Trails'), ('full', 'Full Publish')], db_index=True, max_length=20),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publisher', '0003_publishlog_change_cursor_alter_publishlog_data_type'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='publishlog',
+            name='data_type',
+            field=models.CharField(choices=[('sources', 'Sources'), ('links', 'Source Links'), ('threads', 'Threads'), ('mentions', 'Mentions'), ('trail', 'Trail'), ('trails', 'Trail Batch'), ('full', 'Full Publish')], db_index=True, max_length=20),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publisher', '0004_alter_publishlog_data_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publishlog',
+            name='api_calls',
+            field=models.PositiveIntegerField(default=0, help_text='GitHub API requests made, retries included.'),
+        ),
+        migrations.AddField(
+            model_name='publishlog',
+            name='api_retries',
+            field=models.PositiveIntegerField(default=0, help_text='GitHub API requests that were retries.'),
+        ),
+        migrations.AddField(
+            model_name='publishlog',
+            name='bytes_written',
+            field=models.PositiveBigIntegerField(default=0, help_text='Total size of the files written by this commit.'),
+        ),
+        migrations.AddField(
+            model_name='publishlog',
+            name='duration',
+            field=models.FloatField(default=0, help_text='Wall time of the publish in seconds.'),
+        ),
+        migrations.AddField(
+            model_name='publishlog',
+            name='file_bytes',
+            field=models.JSONField(blank=True, default=dict, help_text='Size in bytes of each file written, by path.'),
+        ),
+        migrations.AddField(
+            model_name='publishlog',
+            name='phase_timings',
+            field=models.JSONField(blank=True, default=dict, help_text='Seconds per phase: query, serialize, compress, manifest, upload, commit.'),
+        ),
+    ]
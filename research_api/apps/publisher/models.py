@@ -9,6 +9,8 @@ class PublishDataType(models.TextChoices):
     LINKS = 'links', 'Source Links'
     THREADS = 'threads', 'Threads'
     MENTIONS = 'mentions', 'Mentions'
+    TRAIL = 'trail', 'Trail'
+    TRAILS = 'trails', 'Trail Batch'
     FULL = 'full', 'Full Publish'
 
 
@@ -46,6 +48,51 @@ class PublishLog(TimeStampedModel):
         blank=True,
         help_text='Error details if the publish failed.',
     )
+    noop = models.BooleanField(
+        default=False,
+        help_text='Nothing differed from the last publish, so no commit was made.',
+    )
+    files_changed = models.PositiveIntegerField(
+        default=0,
+        help_text='Files written or deleted by this commit.',
+    )
+    files_unchanged = models.PositiveIntegerField(
+        default=0,
+        help_text='Files skipped because their content was already published.',
+    )
+    change_cursor = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        help_text='Last ChangeEvent id covered by this publish (changed-trails runs).',
+    )
+
+    # Cost accounting (see apps/publisher/metrics.py)
+    duration = models.FloatField(
+        default=0,
+        help_text='Wall time of the publish in seconds.',
+    )
+    phase_timings = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text='Seconds per phase: query, serialize, compress, manifest, upload, commit.',
+    )
+    bytes_written = models.PositiveBigIntegerField(
+        default=0,
+        help_text='Total size of the files written by this commit.',
+    )
+    file_bytes = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text='Size in bytes of each file written, by path.',
+    )
+    api_calls = models.PositiveIntegerField(
+        default=0,
+        help_text='GitHub API requests made, retries included.',
+    )
+    api_retries = models.PositiveIntegerField(
+        default=0,
+        help_text='GitHub API requests that were retries.',
+    )
 
     class Meta:
         ordering = ['-created_at']
@@ -59,5 +106,32 @@ class PublishLog(TimeStampedModel):
         ]
 
     def __str__(self):
-        status = 'OK' if self.success else 'FAIL'
+        status = 'NOOP' if self.noop else 'OK' if self.success else 'FAIL'
         return f'[{status}] {self.data_type} ({self.record_count} records) {self.created_at:%Y-%m-%d %H:%M}'
+
+
+class PublishedFile(TimeStampedModel):
+    """Manifest entry: the last content published at a repo path.
+
+    blob_sha is the git blob SHA of the file content, so a regenerated
+    file can be compared without fetching anything from GitHub.
+    """
+
+    path = models.CharField(max_length=500, unique=True)
+    blob_sha = models.CharField(
+        max_length=40,
+        help_text='Git blob SHA-1 of the published content.',
+    )
+    commit_sha = models.CharField(
+        max_length=40,
+        blank=True,
+        help_text='Commit that last wrote this path.',
+    )
+
+    class Meta:
+        ordering = ['path']
+        verbose_name = 'published file'
+        verbose_name_plural = 'published files'
+
+    def __str__(self):
+        return f'{self.path} @ {self.blob_sha[:8]}'
@@ -0,0 +1,104 @@
+"""
+Precompressed siblings for published research data files.
+
+With RESEARCH_DATA_PRECOMPRESS on, every record file gets a .gz
+sibling, and a .br sibling when the optional brotli package is
+installed, committed alongside it. A static host can then serve the
+smaller file with Content-Encoding instead of compressing per request
+(brotli at quality 11 is far too slow to run per request).
+
+gzip is written with mtime 0 and no file name, so its bytes, and with
+them the blob SHA the manifest compares, only change when the content
+does; an unchanged file's siblings are skipped like the file itself.
+Compression reads the source op in READ_SIZE chunks, so a streamed
+file is never loaded whole.
+"""
+
+import gzip
+import os
+
+from django.conf import settings
+from django.db.models import Q
+
+from .models import PublishedFile
+from .streaming import READ_SIZE, file_blob_sha
+
+try:
+    import brotli
+except ImportError:  # optional dependency; .br siblings are skipped
+    brotli = None
+
+SUFFIXES = ('.gz', '.br')
+
+
+def enabled():
+    return getattr(settings, 'RESEARCH_DATA_PRECOMPRESS', False)
+
+
+def _is_delete(op):
+    return op.get('content') is None and 'file' not in op
+
+
+def _read_chunks(op):
+    if 'file' in op:
+        with open(op['file'], 'rb') as fh:
+            while chunk := fh.read(READ_SIZE):
+                yield chunk
+    else:
+        content = op['content']
+        yield content.encode('utf-8') if isinstance(content, str) else content
+
+
+def _write_gzip(op, local_path):
+    with open(local_path, 'wb') as raw:
+        with gzip.GzipFile(filename='', mode='wb', fileobj=raw, compresslevel=9, mtime=0) as gz:
+            for chunk in _read_chunks(op):
+                gz.write(chunk)
+
+
+def _write_brotli(op, local_path):
+    compressor = brotli.Compressor(quality=11)
+    with open(local_path, 'wb') as out:
+        for chunk in _read_chunks(op):
+            out.write(compressor.process(chunk))
+        out.write(compressor.finish())
+
+
+def _writers():
+    writers = {'.gz': _write_gzip}
+    if brotli is not None:
+        writers['.br'] = _write_brotli
+    return writers
+
+
+def sibling_ops(ops, workdir):
+    """
+    File ops for the compressed siblings of ops, written under workdir.
+
+    Siblings that should not exist (precompression off, brotli not
+    installed, or the file itself being deleted) get delete ops when
+    they were published before.
+    """
+    writers = _writers() if enabled() else {}
+    siblings = []
+    unwanted = []
+    for op in ops:
+        for suffix in SUFFIXES:
+            path = op['path'] + suffix
+            if suffix not in writers or _is_delete(op):
+                unwanted.append(path)
+                continue
+            local_path = os.path.join(workdir, path.replace('/', '__'))
+            writers[suffix](op, local_path)
+            siblings.append({'path': path, 'file': local_path, 'sha': file_blob_sha(local_path)})
+
+    published = set(
+        PublishedFile.objects
+        .filter(Q(path__endswith='.gz') | Q(path__endswith='.br'))
+        .values_list('path', flat=True)
+    )
+    return siblings + [
+        {'path': path, 'content': None}
+        for path in unwanted
+        if path in published
+    ]
@@ -9,20 +9,38 @@ Supports three modes:
   publish_all()        : Full publish (sources, threads, mentions, graph, backlinks)
   publish_only(kind)   : Single data type (sources, threads, mentions)
   publish_trail(slug)  : Per-slug research trail JSON
+  publish_changed_trails() : Trails affected by edits since the last run
+  publish_all_trails() : Every trail file in one commit
+
+Every mode commits only files whose content changed since the last
+publish (tracked in the PublishedFile manifest), and makes no commit at
+all when nothing changed.
+
+publish_all() and publish_only() write the record files in the
+RESEARCH_DATA_FORMAT wire format (formats.py) and, with
+RESEARCH_DATA_PRECOMPRESS, .gz/.br siblings (precompress.py). Trails
+are always pretty JSON.
 """
 
 import logging
+import tempfile
 from collections import defaultdict
 
-from django.db.models import Count, Prefetch
+from django.db.models import Count, Max, Prefetch, Q
+
+from apps.core.changes import settled_events
+from apps.core.models import ChangeEvent
 
 from apps.mentions.models import Mention
 from apps.research.models import ResearchThread, Source, SourceLink, ThreadEntry
-from apps.research.services import detect_content_type, get_all_backlinks, get_backlinks
+from apps.research.services import get_all_backlinks
 
-from . import serializers
-from .github import publish_files
-from .models import PublishLog
+from . import formats, metrics, precompress, serializers, shards
+from .backend import api_counters, publish_files
+from .dependencies import affected_trail_slugs
+from .manifest import changed_files, op_blob_sha, record_published
+from .models import PublishedFile, PublishLog
+from .streaming import CHUNK_SIZE, stream_file_op
 
 logger = logging.getLogger(__name__)
 
@@ -30,172 +48,314 @@ logger = logging.getLogger(__name__)
 DATA_PREFIX = 'src/data/research'
 
 
-def publish_all():
+def commit_changed_files(
+    file_ops, commit_message, data_type, record_count,
+    force=False, change_cursor=None,
+):
     """
-    Publish all research data as static JSON to the Next.js repo.
+    Commit only the file ops whose content differs from the last publish.
 
-    Creates/updates these files:
-        src/data/research/sources.json
-        src/data/research/threads.json
-        src/data/research/mentions.json
-        src/data/research/backlinks.json
-        src/data/research/graph.json
+    Compares each file's git blob SHA with the PublishedFile manifest.
+    Unchanged files are dropped; if nothing is left, no commit is made
+    (so no Vercel rebuild is triggered) and the result has noop=True.
+    Every call writes a PublishLog entry. force=True commits all files
+    regardless, e.g. after the repo was edited by hand. change_cursor is
+    the last ChangeEvent id this publish accounts for, if any.
+
+    The log also records the publish's phase timings, bytes written and
+    API calls (metrics.py); those cover the whole enclosing publish when
+    called inside metrics.collect().
 
     Returns:
-        dict with keys: success, commit_sha, commit_url, error
+        dict with keys: success, commit_sha, commit_url, error, noop
     """
-    logger.info('Starting full research data publish...')
+    with metrics.collect() as collected:
+        calls_before = api_counters()
+        with metrics.phase('manifest'):
+            if force:
+                changed, shas = file_ops, {op['path']: op_blob_sha(op) for op in file_ops}
+            else:
+                changed, shas = changed_files(file_ops)
+        unchanged = len(file_ops) - len(changed)
+
+        if not changed:
+            result = {
+                'success': True,
+                'commit_sha': '',
+                'commit_url': '',
+                'error': None,
+                'noop': True,
+            }
+        else:
+            with metrics.phase('commit'):
+                result = publish_files(changed, commit_message=commit_message)
+            result['noop'] = False
+            if result['success']:
+                collected.record_files(changed)
+                with metrics.phase('manifest'):
+                    record_published(shas, commit_sha=result.get('commit_sha', ''))
+
+        calls, retries = (
+            after - before for after, before in zip(api_counters(), calls_before)
+        )
+        PublishLog.objects.create(
+            data_type=data_type,
+            record_count=record_count,
+            commit_sha=result.get('commit_sha', ''),
+            commit_url=result.get('commit_url', ''),
+            success=result['success'],
+            error_message=result.get('error') or '',
+            noop=result['noop'],
+            files_changed=len(changed) if result['success'] else 0,
+            files_unchanged=unchanged,
+            change_cursor=change_cursor,
+            duration=round(collected.duration, 4),
+            phase_timings=collected.timings(),
+            bytes_written=collected.bytes_written,
+            file_bytes=collected.file_bytes,
+            api_calls=calls,
+            api_retries=retries,
+        )
+    return result
+
+
+def _stale_file_ops(directory, current, legacy=()):
+    """
+    Delete ops for published files under directory (and legacy paths)
+    that the current publish no longer writes.
+    """
+    published = PublishedFile.objects.filter(
+        Q(path__startswith=f'{directory}/') | Q(path__in=legacy),
+    ).values_list('path', flat=True)
+    return [
+        {'path': path, 'content': None}
+        for path in published
+        if path not in current
+    ]
 
-    # Gather data (only public records)
-    sources = list(
+
+def _public_sources():
+    return (
         Source.objects.public()
         .annotate(link_count=Count('links'))
         .order_by('title')
     )
-    links = list(
-        SourceLink.objects.select_related('source')
-        .filter(source__public=True)
-        .order_by('content_type', 'content_slug')
-    )
-    threads = list(
+
+
+def _public_threads():
+    return (
         ResearchThread.objects.public()
         .prefetch_related('entries', 'entries__source')
         .order_by('-started_date')
     )
-    backlink_graph = get_all_backlinks()
-    mentions = list(
+
+
+def _public_mentions():
+    return (
         Mention.objects.public()
         .select_related('mention_source')
         .order_by('-created_at')
     )
 
-    # Serialize
-    sources_json = serializers.to_json([
-        serializers.serialize_source(s) for s in sources
-    ])
-    threads_json = serializers.to_json([
-        serializers.serialize_thread(t) for t in threads
-    ])
-    mentions_json = serializers.to_json([
-        serializers.serialize_mention(m) for m in mentions
-    ])
-    backlinks_json = serializers.to_json(
-        serializers.serialize_backlinks(backlink_graph)
-    )
-    graph_json = serializers.to_json(
-        serializers.serialize_graph(links)
-    )
 
-    # Build file operations
-    file_ops = [
-        {'path': f'{DATA_PREFIX}/sources.json', 'content': sources_json},
-        {'path': f'{DATA_PREFIX}/threads.json', 'content': threads_json},
-        {'path': f'{DATA_PREFIX}/mentions.json', 'content': mentions_json},
-        {'path': f'{DATA_PREFIX}/backlinks.json', 'content': backlinks_json},
-        {'path': f'{DATA_PREFIX}/graph.json', 'content': graph_json},
-    ]
+# kind -> (file name, queryset, record serializer); sources are sharded
+_STREAMED_KINDS = {
+    'threads': ('threads.json', _public_threads, serializers.serialize_thread),
+    'mentions': ('mentions.json', _public_mentions, serializers.serialize_mention),
+}
 
-    # Commit atomically
-    result = publish_files(
-        file_ops,
-        commit_message=(
-            f'data(research): publish {len(sources)} sources, '
-            f'{len(threads)} threads, {len(mentions)} mentions'
-        ),
-    )
 
-    # Write audit log
-    total_records = len(sources) + len(links) + len(threads) + len(mentions)
-    PublishLog.objects.create(
-        data_type='full',
-        record_count=total_records,
-        commit_sha=result.get('commit_sha', ''),
-        commit_url=result.get('commit_url', ''),
-        success=result['success'],
-        error_message=result.get('error', ''),
+def _stream_kind(kind, workdir, fmt):
+    """
+    Stream one data type to temp files in fmt; returns (file_ops, count).
+
+    Sources become shards plus an index (shards.py), with delete ops for
+    shards that no longer exist and for the old monolithic sources.json.
+    Compressed siblings are included (see precompress.py).
+    """
+    if kind == 'sources':
+        with metrics.phase('serialize'):
+            ops, count = shards.source_shard_ops(
+                metrics.timed(
+                    _public_sources().order_by('source_type', 'id')
+                    .iterator(chunk_size=CHUNK_SIZE),
+                    'query',
+                ),
+                DATA_PREFIX,
+                workdir,
+                fmt,
+            )
+        with metrics.phase('compress'):
+            ops += precompress.sibling_ops(ops, workdir)
+        ops += _stale_file_ops(
+            f'{DATA_PREFIX}/{shards.SOURCES_DIR}',
+            {op['path'] for op in ops},
+            legacy=[f'{DATA_PREFIX}/sources.json'],
+        )
+        return ops, count
+
+    file_name, queryset, serialize = _STREAMED_KINDS[kind]
+    with metrics.phase('serialize'):
+        op, count = stream_file_op(
+            f'{DATA_PREFIX}/{file_name}',
+            workdir,
+            metrics.timed(queryset().iterator(chunk_size=CHUNK_SIZE), 'query'),
+            serialize,
+            fmt,
+        )
+    with metrics.phase('compress'):
+        siblings = precompress.sibling_ops([op], workdir)
+    return [op, *siblings], count
+
+
+def _backlink_ops(workdir, fmt):
+    """Backlink shards plus index and siblings, and deletes for stale ones."""
+    with metrics.phase('query'):
+        backlink_graph = get_all_backlinks()
+    with metrics.phase('serialize'):
+        ops = shards.backlink_shard_ops(backlink_graph, DATA_PREFIX, fmt)
+    with metrics.phase('compress'):
+        ops += precompress.sibling_ops(ops, workdir)
+    return ops + _stale_file_ops(
+        f'{DATA_PREFIX}/{shards.BACKLINKS_DIR}',
+        {op['path'] for op in ops},
+        legacy=[f'{DATA_PREFIX}/backlinks.json'],
     )
 
-    if result['success']:
+
+def _format_op(fmt):
+    return {
+        'path': f'{DATA_PREFIX}/{formats.FORMAT_FILE}',
+        'content': formats.format_file(fmt),
+    }
+
+
+@metrics.collected
+def publish_all(force=False):
+    """
+    Publish all research data as static JSON to the Next.js repo.
+
+    Creates/updates these files:
+        src/data/research/sources/index.json   (+ per-type shards)
+        src/data/research/threads.json
+        src/data/research/mentions.json
+        src/data/research/backlinks/index.json (+ one shard per content piece)
+        src/data/research/graph.json
+        src/data/research/format.json          (wire format + key legend)
+
+    Shards that no longer exist are deleted (see shards.py).
+
+    Files whose content matches the last publish are skipped; if none
+    changed, no commit is made (see commit_changed_files). The record
+    lists are streamed to temp files a chunk at a time (streaming.py),
+    so memory stays flat as the tables grow.
+
+    Returns:
+        dict with keys: success, commit_sha, commit_url, error, noop
+    """
+    logger.info('Starting full research data publish...')
+    fmt = formats.data_format()
+
+    with tempfile.TemporaryDirectory(prefix='research-publish-') as workdir:
+        # Stream the record lists (only public records) to temp files
+        counts = {}
+        file_ops = [_format_op(fmt)]
+        for kind in ('sources', 'threads', 'mentions'):
+            ops, counts[kind] = _stream_kind(kind, workdir, fmt)
+            file_ops += ops
+
+        # Derived files are aggregates, built in memory
+        with metrics.phase('serialize'):
+            graph = serializers.serialize_graph(metrics.timed(
+                SourceLink.objects.select_related('source')
+                .filter(source__public=True)
+                .order_by('content_type', 'content_slug')
+                .iterator(chunk_size=CHUNK_SIZE),
+                'query',
+            ))
+            graph_op = {'path': f'{DATA_PREFIX}/graph.json', 'content': formats.encode(graph, fmt)}
+        with metrics.phase('compress'):
+            file_ops += [graph_op, *precompress.sibling_ops([graph_op], workdir)]
+        file_ops += _backlink_ops(workdir, fmt)
+
+        # Commit the changed files atomically and write the audit log
+        total_records = sum(counts.values()) + len(graph['edges'])
+        result = commit_changed_files(
+            file_ops,
+            commit_message=(
+                f"data(research): publish {counts['sources']} sources, "
+                f"{counts['threads']} threads, {counts['mentions']} mentions"
+            ),
+            data_type='full',
+            record_count=total_records,
+            force=force,
+        )
+
+    if result.get('noop'):
+        logger.info('Full publish: no changes since the last publish.')
+    elif result['success']:
         logger.info(
             'Full publish: %s sources, %s threads, %s mentions. Commit: %s',
-            len(sources), len(threads), len(mentions),
+            counts['sources'], counts['threads'], counts['mentions'],
             result['commit_sha'][:8],
         )
+        _warm_graph_snapshots()
     else:
         logger.error('Full publish failed: %s', result['error'])
 
     return result
 
 
-def publish_only(kind):
+def _warm_graph_snapshots():
+    """
+    Pre-render the Paper Trail graph snapshots for the new data version.
+
+    Layout is the slow part of a snapshot. The rendered images are
+    stored in the database, so the web process serves them without a
+    layout and the first explorer request after a publish stays fast.
+    Failures are logged and never fail the publish.
+    """
+    from apps.paper_trail.snapshot import warm_snapshots
+
+    try:
+        version = warm_snapshots()
+        logger.info('Graph snapshots rendered for version %s', version)
+    except Exception:
+        logger.exception('Graph snapshot rendering failed')
+
+
+@metrics.collected
+def publish_only(kind, force=False):
     """
     Publish a single data type to the Next.js repo.
 
     Args:
         kind: one of 'sources', 'threads', 'mentions'
+        force: commit even if the content matches the last publish
 
     Returns:
-        dict with keys: success, commit_sha, commit_url, error
+        dict with keys: success, commit_sha, commit_url, error, noop
     """
     logger.info('Publishing %s only...', kind)
 
-    if kind == 'sources':
-        sources = list(
-            Source.objects.public()
-            .annotate(link_count=Count('links'))
-            .order_by('title')
-        )
-        content = serializers.to_json([
-            serializers.serialize_source(s) for s in sources
-        ])
-        file_ops = [{'path': f'{DATA_PREFIX}/sources.json', 'content': content}]
-        data_type = 'sources'
-        record_count = len(sources)
-        commit_msg = f'data(research): publish {len(sources)} sources'
-
-    elif kind == 'threads':
-        threads = list(
-            ResearchThread.objects.public()
-            .prefetch_related('entries', 'entries__source')
-            .order_by('-started_date')
-        )
-        content = serializers.to_json([
-            serializers.serialize_thread(t) for t in threads
-        ])
-        file_ops = [{'path': f'{DATA_PREFIX}/threads.json', 'content': content}]
-        data_type = 'threads'
-        record_count = len(threads)
-        commit_msg = f'data(research): publish {len(threads)} threads'
-
-    elif kind == 'mentions':
-        mentions = list(
-            Mention.objects.public()
-            .select_related('mention_source')
-            .order_by('-created_at')
-        )
-        content = serializers.to_json([
-            serializers.serialize_mention(m) for m in mentions
-        ])
-        file_ops = [{'path': f'{DATA_PREFIX}/mentions.json', 'content': content}]
-        data_type = 'mentions'
-        record_count = len(mentions)
-        commit_msg = f'data(research): publish {len(mentions)} mentions'
-
-    else:
+    if kind != 'sources' and kind not in _STREAMED_KINDS:
         return {'success': False, 'error': f'Unknown data type: {kind}'}
 
-    result = publish_files(file_ops, commit_message=commit_msg)
-
-    PublishLog.objects.create(
-        data_type=data_type,
-        record_count=record_count,
-        commit_sha=result.get('commit_sha', ''),
-        commit_url=result.get('commit_url', ''),
-        success=result['success'],
-        error_message=result.get('error', ''),
-    )
+    fmt = formats.data_format()
+    with tempfile.TemporaryDirectory(prefix='research-publish-') as workdir:
+        ops, record_count = _stream_kind(kind, workdir, fmt)
+        file_ops = [_format_op(fmt), *ops]
+        result = commit_changed_files(
+            file_ops,
+            commit_message=f'data(research): publish {record_count} {kind}',
+            data_type=kind,
+            record_count=record_count,
+            force=force,
+        )
 
-    if result['success']:
+    if result.get('noop'):
+        logger.info('%s unchanged since the last publish.', kind)
+    elif result['success']:
         logger.info('%s published: %s records. Commit: %s',
                     kind, record_count, result['commit_sha'][:8])
     else:
@@ -204,71 +364,129 @@ def publish_only(kind):
     return result
 
 
-def publish_trail(slug):
-    """
-    Publish a per-slug research trail to the Next.js repo.
+def trail_path(slug):
+    return f'{DATA_PREFIX}/trails/{slug}.json'
+
+
+def _serialize_trail_source(lnk):
+    return {
+        'id': lnk.source.id,
+        'title': lnk.source.title,
+        'slug': lnk.source.slug,
+        'creator': lnk.source.creator,
+        'sourceType': lnk.source.source_type,
+        'url': lnk.source.url,
+        'publication': lnk.source.publication,
+        'publicAnnotation': lnk.source.public_annotation,
+        'role': lnk.role,
+        'keyQuote': lnk.key_quote,
+    }
+
+
+def _serialize_trail_thread(thread):
+    return {
+        'title': thread.title,
+        'slug': thread.slug,
+        'description': thread.description,
+        'status': thread.status,
+        'startedDate': (
+            thread.started_date.isoformat()
+            if thread.started_date else None
+        ),
+        'entries': [
+            {
+                'entryType': e.entry_type,
+                'date': e.date.isoformat(),
+                'title': e.title,
+                'description': e.description,
+                'sourceTitle': e.source.title if e.source else '',
+            }
+            for e in thread.entries.all()
+        ],
+    }
+
+
+def _serialize_trail_mention(m):
+    return {
+        'sourceUrl': m.source_url,
+        'sourceTitle': m.source_title,
+        'sourceExcerpt': m.source_excerpt,
+        'sourceAuthor': m.source_author,
+        'mentionType': m.mention_type,
+        'featured': m.featured,
+        'mentionSourceName': (
+            m.mention_source.name if m.mention_source else ''
+        ),
+        'mentionSourceAvatar': (
+            m.mention_source.avatar_url if m.mention_source else ''
+        ),
+        'createdAt': m.created_at.isoformat(),
+    }
 
-    Creates/updates src/data/research/trails/<slug>.json with sources,
-    backlinks, thread, and mentions aggregated for that content piece.
-    This is the static equivalent of GET /api/v1/trail/<slug>/.
 
-    Args:
-        slug: content slug (essay or field note)
+def all_trail_slugs():
+    """Every slug that has a trail: linked content, thread results, mention targets."""
+    slugs = set(SourceLink.objects.values_list('content_slug', flat=True))
+    slugs.update(
+        ResearchThread.objects.public()
+        .exclude(resulting_essay_slug='')
+        .values_list('resulting_essay_slug', flat=True)
+    )
+    slugs.update(Mention.objects.public().values_list('target_slug', flat=True))
+    slugs.discard('')
+    return slugs
 
-    Returns:
-        dict with keys: success, commit_sha, commit_url, error
+
+def build_trails(slugs):
     """
-    logger.info('Publishing trail for %s...', slug)
+    Build research trail dicts for many content slugs at once.
+
+    Each trail holds the sources, backlinks, thread, and mentions for
+    one content piece: the static equivalent of GET /api/v1/trail/<slug>/.
+    Uses five queries in total however many slugs are given (backlinks
+    are computed in memory from the links of every source the slugs
+    cite), instead of five or more per slug.
 
-    content_type = detect_content_type(slug)
+    Returns:
+        dict mapping slug -> trail dict
+    """
+    slugs = set(slugs)
 
-    # Sources linked to this content (public only at DB level)
-    links = (
+    # Every link to a source that any of the slugs cites. Ordered like
+    # SourceLink's default ordering so backlinks come out in the same
+    # order get_backlinks() produces.
+    related_links = list(
         SourceLink.objects
         .filter(
-            content_type=content_type,
-            content_slug=slug,
-            source__public=True,
+            source_id__in=SourceLink.objects
+            .filter(content_slug__in=slugs)
+            .values('source_id'),
         )
         .select_related('source')
-        .order_by('role', 'source__title')
+        .order_by('content_type', 'content_slug', 'pk')
     )
-    sources_data = [
-        {
-            'id': lnk.source.id,
-            'title': lnk.source.title,
-            'slug': lnk.source.slug,
-            'creator': lnk.source.creator,
-            'sourceType': lnk.source.source_type,
-            'url': lnk.source.url,
-            'publication': lnk.source.publication,
-            'publicAnnotation': lnk.source.public_annotation,
-            'role': lnk.role,
-            'keyQuote': lnk.key_quote,
-        }
-        for lnk in links
-    ]
-
-    # Backlinks
-    backlinks_raw = get_backlinks(content_type, slug)
-    backlinks_data = [
-        {
-            'contentType': bl['content_type'],
-            'contentSlug': bl['content_slug'],
-            'contentTitle': bl.get('content_title', ''),
-            'sharedSources': [
-                {'sourceId': s['source_id'], 'sourceTitle': s['source_title']}
-                for s in bl['shared_sources']
-            ],
-        }
-        for bl in backlinks_raw
-    ]
+    links_by_source = defaultdict(list)
+    sources_by_content = defaultdict(set)
+    for position, lnk in enumerate(related_links):
+        lnk._position = position
+        links_by_source[lnk.source_id].append(lnk)
+        sources_by_content[(lnk.content_type, lnk.content_slug)].add(lnk.source_id)
+
+    # Public sources per slug, in trail order
+    public_links = defaultdict(list)
+    for lnk in (
+        SourceLink.objects
+        .filter(content_slug__in=slugs, source__public=True)
+        .select_related('source')
+        .order_by('content_slug', 'role', 'source__title')
+    ):
+        public_links[(lnk.content_type, lnk.content_slug)].append(lnk)
 
-    # Research thread (if this slug is the resulting essay)
-    thread_data = None
-    thread = (
+    # First public thread (default ordering) per resulting slug
+    threads = {}
+    for thread in (
         ResearchThread.objects.public()
-        .filter(resulting_essay_slug=slug)
+        .filter(resulting_essay_slug__in=slugs)
         .prefetch_related(
             Prefetch(
                 'entries',
@@ -279,77 +497,230 @@ def publish_trail(slug):
                 ),
             )
         )
-        .first()
-    )
-    if thread:
-        thread_data = {
-            'title': thread.title,
-            'slug': thread.slug,
-            'description': thread.description,
-            'status': thread.status,
-            'startedDate': (
-                thread.started_date.isoformat()
-                if thread.started_date else None
-            ),
-            'entries': [
-                {
-                    'entryType': e.entry_type,
-                    'date': e.date.isoformat(),
-                    'title': e.title,
-                    'description': e.description,
-                    'sourceTitle': e.source.title if e.source else '',
-                }
-                for e in thread.entries.all()
-            ],
-        }
-
-    # Verified, public mentions
-    mentions = list(
+    ):
+        threads.setdefault(thread.resulting_essay_slug, thread)
+
+    # Latest 20 public mentions per slug
+    mentions = defaultdict(list)
+    for m in (
         Mention.objects.public()
-        .filter(target_slug=slug)
+        .filter(target_slug__in=slugs)
         .select_related('mention_source')
-        .order_by('-created_at')[:20]
-    )
-    mentions_data = [
-        {
-            'sourceUrl': m.source_url,
-            'sourceTitle': m.source_title,
-            'sourceExcerpt': m.source_excerpt,
-            'sourceAuthor': m.source_author,
-            'mentionType': m.mention_type,
-            'featured': m.featured,
-            'mentionSourceName': (
-                m.mention_source.name if m.mention_source else ''
-            ),
-            'mentionSourceAvatar': (
-                m.mention_source.avatar_url if m.mention_source else ''
+        .order_by('-created_at')
+    ):
+        if len(mentions[m.target_slug]) < 20:
+            mentions[m.target_slug].append(m)
+
+    trails = {}
+    for slug in slugs:
+        # Same rule as detect_content_type()
+        content_type = 'essay' if ('essay', slug) in sources_by_content else 'field_note'
+
+        backlinks = {}
+        shared_links = sorted(
+            (
+                lnk
+                for source_id in sources_by_content.get((content_type, slug), ())
+                for lnk in links_by_source[source_id]
+                if (lnk.content_type, lnk.content_slug) != (content_type, slug)
             ),
-            'createdAt': m.created_at.isoformat(),
-        }
-        for m in mentions
-    ]
+            key=lambda lnk: lnk._position,
+        )
+        for lnk in shared_links:
+            entry = backlinks.setdefault(
+                (lnk.content_type, lnk.content_slug),
+                {
+                    'contentType': lnk.content_type,
+                    'contentSlug': lnk.content_slug,
+                    'contentTitle': '',
+                    'sharedSources': [],
+                },
+            )
+            entry['contentTitle'] = lnk.content_title
+            entry['sharedSources'].append({
+                'sourceId': lnk.source_id,
+                'sourceTitle': lnk.source.title,
+            })
+
+        thread = threads.get(slug)
+        trails[slug] = serializers.serialize_trail(
+            slug,
+            content_type,
+            [_serialize_trail_source(lnk) for lnk in public_links[(content_type, slug)]],
+            list(backlinks.values()),
+            _serialize_trail_thread(thread) if thread else None,
+            [_serialize_trail_mention(m) for m in mentions[slug]],
+        )
+
+    return trails
+
 
-    # Build trail JSON
-    trail = serializers.serialize_trail(
-        slug, content_type, sources_data, backlinks_data,
-        thread_data, mentions_data,
+def build_trail(slug):
+    """Build the research trail dict for one content slug (see build_trails)."""
+    return build_trails([slug])[slug]
+
+
+def _trail_is_empty(trail):
+    return not (
+        trail['sources'] or trail['backlinks']
+        or trail['thread'] or trail['mentions']
     )
-    trail_json = serializers.to_json(trail)
 
-    file_ops = [{
-        'path': f'{DATA_PREFIX}/trails/{slug}.json',
-        'content': trail_json,
-    }]
 
-    result = publish_files(
+@metrics.collected
+def publish_trail(slug, force=False):
+    """
+    Publish a per-slug research trail to the Next.js repo.
+
+    Creates/updates src/data/research/trails/<slug>.json (see build_trail).
+
+    Args:
+        slug: content slug (essay or field note)
+        force: commit even if the content matches the last publish
+
+    Returns:
+        dict with keys: success, commit_sha, commit_url, error, noop
+    """
+    logger.info('Publishing trail for %s...', slug)
+
+    with metrics.phase('query'):
+        trail = build_trail(slug)
+    with metrics.phase('serialize'):
+        file_ops = [{
+            'path': trail_path(slug),
+            'content': serializers.to_json(trail),
+        }]
+
+    result = commit_changed_files(
         file_ops,
         commit_message=f'data(research): publish trail for {slug}',
+        data_type='trail',
+        record_count=len(trail['sources']) + len(trail['mentions']),
+        force=force,
     )
 
-    if result['success']:
+    if result.get('noop'):
+        logger.info('Trail for %s unchanged since the last publish.', slug)
+    elif result['success']:
         logger.info('Trail published for %s. Commit: %s',
                     slug, result['commit_sha'][:8])
     else:
         logger.error('Trail publish failed for %s: %s', slug, result['error'])
 
     return result
+
+
+@metrics.collected
+def publish_changed_trails(force=False):
+    """
+    Republish only the trail files affected by edits since the last run.
+
+    Reads the ChangeEvents recorded after the cursor stored on the last
+    successful run, maps them to trail slugs (see dependencies), rebuilds
+    those trails and commits every changed file in one tree commit. A
+    slug left with no sources, backlinks, thread or mentions has its
+    trail file deleted. The first run starts from cursor 0 and so
+    covers every trail.
+
+    Returns:
+        dict with keys: success, commit_sha, commit_url, error, noop, slugs
+    """
+    last_run = (
+        PublishLog.objects
+        .filter(data_type='trails', success=True, change_cursor__isnull=False)
+        .order_by('-change_cursor')
+        .first()
+    )
+    since = last_run.change_cursor if last_run else 0
+    # Settled events only: a lower id committing later would otherwise
+    # fall behind the stored cursor and never be republished.
+    head = settled_events().aggregate(head=Max('id'))['head'] or since
+
+    events = ChangeEvent.objects.filter(id__gt=since, id__lte=head)
+    slugs = sorted(affected_trail_slugs(events))
+    logger.info(
+        'Changed trails: events %s..%s affect %s trails', since, head, len(slugs),
+    )
+
+    with metrics.phase('query'):
+        trails = build_trails(slugs)
+    file_ops = []
+    record_count = 0
+    for slug in slugs:
+        trail = trails[slug]
+        record_count += len(trail['sources']) + len(trail['mentions'])
+        file_ops.append({
+            'path': trail_path(slug),
+            'content': None if _trail_is_empty(trail) else serializers.to_json(trail),
+        })
+
+    result = commit_changed_files(
+        file_ops,
+        commit_message=f'data(research): republish {len(slugs)} changed trails',
+        data_type='trails',
+        record_count=record_count,
+        force=force,
+        change_cursor=head,
+    )
+    result['slugs'] = slugs
+
+    if result.get('noop'):
+        logger.info('Changed trails: nothing to commit.')
+    elif result['success']:
+        logger.info('Changed trails published. Commit: %s', result['commit_sha'][:8])
+    else:
+        logger.error('Changed trails publish failed: %s', result['error'])
+
+    return result
+
+
+@metrics.collected
+def publish_all_trails(force=False):
+    """
+    Publish every trail file in one atomic commit.
+
+    Trails are built together by build_trails() and committed as one
+    tree (one Vercel build). Files matching the manifest are skipped,
+    and trail files in the manifest whose slug no longer has a trail are
+    deleted. Advances the changed-trails cursor, since every trail is
+    now current.
+
+    Returns:
+        dict with keys: success, commit_sha, commit_url, error, noop, slugs
+    """
+    # Settled only, as in publish_changed_trails(); later events are simply
+    # seen again by the next changed-trails run.
+    head = settled_events().aggregate(head=Max('id'))['head'] or 0
+    slugs = sorted(all_trail_slugs())
+    logger.info('Publishing all %s trails...', len(slugs))
+
+    with metrics.phase('query'):
+        trails = build_trails(slugs)
+    file_ops = [
+        {'path': trail_path(slug), 'content': serializers.to_json(trails[slug])}
+        for slug in slugs
+        if not _trail_is_empty(trails[slug])
+    ]
+    current = {op['path'] for op in file_ops}
+    file_ops += _stale_file_ops(f'{DATA_PREFIX}/trails', current)
+
+    result = commit_changed_files(
+        file_ops,
+        commit_message=f'data(research): publish {len(current)} trails',
+        data_type='trails',
+        record_count=sum(
+            len(t['sources']) + len(t['mentions']) for t in trails.values()
+        ),
+        force=force,
+        change_cursor=head,
+    )
+    result['slugs'] = slugs
+
+    if result.get('noop'):
+        logger.info('All trails: nothing to commit.')
+    elif result['success']:
+        logger.info('All trails published. Commit: %s', result['commit_sha'][:8])
+    else:
+        logger.error('All trails publish failed: %s', result['error'])
+
+    return result
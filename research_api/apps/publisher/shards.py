@@ -0,0 +1,107 @@
+"""
+Sharded layout for the large research data files.
+
+Instead of one sources.json and one backlinks.json that every consumer
+has to load whole, the publisher writes small shards plus an index per
+section (paths relative to src/data/research/):
+
+  sources/index.json           shard list: sourceType, path, sha, count
+  sources/<type>/<bucket>.json sources of one type whose id falls in
+                               [bucket * SOURCE_BUCKET_SIZE, next bucket)
+  backlinks/index.json         "content_type:slug" -> {path, sha}
+  backlinks/<type>/<slug>.json backlinks of one content piece
+
+Sources are bucketed by id rather than by position so that adding or
+removing a source never moves other sources between shards: an edit
+changes one shard and the index, and commit_changed_files skips the
+rest. The sha in each index entry is the shard's git blob SHA, so a
+client can cache shards by content.
+
+Shards are written in the configured data format (formats.py); the
+indexes are always pretty JSON. Functions here return paths relative to
+the data directory; the publisher prefixes them with DATA_PREFIX.
+"""
+
+from itertools import groupby
+
+from . import formats, serializers
+from .manifest import op_blob_sha
+from .streaming import stream_file_op
+
+SOURCES_DIR = 'sources'
+BACKLINKS_DIR = 'backlinks'
+INDEX_NAME = 'index.json'
+
+# Width of the id range stored in one source shard
+SOURCE_BUCKET_SIZE = 1000
+
+
+def source_shard_path(source_type, bucket):
+    return f'{SOURCES_DIR}/{source_type or "other"}/{bucket}.json'
+
+
+def backlink_shard_path(key):
+    content_type, _, slug = key.partition(':')
+    return f'{BACKLINKS_DIR}/{content_type}/{slug}.json'
+
+
+def source_shard_ops(sources, prefix, workdir, fmt='pretty'):
+    """
+    Stream sources into per-type, per-id-bucket shard files.
+
+    Args:
+        sources: iterator of Sources ordered by (source_type, id)
+        prefix: repo directory the relative shard paths go under
+        workdir: temp directory for the shard files
+        fmt: data format for the shards (see formats.py)
+
+    Returns:
+        (file_ops, record_count), the ops including sources/index.json
+    """
+    ops = []
+    shards = []
+    total = 0
+    by_shard = groupby(
+        sources, key=lambda s: (s.source_type, s.id // SOURCE_BUCKET_SIZE),
+    )
+    for (source_type, bucket), group in by_shard:
+        path = source_shard_path(source_type, bucket)
+        op, count = stream_file_op(
+            f'{prefix}/{path}', workdir, group, serializers.serialize_source, fmt,
+        )
+        ops.append(op)
+        shards.append({
+            'sourceType': source_type,
+            'path': path,
+            'sha': op['sha'],
+            'count': count,
+        })
+        total += count
+
+    index = {'count': total, 'shards': shards}
+    ops.append({
+        'path': f'{prefix}/{SOURCES_DIR}/{INDEX_NAME}',
+        'content': serializers.to_json(index),
+    })
+    return ops, total
+
+
+def backlink_shard_ops(backlink_graph, prefix, fmt='pretty'):
+    """
+    One file per content key from get_all_backlinks(), plus the index.
+
+    Returns a list of file ops including backlinks/index.json.
+    """
+    ops = []
+    index = {}
+    for key, links in sorted(serializers.serialize_backlinks(backlink_graph).items()):
+        path = backlink_shard_path(key)
+        op = {'path': f'{prefix}/{path}', 'content': formats.encode(links, fmt)}
+        ops.append(op)
+        index[key] = {'path': path, 'sha': op_blob_sha(op)}
+
+    ops.append({
+        'path': f'{prefix}/{BACKLINKS_DIR}/{INDEX_NAME}',
+        'content': serializers.to_json(index),
+    })
+    return ops
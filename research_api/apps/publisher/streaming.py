@@ -0,0 +1,130 @@
+"""
+Streaming JSON writer for the large research data files.
+
+to_json() needs the whole document in memory three times over: the list
+of model instances, the list of serialized dicts, and the final string.
+write_json_array() instead walks a queryset iterator, encodes one record
+at a time and writes it straight to a temporary file, so memory holds a
+single fetch chunk of instances no matter how many records there are.
+
+The output is byte-identical to formats.encode(list, fmt): for the
+default pretty format that is to_json(list) (indent=2, UTF-8 without
+ASCII escaping, trailing newline), so switching a file over changes
+neither its published content nor its manifest SHA. The columnar format
+spools each column to its own temp file and stitches them together at
+the end, so it streams too.
+
+A git blob SHA hashes a "blob <size>\\0" header ahead of the content and
+the size is only known once the last record is written, so
+file_blob_sha() takes a second sequential pass over the file in
+fixed-size reads.
+
+Streamed files become file ops of the form
+    {'path': <repo path>, 'file': <local path>, 'sha': <blob SHA>}
+which the manifest compares without opening the file, the local_git
+backend hands to git hash-object as-is, and github.py uploads as a
+streamed base64 request body.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from .formats import COMPACT, shorten
+
+# Model instances fetched per database round-trip
+CHUNK_SIZE = 2000
+
+# Bytes per read; a multiple of 3 so base64 chunks concatenate cleanly
+READ_SIZE = 3 * 16384
+
+
+def write_json_array(records, serialize, fh, fmt='pretty'):
+    """
+    Write [serialize(r) for r in records] to a text file as
+    formats.encode() would in fmt.
+
+    Returns the number of records written.
+    """
+    if fmt == 'minified':
+        return _write_minified(records, serialize, fh)
+    if fmt == 'columnar':
+        return _write_columnar(records, serialize, fh)
+
+    count = 0
+    for record in records:
+        text = json.dumps(serialize(record), indent=2, ensure_ascii=False)
+        # JSON escapes newlines inside strings, so every literal newline
+        # is structural and takes one extra level of indentation.
+        fh.write('[\n  ' if count == 0 else ',\n  ')
+        fh.write(text.replace('\n', '\n  '))
+        count += 1
+    fh.write('\n]\n' if count else '[]\n')
+    return count
+
+
+def _write_minified(records, serialize, fh):
+    count = 0
+    for record in records:
+        fh.write('[' if count == 0 else ',')
+        fh.write(json.dumps(shorten(serialize(record)), **COMPACT))
+        count += 1
+    fh.write(']\n' if count else '[]\n')
+    return count
+
+
+def _write_columnar(records, serialize, fh):
+    # Each spool holds ",value" per record so far; a column first seen
+    # at record n is backfilled with n nulls, and a record without the
+    # key adds a null, as formats.to_columns() does.
+    spools = {}
+    count = 0
+    try:
+        for record in records:
+            data = serialize(record)
+            for key in spools.keys() - data.keys():
+                spools[key].write(',null')
+            for key, value in data.items():
+                spool = spools.get(key)
+                if spool is None:
+                    spool = spools[key] = tempfile.TemporaryFile('w+', encoding='utf-8')
+                    spool.write(',null' * count)
+                spool.write(',' + json.dumps(value, **COMPACT))
+            count += 1
+
+        fh.write('{')
+        for i, (key, spool) in enumerate(spools.items()):
+            fh.write((',' if i else '') + json.dumps(key, **COMPACT) + ':[')
+            spool.seek(0)
+            spool.read(1)  # the first value's leading comma
+            shutil.copyfileobj(spool, fh, READ_SIZE)
+            fh.write(']')
+        fh.write('}\n')
+    finally:
+        for spool in spools.values():
+            spool.close()
+    return count
+
+
+def file_blob_sha(path):
+    """Git blob SHA-1 of a file's bytes, read in READ_SIZE chunks."""
+    digest = hashlib.sha1(f'blob {os.path.getsize(path)}\0'.encode('ascii'))
+    with open(path, 'rb') as fh:
+        while chunk := fh.read(READ_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stream_file_op(repo_path, workdir, records, serialize, fmt='pretty'):
+    """
+    Serialize records into a temp file under workdir in fmt.
+
+    Returns (file_op, record_count).
+    """
+    local_path = os.path.join(workdir, repo_path.replace('/', '__'))
+    with open(local_path, 'w', encoding='utf-8', newline='') as fh:
+        count = write_json_array(records, serialize, fh, fmt)
+    op = {'path': repo_path, 'file': local_path, 'sha': file_blob_sha(local_path)}
+    return op, count
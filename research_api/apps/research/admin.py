@@ -6,16 +6,22 @@ to essays/field notes should be fast and require minimal clicks.
 """
 
 from django.contrib import admin
+from django.db import transaction
 from django.db.models import Count
+from django.utils import timezone
 
 from .models import (
     ConnectionSuggestion,
     ResearchThread,
+    ReviewStatus,
     Source,
     SourceLink,
+    SourceMergeSuggestion,
     SourceSuggestion,
     ThreadEntry,
 )
+from .moderation import promote_suggestions, set_review_status
+from .services import merge_sources
 
 
 # ---------------------------------------------------------------------------
@@ -212,59 +218,25 @@ class SourceSuggestionAdmin(admin.ModelAdmin):
 
     @admin.action(description='Promote selected to Source (approve and create)')
     def promote_to_source(self, request, queryset):
-        """Create a real Source + SourceLink from each selected suggestion.
+        """Create real Sources + SourceLinks from the selected suggestions.
 
-        This is the one-click approval flow. It creates the Source with
-        the contributor's information preserved in the public annotation,
-        links it to the target content, and marks the suggestion as approved.
+        This is the one-click approval flow. Suggestions whose URL already
+        belongs to a Source are linked to it; the rest become new Sources
+        with the contributor's information preserved in the public
+        annotation. The whole selection is promoted in one transaction.
         """
-        from django.utils import timezone
-
-        promoted = 0
-        for suggestion in queryset.filter(status='pending'):
-            # Create the Source
-            source = Source.objects.create(
-                title=suggestion.title,
-                source_type=suggestion.source_type,
-                url=suggestion.url,
-                date_encountered=suggestion.created_at.date(),
-                public_annotation=(
-                    f'Suggested by {suggestion.contributor_name}: '
-                    f'{suggestion.relevance_note}'
-                ),
-                tags=['community-suggested'],
-                public=True,
-            )
-
-            # Create the SourceLink
-            SourceLink.objects.create(
-                source=source,
-                content_type=suggestion.target_content_type,
-                content_slug=suggestion.target_slug,
-                role='reference',
-                notes=f'Community contribution by {suggestion.contributor_name}',
-            )
-
-            # Update the suggestion
-            suggestion.status = 'approved'
-            suggestion.reviewed_at = timezone.now()
-            suggestion.promoted_source = source
-            suggestion.save()
-            promoted += 1
-
+        result = promote_suggestions(queryset)
         self.message_user(
             request,
-            f'Promoted {promoted} suggestions to Sources.',
+            f"Promoted {result['promoted']} suggestions "
+            f"({result['sources_created']} new sources, "
+            f"{result['sources_reused']} existing, "
+            f"{result['links_created']} links).",
         )
 
     @admin.action(description='Reject selected suggestions')
     def reject_suggestions(self, request, queryset):
-        from django.utils import timezone
-
-        count = queryset.filter(status='pending').update(
-            status='rejected',
-            reviewed_at=timezone.now(),
-        )
+        count = set_review_status(queryset, ReviewStatus.REJECTED)
         self.message_user(request, f'Rejected {count} suggestions.')
 
 
@@ -281,20 +253,67 @@ class ConnectionSuggestionAdmin(admin.ModelAdmin):
 
     @admin.action(description='Approve selected connections')
     def approve_connections(self, request, queryset):
-        from django.utils import timezone
-
-        count = queryset.filter(status='pending').update(
-            status='approved',
-            reviewed_at=timezone.now(),
-        )
+        count = set_review_status(queryset, ReviewStatus.APPROVED)
         self.message_user(request, f'Approved {count} connections.')
 
     @admin.action(description='Reject selected connections')
     def reject_connections(self, request, queryset):
-        from django.utils import timezone
-
-        count = queryset.filter(status='pending').update(
-            status='rejected',
-            reviewed_at=timezone.now(),
-        )
+        count = set_review_status(queryset, ReviewStatus.REJECTED)
         self.message_user(request, f'Rejected {count} connections.')
+
+
+# ---------------------------------------------------------------------------
+# Duplicate review
+# ---------------------------------------------------------------------------
+
+
+@admin.register(SourceMergeSuggestion)
+class SourceMergeSuggestionAdmin(admin.ModelAdmin):
+    """Review queue filled by the find_duplicate_sources command.
+
+    Merging keeps the older source and folds the duplicate's links,
+    thread entries and tags into it.
+    """
+
+    list_display = ['duplicate', 'duplicate_title', 'source', 'reason', 'score', 'status', 'created_at']
+    list_filter = ['status', 'reason']
+    search_fields = ['source__title', 'duplicate__title', 'duplicate_title']
+    raw_id_fields = ['source', 'duplicate']
+    list_select_related = ['source', 'duplicate']
+    actions = ['merge_selected', 'reject_suggestions']
+
+    @admin.action(description='Merge selected duplicates into the kept source')
+    def merge_selected(self, request, queryset):
+        merged = 0
+        for pk in list(queryset.filter(status='pending').values_list('pk', flat=True)):
+            # An earlier merge in this batch may have deleted either side,
+            # so re-fetch each one.
+            suggestion = (
+                SourceMergeSuggestion.objects
+                .select_related('source', 'duplicate')
+                .filter(pk=pk, status=ReviewStatus.PENDING, duplicate__isnull=False)
+                .first()
+            )
+            if suggestion is None:
+                continue
+            with transaction.atomic():
+                duplicate = suggestion.duplicate
+                # Pending suggestions to merge it elsewhere are moot (those
+                # keeping it cascade with it)
+                SourceMergeSuggestion.objects.filter(
+                    status=ReviewStatus.PENDING, duplicate=duplicate,
+                ).exclude(pk=suggestion.pk).delete()
+                merge_sources(suggestion.source, duplicate)
+                SourceMergeSuggestion.objects.filter(pk=suggestion.pk).update(
+                    status=ReviewStatus.APPROVED,
+                    reviewed_at=timezone.now(),
+                    duplicate_title=duplicate.title,
+                )
+            merged += 1
+
+        self.message_user(request, f'Merged {merged} duplicate sources.')
+
+    @admin.action(description='Reject selected suggestions (not duplicates)')
+    def reject_suggestions(self, request, queryset):
+        count = set_review_status(queryset, ReviewStatus.REJECTED)
+        self.message_user(request, f'Rejected {count} suggestions.')
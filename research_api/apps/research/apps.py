@@ -0,0 +1,20 @@
+from django.apps import AppConfig
+
+
+class ResearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.research'
+    verbose_name = 'Research'
+
+    def ready(self):
+        from apps.core.changes import track_changes
+
+        from .models import ResearchThread, Source, SourceLink, ThreadEntry
+
+        track_changes(Source, 'source', ['slug'])
+        track_changes(SourceLink, 'sourcelink', ['source_id', 'content_type', 'content_slug'])
+        track_changes(ResearchThread, 'thread', ['slug', 'resulting_essay_slug'])
+        track_changes(ThreadEntry, 'threadentry', ['thread_id', 'source_id', 'field_note_slug'])
+
+        # After track_changes, so a parent's event precedes its children's
+        from . import signals  # noqa: F401
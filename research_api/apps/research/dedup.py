@@ -0,0 +1,255 @@
+"""
+Near-duplicate detection for Sources.
+
+promote_source and import_essay_sources only catch exact URL or slug
+matches, so the same book or article can enter the database several
+times ("The Death and Life of Great American Cities" vs "Death & Life
+of Great American Cities", or the same URL with utm_ parameters).
+
+Comparing every pair of sources is O(n^2). Instead, candidates are
+grouped into blocks and only compared within a block:
+
+  1. URL blocks: sources whose normalized URLs are identical.
+  2. Title blocks: MinHash signatures over character trigrams of the
+     title, split into LSH bands. Two titles land in the same bucket of
+     some band with high probability when their trigram sets overlap
+     strongly, and almost never when they don't.
+
+Candidate pairs from title blocks are then verified with the exact
+Jaccard similarity of their trigram sets. Everything here is pure
+computation over (id, title, normalized_url) tuples; the ORM side lives
+in the find_duplicate_sources command and services.merge_sources.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from itertools import combinations
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import numpy as np
+
+# Query parameters that identify a click, not a resource
+_TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid',
+    'mc_cid', 'mc_eid', '_hsenc', '_hsmi', 'ref', 'ref_src', 'ref_url',
+    'si', 'spm',
+}
+_TRACKING_PREFIXES = ('utm_',)
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# MinHash / LSH parameters. 16 bands of 4 rows puts the 50% detection
+# point near a trigram Jaccard of 0.5, below the default verification
+# threshold, so few true duplicates are missed.
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+DEFAULT_THRESHOLD = 0.7
+
+# Buckets bigger than this are generic titles ("Introduction", "Home")
+# and would produce quadratic candidate lists without useful matches.
+MAX_BUCKET_SIZE = 50
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
+
+# Documents hashed per numpy batch; bounds the (shingles x permutations)
+# intermediate array to a few tens of megabytes.
+_SIGNATURE_BATCH = 2000
+
+
+# ---------------------------------------------------------------------------
+# Normalization
+# ---------------------------------------------------------------------------
+
+
+def normalize_url(url):
+    """
+    Reduce a URL to a comparison key.
+
+    Drops the scheme, a leading "www.", default ports, the fragment,
+    tracking parameters and a trailing slash; lowercases the host and
+    sorts the remaining query parameters. Paths keep their case.
+
+        https://www.Example.com/post/?utm_source=x&b=2&a=1#top
+        -> example.com/post?a=1&b=2
+    """
+    url = (url or '').strip()
+    if not url:
+        return ''
+
+    parts = urlsplit(url if '//' in url else f'//{url}')
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port != _DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f'{host}:{port}'
+
+    path = parts.path.rstrip('/')
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in _TRACKING_PARAMS
+        and not key.lower().startswith(_TRACKING_PREFIXES)
+    )
+
+    normalized = f'{host}{path}'
+    if query:
+        normalized = f'{normalized}?{urlencode(query)}'
+    return normalized
+
+
+def normalize_title(title):
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    title = title or ''
+    if not title.isascii():
+        title = unicodedata.normalize('NFKD', title)
+        title = ''.join(c for c in title if not unicodedata.combining(c))
+    title = title.lower().replace('&', ' and ')
+    return ' '.join(_PUNCTUATION.sub(' ', title).split())
+
+
+def title_shingles(title):
+    """Set of character trigrams of the normalized title."""
+    text = normalize_title(title)
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+# ---------------------------------------------------------------------------
+# MinHash
+# ---------------------------------------------------------------------------
+
+
+def minhash_signatures(texts, num_perm=NUM_PERMUTATIONS, seed=1):
+    """
+    MinHash signature matrix over the character trigrams of each text.
+
+    Returns an (n, num_perm) uint32 array. Texts are processed in
+    batches: each batch is joined into one codepoint array, so trigram
+    codes and their num_perm hashes are computed with numpy rather than
+    per trigram in Python. The hash family is multiply-shift
+    ((a * x + b) mod 2^64) >> 32 with odd a, which needs no modulo.
+    Texts shorter than three characters get a row of max values, which
+    only collides with other such rows (callers skip those).
+    """
+    n = len(texts)
+    signatures = np.full((n, num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, np.iinfo(np.uint64).max, num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, np.iinfo(np.uint64).max, num_perm, dtype=np.uint64)
+
+    for start in range(0, n, _SIGNATURE_BATCH):
+        batch = texts[start:start + _SIGNATURE_BATCH]
+        # NUL separates texts; a trigram touching it spans two texts
+        joined = '\0'.join(batch) + '\0'
+        codes = np.frombuffer(joined.encode('utf-32-le'), dtype=np.uint32)
+        codes = codes.astype(np.uint64)
+        if len(codes) < 3:
+            continue
+
+        valid = (codes[:-2] != 0) & (codes[1:-1] != 0) & (codes[2:] != 0)
+        if not valid.any():
+            continue
+        doc = np.cumsum(codes == 0)[:-2][valid]
+        trigrams = (
+            (codes[:-2] << np.uint64(42))
+            | (codes[1:-1] << np.uint64(21))
+            | codes[2:]
+        )[valid]
+
+        # (num_perm, trigrams) layout keeps the reduction contiguous
+        hashed = (
+            (a[:, None] * trigrams[None, :] + b[:, None]) >> np.uint64(32)
+        ).astype(np.uint32)
+        offsets = np.flatnonzero(np.concatenate(([True], doc[1:] != doc[:-1])))
+        signatures[doc[offsets] + start] = np.minimum.reduceat(hashed, offsets, axis=1).T
+
+    return signatures
+
+
+def _lsh_buckets(signatures, bands=BANDS, rows=ROWS_PER_BAND):
+    """Yield arrays of row indices that share a bucket in some band."""
+    n = len(signatures)
+    for band in range(bands):
+        chunk = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        keys = chunk.view(np.dtype((np.void, chunk.dtype.itemsize * rows))).ravel()
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        boundaries = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [n]))
+        sizes = ends - starts
+        keep = (sizes > 1) & (sizes <= MAX_BUCKET_SIZE)
+        for lo, hi in zip(starts[keep], ends[keep]):
+            yield order[lo:hi]
+
+
+# ---------------------------------------------------------------------------
+# Candidate search
+# ---------------------------------------------------------------------------
+
+
+def find_duplicate_pairs(records, threshold=DEFAULT_THRESHOLD):
+    """
+    Find likely duplicate pairs among source records.
+
+    Args:
+        records: iterable of (id, title, normalized_url) tuples
+        threshold: minimum trigram Jaccard for a title match
+
+    Returns:
+        list of (keep_id, duplicate_id, reason, score) tuples, where
+        keep_id < duplicate_id (the older record is kept), reason is
+        'url' or 'title', and score is 1.0 for URL matches or the title
+        Jaccard similarity. Each pair appears once; URL matches win.
+    """
+    records = list(records)
+    pairs = {}
+
+    # 1. Exact normalized-URL blocks
+    by_url = defaultdict(list)
+    for source_id, _title, url in records:
+        if url:
+            by_url[url].append(source_id)
+    for ids in by_url.values():
+        for a, b in combinations(sorted(ids), 2):
+            pairs[(a, b)] = ('url', 1.0)
+
+    # 2. Title blocks via MinHash LSH, verified with exact Jaccard
+    titles = [normalize_title(title) for _id, title, _url in records]
+    candidates = [i for i, text in enumerate(titles) if len(text) >= 3]
+    if len(candidates) > 1:
+        signatures = minhash_signatures([titles[i] for i in candidates])
+        shingles = {}
+        seen = set()
+        for group in _lsh_buckets(signatures):
+            for i, j in combinations(group.tolist(), 2):
+                a, b = candidates[i], candidates[j]
+                id_a, id_b = records[a][0], records[b][0]
+                key = (min(id_a, id_b), max(id_a, id_b))
+                if key in pairs or key in seen:
+                    continue
+                seen.add(key)
+                for k in (a, b):
+                    if k not in shingles:
+                        text = titles[k]
+                        shingles[k] = {text[x:x + 3] for x in range(len(text) - 2)}
+                score = jaccard(shingles[a], shingles[b])
+                if score >= threshold:
+                    pairs[key] = ('title', round(score, 4))
+
+    return [
+        (keep, duplicate, reason, score)
+        for (keep, duplicate), (reason, score) in sorted(pairs.items())
+    ]
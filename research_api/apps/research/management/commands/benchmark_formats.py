@@ -0,0 +1,107 @@
+"""
+Management command to compare the published data formats.
+
+Inserts synthetic public sources and links (the benchmark_publish
+dataset) inside a transaction that is rolled back afterwards, then
+encodes the sources list and graph.json in each format of
+apps.publisher.formats and reports, per file and format:
+
+  raw / gzip / brotli size   bytes on disk and over the wire
+  encode                     formats.encode() time
+  parse                      json.loads() time, a stand-in for the client
+
+Brotli sizes are shown only when the optional brotli package is
+installed. Nothing is committed to the repo or the database.
+
+Usage:
+    python manage.py benchmark_formats                   # 100k sources
+    python manage.py benchmark_formats --sources 20000
+"""
+
+import gzip
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.publisher import formats, serializers
+from apps.publisher.precompress import brotli
+from apps.publisher.publish import _public_sources
+from apps.research.management.commands.benchmark_publish import INSERT_BATCH, insert_sources
+from apps.research.models import Source, SourceLink
+
+# Content pieces the synthetic links point at
+CONTENT_PIECES = 500
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = 'Benchmark size and parse time of the published research data formats.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sources',
+            type=int,
+            default=100_000,
+            help='Synthetic sources to insert (default: 100000).',
+        )
+
+    def handle(self, *args, **options):
+        count = options['sources']
+
+        with transaction.atomic():
+            insert_sources(count)
+            self._insert_links()
+            documents = {
+                'sources': [serializers.serialize_source(s) for s in _public_sources()],
+                'graph.json': serializers.serialize_graph(
+                    SourceLink.objects.select_related('source')
+                    .filter(source__public=True)
+                    .order_by('content_type', 'content_slug')
+                ),
+            }
+            transaction.set_rollback(True)
+
+        kb = 1024
+        for name, data in documents.items():
+            self.stdout.write(f'\n{name}')
+            self.stdout.write(
+                f'  {"format":<10}{"raw KB":>10}{"gzip KB":>10}{"br KB":>10}'
+                f'{"encode s":>10}{"parse s":>10}'
+            )
+            baseline = None
+            for fmt in formats.FORMATS:
+                text, encode_time = _timed(formats.encode, data, fmt)
+                raw = text.encode('utf-8')
+                _parsed, parse_time = _timed(json.loads, text)
+                gz = len(gzip.compress(raw, compresslevel=9, mtime=0))
+                br = f'{len(brotli.compress(raw, quality=11)) / kb:10.0f}' if brotli else f'{"-":>10}'
+                baseline = baseline or len(raw)
+                self.stdout.write(
+                    f'  {fmt:<10}{len(raw) / kb:10.0f}{gz / kb:10.0f}{br}'
+                    f'{encode_time:10.2f}{parse_time:10.2f}'
+                    f'   ({len(raw) / baseline:.0%} of pretty)'
+                )
+
+    def _insert_links(self):
+        """One link per synthetic source, spread over CONTENT_PIECES essays."""
+        sources = Source.objects.filter(slug__startswith='benchmark-source-')
+        SourceLink.objects.bulk_create(
+            (
+                SourceLink(
+                    source_id=source_id,
+                    content_type='essay',
+                    content_slug=f'benchmark-essay-{i % CONTENT_PIECES}',
+                    content_title=f'Benchmark essay {i % CONTENT_PIECES}',
+                    role='primary',
+                )
+                for i, source_id in enumerate(sources.values_list('id', flat=True))
+            ),
+            batch_size=INSERT_BATCH,
+        )
@@ -0,0 +1,130 @@
+"""
+Management command to compare peak memory of in-memory vs streamed publishing.
+
+Inserts synthetic public sources inside a transaction that is rolled
+back afterwards, then serializes sources.json both ways:
+
+  in-memory  list(queryset) -> list of dicts -> to_json() string
+  streamed   queryset.iterator() -> temp file (apps.publisher.streaming)
+
+and reports wall time, tracemalloc peak, and whether both produce the
+same blob SHA. Nothing is committed to the repo or the database.
+
+Usage:
+    python manage.py benchmark_publish                   # 100k sources
+    python manage.py benchmark_publish --sources 20000
+"""
+
+import datetime
+import tempfile
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.publisher import serializers
+from apps.publisher.manifest import git_blob_sha
+from apps.publisher.publish import DATA_PREFIX, _public_sources
+from apps.publisher.streaming import CHUNK_SIZE, stream_file_op
+from apps.research.models import Source
+
+INSERT_BATCH = 5000
+
+
+def _measure(fn):
+    """
+    Return (result, seconds, peak bytes) for fn.
+
+    Timed on a plain run, since tracemalloc's per-allocation overhead
+    would distort it, then run again under tracemalloc for the peak.
+    """
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        fn()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def insert_sources(count):
+    """Bulk-insert count synthetic public sources (call inside a transaction)."""
+    today = datetime.date.today()
+    for start in range(0, count, INSERT_BATCH):
+        Source.objects.bulk_create([
+            Source(
+                title=f'Benchmark source {i}',
+                slug=f'benchmark-source-{i}',
+                creator=f'Author {i % 997}',
+                url=f'https://example.com/benchmark/{i}',
+                normalized_url=f'example.com/benchmark/{i}',
+                publication='Benchmark Quarterly',
+                date_encountered=today,
+                public_annotation='Synthetic record for benchmark_publish. ' * 3,
+                key_findings=['finding one', 'finding two'],
+                tags=['benchmark', f'group-{i % 50}'],
+                public=True,
+            )
+            for i in range(start, min(start + INSERT_BATCH, count))
+        ])
+
+
+class Command(BaseCommand):
+    help = 'Benchmark peak memory of in-memory vs streamed sources.json serialization.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sources',
+            type=int,
+            default=100_000,
+            help='Synthetic sources to insert (default: 100000).',
+        )
+
+    def handle(self, *args, **options):
+        count = options['sources']
+
+        with transaction.atomic():
+            insert_sources(count)
+            total = _public_sources().count()
+            self.stdout.write(f'Serializing {total} public sources...')
+
+            def in_memory():
+                sources = list(_public_sources())
+                content = serializers.to_json([
+                    serializers.serialize_source(s) for s in sources
+                ])
+                return git_blob_sha(content)
+
+            def streamed():
+                with tempfile.TemporaryDirectory(prefix='benchmark-publish-') as workdir:
+                    op, _count = stream_file_op(
+                        f'{DATA_PREFIX}/sources.json',
+                        workdir,
+                        _public_sources().iterator(chunk_size=CHUNK_SIZE),
+                        serializers.serialize_source,
+                    )
+                return op['sha']
+
+            memory_sha, memory_time, memory_peak = _measure(in_memory)
+            stream_sha, stream_time, stream_peak = _measure(streamed)
+            transaction.set_rollback(True)
+
+        mb = 1024 * 1024
+        self.stdout.write(
+            f'  in-memory: {memory_time:6.2f}s  peak {memory_peak / mb:8.1f} MB'
+        )
+        self.stdout.write(
+            f'  streamed:  {stream_time:6.2f}s  peak {stream_peak / mb:8.1f} MB'
+        )
+        if memory_sha == stream_sha:
+            self.stdout.write(self.style.SUCCESS(
+                f'Identical output ({stream_sha[:12]}); peak memory '
+                f'{memory_peak / max(stream_peak, 1):.0f}x lower when streamed.'
+            ))
+        else:
+            self.stdout.write(self.style.ERROR('Outputs differ!'))
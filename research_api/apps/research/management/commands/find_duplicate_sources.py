@@ -0,0 +1,92 @@
+"""
+Management command to find near-duplicate Sources and queue merge suggestions.
+
+Blocks sources by normalized URL and by MinHash/LSH signatures of their
+titles (see apps.research.dedup), so only sources in the same block are
+compared. New candidate pairs become pending SourceMergeSuggestion rows,
+reviewed and merged from the admin. Pairs already suggested (including
+rejected ones) are not re-created.
+
+Usage:
+    python manage.py find_duplicate_sources                  # Queue suggestions
+    python manage.py find_duplicate_sources --dry-run        # Report only
+    python manage.py find_duplicate_sources --threshold 0.8  # Stricter titles
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.research.dedup import DEFAULT_THRESHOLD, find_duplicate_pairs
+from apps.research.models import Source, SourceMergeSuggestion
+
+
+class Command(BaseCommand):
+    help = 'Find near-duplicate sources and queue merge suggestions for review.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=DEFAULT_THRESHOLD,
+            help=f'Minimum title trigram similarity (default: {DEFAULT_THRESHOLD}).',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report candidate pairs without writing suggestions.',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        records = list(
+            Source.objects
+            .order_by('id')
+            .values_list('id', 'title', 'normalized_url')
+            .iterator(chunk_size=5000)
+        )
+        loaded = time.monotonic()
+
+        pairs = find_duplicate_pairs(records, threshold=options['threshold'])
+        compared = time.monotonic()
+
+        url_pairs = sum(1 for pair in pairs if pair[2] == 'url')
+        self.stdout.write(
+            f'Scanned {len(records)} sources in {compared - started:.2f}s '
+            f'(load {loaded - started:.2f}s, compare {compared - loaded:.2f}s): '
+            f'{len(pairs)} candidate pairs '
+            f'({url_pairs} by URL, {len(pairs) - url_pairs} by title).'
+        )
+
+        if options['dry_run']:
+            titles = {source_id: title for source_id, title, _url in records}
+            for keep, duplicate, reason, score in pairs[:50]:
+                self.stdout.write(
+                    f'  {reason:5} {score:.2f}  "{titles[duplicate]}" -> '
+                    f'"{titles[keep]}"'
+                )
+            self.stdout.write(self.style.WARNING('Dry run: no suggestions written.'))
+            return
+
+        existing = set(
+            SourceMergeSuggestion.objects.values_list('source_id', 'duplicate_id')
+        )
+        new = [
+            SourceMergeSuggestion(
+                source_id=keep,
+                duplicate_id=duplicate,
+                reason=reason,
+                score=score,
+            )
+            for keep, duplicate, reason, score in pairs
+            if (keep, duplicate) not in existing
+        ]
+        SourceMergeSuggestion.objects.bulk_create(
+            new, batch_size=1000, ignore_conflicts=True,
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Queued {len(new)} new merge suggestions '
+            f'({len(pairs) - len(new)} already known).'
+        ))
@@ -20,6 +20,7 @@ from django.core.management.base import BaseCommand
 from django.db import IntegrityError
 from django.utils.text import slugify
 
+from apps.research.dedup import normalize_url
 from apps.research.models import (
     ContentType,
     LinkRole,
@@ -113,7 +114,9 @@ class Command(BaseCommand):
                 created = False
 
                 if url:
-                    source = Source.objects.filter(url=url).first()
+                    source = Source.objects.filter(
+                        normalized_url=normalize_url(url),
+                    ).first()
 
                 if not source:
                     title_slug = slugify(title)[:500]
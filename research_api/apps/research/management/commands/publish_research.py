@@ -6,12 +6,27 @@ Usage:
     python manage.py publish_research --dry-run        # Preview without committing
     python manage.py publish_research --only sources   # Single data type
     python manage.py publish_research --trail housing   # Single trail file
+    python manage.py publish_research --changed-trails # Trails affected by edits
+    python manage.py publish_research --all-trails     # Every trail, one commit
+    python manage.py publish_research --force          # Commit even if unchanged
+
+Files identical to the last publish are skipped, and nothing is
+committed when no file changed. After a successful publish, links to
+sources not seen before are queued for outbound Webmentions (sent by
+send_webmentions).
 """
 
 from django.core.management.base import BaseCommand
 
 from apps.mentions.models import Mention
-from apps.publisher.publish import publish_all, publish_only, publish_trail
+from apps.mentions.outbound import queue_new_links
+from apps.publisher.publish import (
+    publish_all,
+    publish_all_trails,
+    publish_changed_trails,
+    publish_only,
+    publish_trail,
+)
 from apps.research.models import ResearchThread, Source, SourceLink
 
 
@@ -37,6 +52,24 @@ class Command(BaseCommand):
             metavar='SLUG',
             help='Publish a single trail file for the given content slug.',
         )
+        parser.add_argument(
+            '--changed-trails',
+            action='store_true',
+            help=(
+                'Republish only the trail files affected by edits since '
+                'the last --changed-trails run, in one commit.'
+            ),
+        )
+        parser.add_argument(
+            '--all-trails',
+            action='store_true',
+            help='Publish every trail file in a single commit.',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Commit every file even if it matches the last publish.',
+        )
 
     def handle(self, *args, **options):
         # Show current counts regardless of mode
@@ -59,6 +92,14 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.WARNING(
                     f'Dry run: would publish trail for "{options["trail"]}".'
                 ))
+            elif options['all_trails']:
+                self.stdout.write(self.style.WARNING(
+                    'Dry run: would publish every trail in one commit.'
+                ))
+            elif options['changed_trails']:
+                self.stdout.write(self.style.WARNING(
+                    'Dry run: would republish trails changed since the last run.'
+                ))
             else:
                 self.stdout.write(self.style.WARNING(
                     'Dry run: would publish all data (sources, threads, '
@@ -67,20 +108,32 @@ class Command(BaseCommand):
             return
 
         # Dispatch to the right publish function
-        if options['trail']:
+        if options['all_trails']:
+            self.stdout.write('Publishing all trails...')
+            result = publish_all_trails(force=options['force'])
+            self.stdout.write(f'{len(result["slugs"])} trails built.')
+        elif options['changed_trails']:
+            self.stdout.write('Publishing changed trails...')
+            result = publish_changed_trails(force=options['force'])
+            self.stdout.write(f'{len(result["slugs"])} trails affected.')
+        elif options['trail']:
             slug = options['trail']
             self.stdout.write(f'Publishing trail for "{slug}"...')
-            result = publish_trail(slug)
+            result = publish_trail(slug, force=options['force'])
         elif options['only']:
             kind = options['only']
             self.stdout.write(f'Publishing {kind} only...')
-            result = publish_only(kind)
+            result = publish_only(kind, force=options['force'])
         else:
             self.stdout.write('Publishing all research data...')
-            result = publish_all()
+            result = publish_all(force=options['force'])
 
         # Report result
-        if result['success']:
+        if result.get('noop'):
+            self.stdout.write(self.style.SUCCESS(
+                'No changes since the last publish; nothing committed.'
+            ))
+        elif result['success']:
             self.stdout.write(self.style.SUCCESS(
                 f'Published successfully. Commit: {result["commit_sha"][:8]}'
             ))
@@ -88,3 +141,8 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR(
                 f'Publish failed: {result["error"]}'
             ))
+            return
+
+        queued = queue_new_links()
+        if queued:
+            self.stdout.write(f'Queued {queued} new link(s) for outbound Webmentions.')
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from apps.research.dedup import normalize_url
+
+
+def backfill_normalized_url(apps, schema_editor):
+    Source = apps.get_model('research', 'Source')
+    batch = []
+    for source in Source.objects.exclude(url='').only('id', 'url').iterator(chunk_size=2000):
+        source.normalized_url = normalize_url(source.url)
+        batch.append(source)
+        if len(batch) >= 2000:
+            Source.objects.bulk_update(batch, ['normalized_url'])
+            batch = []
+    if batch:
+        Source.objects.bulk_update(batch, ['normalized_url'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0002_connectionsuggestion_sourcesuggestion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='source',
+            name='normalized_url',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='URL without scheme, www, tracking params, or trailing slash.', max_length=2000),
+        ),
+        migrations.RunPython(backfill_normalized_url, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='SourceMergeSuggestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('reason', models.CharField(choices=[('url', 'Same normalized URL'), ('title', 'Similar title')], max_length=20)),
+                ('score', models.FloatField(help_text='Title trigram similarity (1.0 for URL matches).')),
+                ('status', models.CharField(choices=[('pending', 'Pending Review'), ('approved', 'Approved'), ('rejected', 'Rejected')], db_index=True, default='pending', max_length=20)),
+                ('reviewed_at', models.DateTimeField(blank=True, null=True)),
+                ('duplicate', models.ForeignKey(help_text='The source that would be merged into it and deleted.', on_delete=django.db.models.deletion.CASCADE, related_name='duplicate_suggestions', to='research.source')),
+                ('source', models.ForeignKey(help_text='The source to keep (the older record).', on_delete=django.db.models.deletion.CASCADE, related_name='merge_suggestions', to='research.source')),
+            ],
+            options={
+                'verbose_name': 'merge suggestion',
+                'verbose_name_plural': 'merge suggestions',
+                'ordering': ['-score', '-created_at'],
+                'constraints': [models.UniqueConstraint(fields=('source', 'duplicate'), name='unique_merge_pair')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0003_source_normalized_url_sourcemergesuggestion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sourcemergesuggestion',
+            name='duplicate_title',
+            field=models.CharField(blank=True, help_text="The duplicate's title, kept after a merge deletes it.", max_length=500),
+        ),
+        migrations.AlterField(
+            model_name='sourcemergesuggestion',
+            name='duplicate',
+            field=models.ForeignKey(blank=True, help_text='The source that would be merged into it and deleted (blank once merged).', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicate_suggestions', to='research.source'),
+        ),
+    ]
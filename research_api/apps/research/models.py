@@ -3,6 +3,8 @@ from django.utils.text import slugify
 
 from apps.core.models import TimeStampedModel
 
+from .dedup import normalize_url
+
 
 # ---------------------------------------------------------------------------
 # Choices
@@ -132,6 +134,13 @@ class Source(TimeStampedModel):
 
     # Publication
     url = models.URLField(max_length=2000, blank=True)
+    normalized_url = models.CharField(
+        max_length=2000,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text='URL without scheme, www, tracking params, or trailing slash.',
+    )
     publication = models.CharField(
         max_length=300,
         blank=True,
@@ -217,6 +226,10 @@ class Source(TimeStampedModel):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)[:500]
+        self.normalized_url = normalize_url(self.url)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'url' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'normalized_url'}
         super().save(*args, **kwargs)
 
     # link_count is provided by queryset annotation (Count('links'))
@@ -634,3 +647,73 @@ class ConnectionSuggestion(TimeStampedModel):
 
     def __str__(self):
         return f'[{self.status}] {self.from_slug} <-> {self.to_slug} (by {self.contributor_name})'
+
+
+# ---------------------------------------------------------------------------
+# Duplicate detection
+# ---------------------------------------------------------------------------
+
+class MergeReason(models.TextChoices):
+    URL = 'url', 'Same normalized URL'
+    TITLE = 'title', 'Similar title'
+
+
+class SourceMergeSuggestion(TimeStampedModel):
+    """A pair of Sources that look like the same book or article.
+
+    Produced by the find_duplicate_sources command (see research.dedup).
+    Approving a suggestion in the admin merges the duplicate into the
+    kept source: links, thread entries, and promoted suggestions move
+    over, then the duplicate is deleted. The approved suggestion stays
+    as the record of the merge, with the duplicate's title.
+    """
+
+    source = models.ForeignKey(
+        Source,
+        on_delete=models.CASCADE,
+        related_name='merge_suggestions',
+        help_text='The source to keep (the older record).',
+    )
+    duplicate = models.ForeignKey(
+        Source,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='duplicate_suggestions',
+        help_text='The source that would be merged into it and deleted '
+                  '(blank once merged).',
+    )
+    duplicate_title = models.CharField(
+        max_length=500,
+        blank=True,
+        help_text="The duplicate's title, kept after a merge deletes it.",
+    )
+    reason = models.CharField(
+        max_length=20,
+        choices=MergeReason.choices,
+    )
+    score = models.FloatField(
+        help_text='Title trigram similarity (1.0 for URL matches).',
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=ReviewStatus.choices,
+        default=ReviewStatus.PENDING,
+        db_index=True,
+    )
+    reviewed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-score', '-created_at']
+        verbose_name = 'merge suggestion'
+        verbose_name_plural = 'merge suggestions'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['source', 'duplicate'],
+                name='unique_merge_pair',
+            ),
+        ]
+
+    def __str__(self):
+        duplicate = self.duplicate or self.duplicate_title
+        return f'[{self.status}] {duplicate} -> {self.source} ({self.reason}, {self.score:.2f})'
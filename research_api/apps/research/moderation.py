@@ -0,0 +1,190 @@
+"""
+Bulk moderation of community suggestions.
+
+Promoting a selection of SourceSuggestions runs in one transaction with
+a fixed number of queries regardless of how many are selected:
+
+  1. Lock and load the pending suggestions.
+  2. Resolve existing Sources by normalized URL (one query), so a
+     suggestion for a source already in the database links to it
+     instead of creating a duplicate.
+  3. Allocate unique slugs for the new Sources (one or two queries).
+  4. bulk_create the new Sources, then the SourceLinks that don't exist
+     yet (one query to find those that do).
+  5. Mark every suggestion approved in a single UPDATE.
+
+Used by the SourceSuggestion and ConnectionSuggestion admin actions and
+by the internal /api/v1/internal/moderate/ endpoint.
+"""
+
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Case, Q, Value, When
+from django.utils import timezone
+from django.utils.text import slugify
+
+from apps.core.changes import record_changes
+from apps.core.models import ChangeOp
+
+from .dedup import normalize_url
+from .models import ReviewStatus, Source, SourceLink, SourceSuggestion
+
+SLUG_MAX_LENGTH = 500
+
+
+def allocate_slugs(titles, max_length=SLUG_MAX_LENGTH):
+    """
+    Return a unique Source slug for each title, in order.
+
+    Collisions with existing rows and within the batch get -2, -3, ...
+    suffixes, like the single-source _unique_slug helper, but taken slugs
+    are fetched up front instead of probed one at a time.
+    """
+    bases = [slugify(title)[:max_length] or 'source' for title in titles]
+    taken = set(
+        Source.objects.filter(slug__in=set(bases)).values_list('slug', flat=True)
+    )
+    collided = {base for base in bases if base in taken}
+    if collided:
+        prefixes = {base[:max_length - 4] for base in collided}
+        taken |= set(
+            Source.objects
+            .filter(reduce(or_, (Q(slug__startswith=p) for p in prefixes)))
+            .values_list('slug', flat=True)
+        )
+
+    slugs = []
+    for base in bases:
+        slug, counter = base, 2
+        while slug in taken:
+            suffix = f'-{counter}'
+            slug = base[:max_length - len(suffix)] + suffix
+            counter += 1
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def _new_source(suggestion):
+    return Source(
+        title=suggestion.title,
+        source_type=suggestion.source_type,
+        url=suggestion.url,
+        normalized_url=normalize_url(suggestion.url),
+        date_encountered=suggestion.created_at.date(),
+        public_annotation=(
+            f'Suggested by {suggestion.contributor_name}: '
+            f'{suggestion.relevance_note}'
+        ),
+        tags=['community-suggested'],
+        public=True,
+    )
+
+
+def promote_suggestions(queryset, reviewer_note=None):
+    """
+    Approve pending SourceSuggestions, creating Sources and SourceLinks.
+
+    reviewer_note replaces each suggestion's note only when given.
+    Returns a dict of counts: promoted, sources_created, sources_reused,
+    links_created.
+    """
+    with transaction.atomic():
+        pending = list(
+            queryset.filter(status=ReviewStatus.PENDING)
+            .select_for_update()
+            .order_by('pk')
+        )
+        if not pending:
+            return {
+                'promoted': 0, 'sources_created': 0,
+                'sources_reused': 0, 'links_created': 0,
+            }
+
+        # Existing sources by normalized URL, in one query
+        keys = {normalize_url(s.url) for s in pending} - {''}
+        by_url = {
+            source.normalized_url: source
+            for source in Source.objects.filter(normalized_url__in=keys)
+        }
+        reused = len(by_url)
+
+        # One new Source per distinct URL (or per suggestion without a URL)
+        source_for = {}
+        new_sources = []
+        for suggestion in pending:
+            key = normalize_url(suggestion.url)
+            if key and key in by_url:
+                source_for[suggestion.pk] = by_url[key]
+                continue
+            source = _new_source(suggestion)
+            new_sources.append(source)
+            source_for[suggestion.pk] = source
+            if key:
+                by_url[key] = source
+
+        for source, slug in zip(new_sources, allocate_slugs([s.title for s in new_sources])):
+            source.slug = slug
+        Source.objects.bulk_create(new_sources)
+
+        # Links that don't exist yet (unique on source + content)
+        wanted = {}
+        for suggestion in pending:
+            source = source_for[suggestion.pk]
+            key = (source.pk, suggestion.target_content_type, suggestion.target_slug)
+            wanted.setdefault(key, SourceLink(
+                source=source,
+                content_type=suggestion.target_content_type,
+                content_slug=suggestion.target_slug,
+                role='reference',
+                notes=f'Community contribution by {suggestion.contributor_name}',
+            ))
+        existing_links = set(
+            SourceLink.objects
+            .filter(
+                source__in={key[0] for key in wanted},
+                content_slug__in={key[2] for key in wanted},
+            )
+            .values_list('source_id', 'content_type', 'content_slug')
+        )
+        new_links = [
+            link for key, link in wanted.items() if key not in existing_links
+        ]
+        SourceLink.objects.bulk_create(new_links)
+
+        # Single UPDATE for every suggestion's review fields
+        fields = {
+            'status': ReviewStatus.APPROVED,
+            'reviewed_at': timezone.now(),
+            'promoted_source': Case(
+                *[When(pk=s.pk, then=Value(source_for[s.pk].pk)) for s in pending],
+            ),
+        }
+        if reviewer_note is not None:
+            fields['reviewer_note'] = reviewer_note
+        SourceSuggestion.objects.filter(pk__in=[s.pk for s in pending]).update(**fields)
+
+        record_changes(new_sources, ChangeOp.CREATED)
+        record_changes(new_links, ChangeOp.CREATED)
+
+    return {
+        'promoted': len(pending),
+        'sources_created': len(new_sources),
+        'sources_reused': reused,
+        'links_created': len(new_links),
+    }
+
+
+def set_review_status(queryset, status, reviewer_note=None):
+    """
+    Approve or reject pending suggestions of either kind in one UPDATE.
+
+    Used for rejections and for ConnectionSuggestion approval, which
+    creates no records. Returns the number of rows changed.
+    """
+    fields = {'status': status, 'reviewed_at': timezone.now()}
+    if reviewer_note is not None:
+        fields['reviewer_note'] = reviewer_note
+    return queryset.filter(status=ReviewStatus.PENDING).update(**fields)
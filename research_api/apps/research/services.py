@@ -8,7 +8,11 @@ synchronization overhead for a small-scale personal site.
 
 from collections import defaultdict
 
-from .models import SourceLink
+from django.db import transaction
+
+from apps.core.changes import record_changes
+
+from .models import Source, SourceLink, SourceSuggestion, ThreadEntry
 
 
 def detect_content_type(slug: str) -> str:
@@ -144,3 +148,117 @@ def get_all_backlinks():
         ]
 
     return result
+
+
+def _source_node(src):
+    return {
+        'id': f'source:{src.slug}',
+        'type': 'source',
+        'label': src.title,
+        'slug': src.slug,
+        'sourceType': src.source_type,
+        'creator': src.creator or '',
+    }
+
+
+def build_graph():
+    """
+    Build the full public source graph as nodes + edges for D3.js.
+
+    Nodes are sources and content pieces. Edges are SourceLinks.
+    Orphaned sources (promoted but not yet linked) still appear as
+    isolated nodes so newly promoted sources are visible immediately.
+
+    Shared by the /api/v1/graph/ endpoint and the Paper Trail explorer.
+
+    Returns:
+        {"nodes": [...], "edges": [...]}
+    """
+    links = (
+        SourceLink.objects
+        .select_related('source')
+        .filter(source__public=True)
+    )
+
+    source_nodes = {}
+    content_nodes = {}
+    edges = []
+
+    for lnk in links:
+        src = lnk.source
+        source_key = f'source:{src.slug}'
+        content_key = f'{lnk.content_type}:{lnk.content_slug}'
+
+        if source_key not in source_nodes:
+            source_nodes[source_key] = _source_node(src)
+
+        if content_key not in content_nodes:
+            content_nodes[content_key] = {
+                'id': content_key,
+                'type': lnk.content_type,
+                'label': lnk.content_title or lnk.content_slug,
+                'slug': lnk.content_slug,
+            }
+
+        edges.append({
+            'source': source_key,
+            'target': content_key,
+            'role': lnk.role,
+        })
+
+    # Include orphaned public sources (promoted but not yet linked)
+    orphaned = Source.objects.public().filter(links__isnull=True)
+    for src in orphaned:
+        source_nodes[f'source:{src.slug}'] = _source_node(src)
+
+    nodes = list(source_nodes.values()) + list(content_nodes.values())
+    return {'nodes': nodes, 'edges': edges}
+
+
+# Fields copied from a merged duplicate when the kept source leaves them empty
+_MERGE_FILL_FIELDS = [
+    'creator', 'url', 'publication', 'date_published', 'date_encountered',
+    'public_annotation', 'private_annotation',
+    'location_name', 'latitude', 'longitude',
+]
+
+
+def merge_sources(keep, duplicate):
+    """
+    Merge a duplicate Source into the one being kept, then delete it.
+
+    SourceLinks move to the kept source, except where it already links
+    the same content piece (the kept link's role and quote win). Thread
+    entries and promoted suggestions are repointed. Blank fields on the
+    kept source are filled from the duplicate and tags are unioned.
+    """
+    with transaction.atomic():
+        already_linked = set(
+            keep.links.values_list('content_type', 'content_slug')
+        )
+        movable = [
+            pk for pk, ct, cs in
+            duplicate.links.values_list('pk', 'content_type', 'content_slug')
+            if (ct, cs) not in already_linked
+        ]
+        moved_entries = list(
+            ThreadEntry.objects.filter(source=duplicate).values_list('pk', flat=True)
+        )
+        SourceLink.objects.filter(pk__in=movable).update(source=keep)
+        ThreadEntry.objects.filter(pk__in=moved_entries).update(source=keep)
+        record_changes([
+            *SourceLink.objects.filter(pk__in=movable),
+            *ThreadEntry.objects.filter(pk__in=moved_entries),
+        ])
+        SourceSuggestion.objects.filter(
+            promoted_source=duplicate,
+        ).update(promoted_source=keep)
+
+        # Blank means None or '': a latitude or longitude of 0.0 is real
+        for field in _MERGE_FILL_FIELDS:
+            if getattr(keep, field) in (None, '') and getattr(duplicate, field) not in (None, ''):
+                setattr(keep, field, getattr(duplicate, field))
+        keep.tags = list(dict.fromkeys([*(keep.tags or []), *(duplicate.tags or [])]))
+        keep.save()
+
+        duplicate.delete()
@@ -0,0 +1,38 @@
+"""
+Signal handlers for research models.
+
+A Source's links and a thread's entries are only public while their
+parent is. When the parent's public flag flips, the children's change
+feed visibility flips with it, so they get an 'updated' event too
+(the feed reports them as deleted while the parent is hidden).
+"""
+
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from apps.core.changes import record_changes
+
+from .models import ResearchThread, Source
+
+
+@receiver(pre_save, sender=Source)
+@receiver(pre_save, sender=ResearchThread)
+def remember_public_flag(sender, instance, raw=False, **kwargs):
+    instance._public_changed = False
+    if raw or instance.pk is None:
+        return
+    previous = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list('public', flat=True)
+        .first()
+    )
+    instance._public_changed = previous is not None and previous != instance.public
+
+
+@receiver(post_save, sender=Source)
+@receiver(post_save, sender=ResearchThread)
+def cascade_visibility_change(sender, instance, created, raw=False, **kwargs):
+    if raw or not getattr(instance, '_public_changed', False):
+        return
+    children = instance.links if sender is Source else instance.entries
+    record_changes(list(children.all()))
@@ -0,0 +1,117 @@
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+
+from .dedup import (
+    find_duplicate_pairs,
+    jaccard,
+    minhash_signatures,
+    normalize_title,
+    normalize_url,
+    title_shingles,
+)
+from .models import Source
+from .services import merge_sources
+
+
+class NormalizeUrlTest(SimpleTestCase):
+
+    def test_docstring_example(self):
+        self.assertEqual(
+            normalize_url('https://www.Example.com/post/?utm_source=x&b=2&a=1#top'),
+            'example.com/post?a=1&b=2',
+        )
+
+    def test_scheme_www_and_trailing_slash_are_ignored(self):
+        self.assertEqual(
+            normalize_url('http://www.example.com/a/'),
+            normalize_url('https://example.com/a'),
+        )
+
+    def test_tracking_parameters_are_dropped(self):
+        self.assertEqual(
+            normalize_url('https://example.com/a?fbclid=1&UTM_Medium=2&id=3'),
+            'example.com/a?id=3',
+        )
+
+    def test_ports(self):
+        self.assertEqual(normalize_url('https://example.com:443/a'), 'example.com/a')
+        self.assertEqual(normalize_url('http://example.com:8080/a'), 'example.com:8080/a')
+
+    def test_path_keeps_its_case(self):
+        self.assertEqual(normalize_url('https://EXAMPLE.com/Post'), 'example.com/Post')
+
+    def test_scheme_less_and_blank(self):
+        self.assertEqual(normalize_url('example.com/a'), 'example.com/a')
+        self.assertEqual(normalize_url('  '), '')
+        self.assertEqual(normalize_url(None), '')
+
+
+class TitleSimilarityTest(SimpleTestCase):
+
+    def test_normalize_title(self):
+        self.assertEqual(
+            normalize_title('The Death & Life of Great American Cities!'),
+            'the death and life of great american cities',
+        )
+        self.assertEqual(normalize_title('Café  Society'), 'cafe society')
+
+    def test_minhash_agreement_estimates_jaccard(self):
+        a = 'the death and life of great american cities'
+        b = 'death and life of great american cities'
+        signatures = minhash_signatures([a, b], num_perm=512)
+        estimate = np.mean(signatures[0] == signatures[1])
+        exact = jaccard(title_shingles(a), title_shingles(b))
+        self.assertAlmostEqual(estimate, exact, delta=0.1)
+
+    def test_short_texts_get_max_rows(self):
+        signatures = minhash_signatures(['ab', 'a longer title'])
+        self.assertTrue((signatures[0] == np.iinfo(np.uint32).max).all())
+        self.assertFalse((signatures[1] == np.iinfo(np.uint32).max).all())
+
+
+class FindDuplicatePairsTest(SimpleTestCase):
+
+    def test_similar_titles_are_paired_older_first(self):
+        pairs = find_duplicate_pairs([
+            (7, 'Death & Life of Great American Cities', ''),
+            (3, 'The Death and Life of Great American Cities', ''),
+            (5, 'A Pattern Language', ''),
+        ])
+        self.assertEqual(len(pairs), 1)
+        keep, duplicate, reason, score = pairs[0]
+        self.assertEqual((keep, duplicate, reason), (3, 7, 'title'))
+        self.assertGreaterEqual(score, 0.7)
+
+    def test_url_match_wins_over_title(self):
+        url = normalize_url('https://example.com/book')
+        pairs = find_duplicate_pairs([
+            (1, 'The Power Broker', url),
+            (2, 'The Power Broker', url),
+        ])
+        self.assertEqual(pairs, [(1, 2, 'url', 1.0)])
+
+    def test_unrelated_titles_and_threshold(self):
+        records = [
+            (1, 'Seeing Like a State', ''),
+            (2, 'The Image of the City', ''),
+            (3, 'Seeing Like a City', ''),
+        ]
+        self.assertEqual(find_duplicate_pairs(records[:2]), [])
+        self.assertEqual(find_duplicate_pairs(records, threshold=1.0), [])
+
+
+class MergeSourcesTest(TestCase):
+
+    def test_blank_fields_are_filled_but_zero_coordinates_kept(self):
+        keep = Source.objects.create(title='Keep', slug='keep', latitude=0, longitude=0)
+        duplicate = Source.objects.create(
+            title='Duplicate', slug='duplicate', latitude=51.5, longitude=-0.1,
+            creator='Jane Jacobs', tags=['cities'],
+        )
+        merge_sources(keep, duplicate)
+
+        keep.refresh_from_db()
+        self.assertEqual((keep.latitude, keep.longitude), (0, 0))
+        self.assertEqual(keep.creator, 'Jane Jacobs')
+        self.assertEqual(keep.tags, ['cities'])
+        self.assertFalse(Source.objects.filter(pk=duplicate.pk).exists())
@@ -101,6 +101,16 @@ else:
         }
     }
 
+# Cache: local memory by default. Holds derived payloads (e.g. the
+# Paper Trail graph JSON) that are cheap to rebuild on a cold start.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'research-api',
+    },
+}
+
 # Custom user model
 
 AUTH_USER_MODEL = 'core.User'
@@ -164,6 +174,24 @@ GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN', '')
 GITHUB_REPO = os.environ.get('GITHUB_REPO', '')
 GITHUB_BRANCH = os.environ.get('GITHUB_BRANCH', 'main')
 
+# Publish backend: 'github' (REST API) or 'local_git' (commit into a local
+# repository with git, optionally pushing). See apps/publisher/local_git.py.
+PUBLISH_BACKEND = os.environ.get('PUBLISH_BACKEND', 'github')
+PUBLISH_GIT_REPO = os.environ.get('PUBLISH_GIT_REPO', '')
+PUBLISH_GIT_BRANCH = os.environ.get('PUBLISH_GIT_BRANCH', '')
+PUBLISH_GIT_REMOTE = os.environ.get('PUBLISH_GIT_REMOTE', '')
+PUBLISH_GIT_COMMIT_URL = os.environ.get('PUBLISH_GIT_COMMIT_URL', '')
+PUBLISH_GIT_AUTHOR_NAME = os.environ.get('PUBLISH_GIT_AUTHOR_NAME', 'Research API')
+PUBLISH_GIT_AUTHOR_EMAIL = os.environ.get('PUBLISH_GIT_AUTHOR_EMAIL', 'research-api@localhost')
+
+# Published research data: wire format ('pretty', 'minified' or
+# 'columnar') and whether to commit .gz/.br siblings of each file.
+# See apps/publisher/formats.py and precompress.py.
+RESEARCH_DATA_FORMAT = os.environ.get('RESEARCH_DATA_FORMAT', 'pretty')
+RESEARCH_DATA_PRECOMPRESS = os.environ.get(
+    'RESEARCH_DATA_PRECOMPRESS', 'False'
+).lower() in ('true', '1', 'yes')
+
 # Webmention and webhooks
 
 WEBMENTION_TARGET_DOMAIN = os.environ.get(
@@ -171,6 +199,37 @@ WEBMENTION_TARGET_DOMAIN = os.environ.get(
 )
 WEBHOOK_SECRET = os.environ.get('WEBHOOK_SECRET', '')
 
+# Background Webmention verification (apps/mentions/queue.py): fetch
+# threads per verify_webmentions process, and concurrent fetches allowed
+# per source host across all processes.
+WEBMENTION_VERIFY_WORKERS = int(os.environ.get('WEBMENTION_VERIFY_WORKERS', '8'))
+WEBMENTION_DOMAIN_CONCURRENCY = int(os.environ.get('WEBMENTION_DOMAIN_CONCURRENCY', '2'))
+# Most of a source page read when looking for the target link
+WEBMENTION_MAX_FETCH_BYTES = int(os.environ.get('WEBMENTION_MAX_FETCH_BYTES', str(1024 * 1024)))
+# Webmention endpoint flood protection (apps/mentions/throttle.py): token
+# buckets per client IP and per source domain (requests per minute, burst
+# size; a rate of 0 disables), and the seconds a repeated source/target
+# pair gets the earlier response
+WEBMENTION_IP_RATE = int(os.environ.get('WEBMENTION_IP_RATE', '30'))
+WEBMENTION_IP_BURST = int(os.environ.get('WEBMENTION_IP_BURST', '10'))
+WEBMENTION_DOMAIN_RATE = int(os.environ.get('WEBMENTION_DOMAIN_RATE', '60'))
+WEBMENTION_DOMAIN_BURST = int(os.environ.get('WEBMENTION_DOMAIN_BURST', '20'))
+# Proxies in front of the app that append the client address to
+# X-Forwarded-For (1 for Railway's edge; 0 when serving clients directly).
+# The per-IP bucket trusts only the entry the last of them added.
+WEBMENTION_PROXY_HOPS = int(os.environ.get('WEBMENTION_PROXY_HOPS', '1'))
+WEBMENTION_DEDUP_WINDOW = int(os.environ.get('WEBMENTION_DEDUP_WINDOW', '60'))
+# Days before reverify_mentions checks a verified mention's source again
+MENTION_REVERIFY_AFTER_DAYS = int(os.environ.get('MENTION_REVERIFY_AFTER_DAYS', '30'))
+
+# Outbound Webmentions (apps/mentions/outbound.py): seconds after a
+# publish before new links are sent (so the page has deployed), seconds a
+# discovered endpoint is cached per host, and concurrent sends per
+# endpoint host
+WEBMENTION_SEND_DELAY = int(os.environ.get('WEBMENTION_SEND_DELAY', '600'))
+WEBMENTION_ENDPOINT_TTL = int(os.environ.get('WEBMENTION_ENDPOINT_TTL', str(24 * 60 * 60)))
+WEBMENTION_SEND_HOST_CONCURRENCY = int(os.environ.get('WEBMENTION_SEND_HOST_CONCURRENCY', '2'))
+
 # Internal API key (shared with publishing_api for source promotion)
 INTERNAL_API_KEY = os.environ.get('INTERNAL_API_KEY', '')
 